@@ -0,0 +1,5 @@
+"""
+OneVoice 벤치마크
+
+backend 디렉토리에서 `python -m benchmarks.<모듈명>` 형태로 실행합니다.
+"""
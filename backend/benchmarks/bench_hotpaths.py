@@ -0,0 +1,250 @@
+import os
+import sys
+import gc
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.emulators import Emulators, FakeTranslationClient, synthetic_script
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baselines", "hotpaths.json")
+# 이보다 작은 절대 변화는 측정 잡음으로 보고 회귀로 판정하지 않음
+MIN_TIME_DELTA = 0.001  # 초
+MIN_MEMORY_DELTA = 64 * 1024  # 바이트
+
+def stt_transcript(script: List[Dict]) -> str:
+    """STT 서비스 출력 형식의 단어별 트랜스크립트"""
+    return "".join(
+        f"[{start:.2f}s - {end:.2f}s] {word}\n"
+        for line in script for word, start, end in line["words"]
+    )
+
+def merged_transcript(script: List[Dict]) -> str:
+    """병합기 출력 형식(번역 입력)의 문장별 트랜스크립트"""
+    return "".join(
+        f"[{line['start']:.2f}s - {line['end']:.2f}s] 화자 {line['speaker']}: "
+        f"{' '.join(word for word, _, _ in line['words'])}\n"
+        for line in script
+    )
+
+def translation_tsv(script: List[Dict], path: str) -> str:
+    """번역 결과 형식의 TSV 파일 작성"""
+    translator = FakeTranslationClient()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("start_time\tend_time\tspeaker_id\ttranslated_text\n")
+        for line in script:
+            text = " ".join(word for word, _, _ in line["words"])
+            translated = translator.translate_text(SimpleNamespace(contents=[text])).translations[0].translated_text
+            f.write(f"{line['start']:.2f}\t{line['end']:.2f}\t{line['speaker']}\t{translated}\n")
+    return path
+
+def filenames(count: int, seed: int = 0) -> List[str]:
+    """특수문자와 공백이 섞인 업로드 파일명"""
+    rng = random.Random(seed)
+    pieces = ["My Video", "final#cut", "영상 (1)", "a/b\\c", "what?", "clip*2", "  spaced   out  ", "it's"]
+    return [" ".join(rng.choice(pieces) for _ in range(rng.randint(1, 4))) for _ in range(count)]
+
+class Case:
+    """
+    벤치마크 대상 하나
+
+    setup(minutes, work_dir)은 입력을 만들고 인자 없는 호출 대상(동기 함수 또는 코루틴 함수)을
+    반환합니다. 입력 생성 시간은 측정에 포함하지 않습니다.
+    """
+
+    def __init__(self, name: str, setup: Callable[[float, str], Callable]):
+        self.name = name
+        self.setup = setup
+
+def merger_cases() -> List[Case]:
+    from src.services.diarization_stt_merger import diarization_stt_merger as merger
+
+    def parse(minutes, work_dir):
+        transcript = stt_transcript(synthetic_script(minutes * 60))
+        return lambda: merger._parse_stt_transcript(transcript)
+
+    def align(minutes, work_dir):
+        script = synthetic_script(minutes * 60)
+        stt_segments = merger._parse_stt_transcript(stt_transcript(script))
+        diarization = [{"speaker": line["speaker"], "start": line["start"], "end": line["end"]} for line in script]
+        # 화자만 덮어쓰므로 같은 입력으로 반복해도 작업량이 같음
+        return lambda: merger._align_segments(stt_segments, diarization)
+
+    def sentences(minutes, work_dir):
+        script = synthetic_script(minutes * 60)
+        diarization = [{"speaker": line["speaker"], "start": line["start"], "end": line["end"]} for line in script]
+        aligned = merger._align_segments(merger._parse_stt_transcript(stt_transcript(script)), diarization)
+        return lambda: merger._merge_segments_into_sentences(aligned)
+
+    return [
+        Case("merger.parse_stt_transcript", parse),
+        Case("merger.align_segments", align),
+        Case("merger.merge_into_sentences", sentences),
+    ]
+
+def service_cases() -> List[Case]:
+    from src.services.nmt import nmt_service
+    from src.services.tts import tts_service
+    from src.routes.process import sanitize_filename
+
+    def translate(minutes, work_dir):
+        text = merged_transcript(synthetic_script(minutes * 60))
+        nmt_service.output_dir = work_dir
+        return lambda: nmt_service.process_transcript(text, "bench", "bench.mp4")
+
+    def tts(minutes, work_dir):
+        path = translation_tsv(synthetic_script(minutes * 60), os.path.join(work_dir, f"bench_{minutes:g}.tsv"))
+        return lambda: tts_service.process_multi_speaker_tsv(path, "bench", output_dir=work_dir)
+
+    def sanitize(minutes, work_dir):
+        names = filenames(int(minutes * 100))
+        return lambda: [sanitize_filename(name) for name in names]
+
+    return [
+        Case("nmt.process_transcript", translate),
+        Case("tts.process_multi_speaker_tsv", tts),
+        Case("routes.sanitize_filename", sanitize),
+    ]
+
+def call(loop: asyncio.AbstractEventLoop, func: Callable):
+    result = func()
+    if asyncio.iscoroutine(result):
+        result = loop.run_until_complete(result)
+    return result
+
+def measure(loop: asyncio.AbstractEventLoop, func: Callable, repeat: int) -> Dict[str, float]:
+    """최소/중앙 실행 시간(초)과 tracemalloc 최대 메모리(바이트) 측정"""
+    call(loop, func)  # 준비 실행 (지연 임포트, 캐시 등)
+    timings = []
+    # timeit과 같이 측정 중에는 GC를 꺼서 수집 시점에 따른 편차를 줄임
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call(loop, func)
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    # 메모리는 추적 오버헤드가 시간에 섞이지 않도록 따로 한 번 측정
+    tracemalloc.start()
+    call(loop, func)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    return {"best": timings[0], "median": timings[len(timings) // 2], "peak_bytes": peak}
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+def run_suite(minutes_list: List[float], repeat: int, selected: Optional[List[str]]) -> Dict[str, Dict]:
+    """모든 (대상, 트랜스크립트 길이) 조합 실행"""
+    results = {}
+    loop = asyncio.new_event_loop()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # TTS 캐시를 끄고 발화 속도 모델은 임시 디렉토리에서 새로 학습하며, 외부 클라이언트는
+        # 지연 없는 에뮬레이터로 대체 (설정 모듈 임포트 전, 실제 TEMP_DIR의 학습 결과를 읽거나 덮어쓰지 않음)
+        os.environ["TTS_CACHE_ENABLED"] = "false"
+        os.environ["TTS_RATE_MODEL_PATH"] = os.path.join(work_dir, "tts_rate_model.json")
+        Emulators().install()
+        from src.services import config
+        config.TEMP_DIR = work_dir
+        cases = merger_cases() + service_cases()
+        if selected:
+            cases = [case for case in cases if any(pattern in case.name for pattern in selected)]
+
+        for case in cases:
+            for minutes in minutes_list:
+                func = case.setup(minutes, work_dir)
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    stats = measure(loop, func, repeat)
+                stats["minutes_per_second"] = minutes / stats["best"] if stats["best"] else 0.0
+                key = f"{case.name}@{minutes:g}m"
+                results[key] = stats
+                print(f"{key:<40} {stats['best'] * 1000:>10.2f} {stats['median'] * 1000:>10.2f} "
+                      f"{stats['minutes_per_second']:>12.1f} {stats['peak_bytes'] / (1024 * 1024):>10.2f}")
+    loop.close()
+    return results
+
+def print_header() -> None:
+    print(f"{'대상@길이':<40} {'최소(ms)':>10} {'중앙(ms)':>10} {'분/초 처리':>12} {'최대 메모리(MB)':>10}")
+
+def compare(baseline: Dict, results: Dict[str, Dict], max_slowdown: float, max_memory_growth: float) -> List[str]:
+    """기준선 대비 회귀 목록 (최소 실행 시간과 최대 메모리 기준)"""
+    regressions = []
+    print(f"\n{'대상@길이':<40} {'시간 변화':>10} {'메모리 변화':>12}")
+    for key, stats in results.items():
+        base = baseline["results"].get(key)
+        if not base:
+            print(f"{key:<40} {'(기준 없음)':>10}")
+            continue
+        time_change = stats["best"] / base["best"] - 1 if base["best"] else 0.0
+        memory_change = stats["peak_bytes"] / base["peak_bytes"] - 1 if base["peak_bytes"] else 0.0
+        flags = []
+        if time_change > max_slowdown and stats["best"] - base["best"] > MIN_TIME_DELTA:
+            flags.append("시간")
+            regressions.append(f"{key}: 실행 시간 {time_change:+.1%} (허용 {max_slowdown:.0%})")
+        if memory_change > max_memory_growth and stats["peak_bytes"] - base["peak_bytes"] > MIN_MEMORY_DELTA:
+            flags.append("메모리")
+            regressions.append(f"{key}: 최대 메모리 {memory_change:+.1%} (허용 {max_memory_growth:.0%})")
+        mark = f"  ← 회귀({', '.join(flags)})" if flags else ""
+        print(f"{key:<40} {time_change:>+10.1%} {memory_change:>+12.1%}{mark}")
+    return regressions
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="순수 파이썬 핫패스 마이크로 벤치마크 (기준선 저장/비교)")
+    parser.add_argument("command", choices=["run", "compare"], help="run: 실행 (--save로 기준선 저장), compare: 기준선과 비교")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 60], help="트랜스크립트 길이(분) (기본값: 1 10 60)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본값: 5)")
+    parser.add_argument("--cases", nargs="+", help="이름에 포함된 문자열로 대상 선택")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help=f"결과를 기준선으로 저장 (기본 경로: {DEFAULT_BASELINE})")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="비교할 기준선 파일")
+    parser.add_argument("--max-slowdown", type=float, default=0.15, help="허용 실행 시간 증가율 (기본값: 0.15)")
+    parser.add_argument("--max-memory-growth", type=float, default=0.15, help="허용 최대 메모리 증가율 (기본값: 0.15)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.command == "compare":
+        if not os.path.exists(args.baseline):
+            print(f"기준선 파일이 없습니다: {args.baseline} (먼저 run --save 실행)")
+            sys.exit(2)
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != environment():
+            print(f"경고: 기준선 측정 환경이 다릅니다 ({baseline.get('environment')})")
+
+    print_header()
+    results = run_suite(args.minutes, args.repeat, args.cases)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "created_at": time.time(), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n기준선 저장: {args.save}")
+
+    if baseline is not None:
+        regressions = compare(baseline, results, args.max_slowdown, args.max_memory_growth)
+        if regressions:
+            print("\n성능 회귀:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\n회귀 없음")
+
+if __name__ == "__main__":
+    main()
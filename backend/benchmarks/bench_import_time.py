@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_import(module: str) -> Tuple[float, str]:
+    """새 인터프리터에서 모듈을 임포트하고 (전체 시간(초), -X importtime 출력) 반환"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "임포트 실패")
+    return elapsed, result.stderr
+
+def parse_importtime(output: str) -> Dict[str, Tuple[int, int]]:
+    """-X importtime 출력을 모듈별 (자체, 누적) 마이크로초로 변환"""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+def top_level_packages(modules: Dict[str, Tuple[int, int]]) -> List[Tuple[str, int]]:
+    """최상위 패키지별 자체 임포트 시간 합계 (마이크로초, 큰 순)"""
+    totals: Dict[str, int] = {}
+    for name, (self_us, _) in modules.items():
+        package = name.split(".")[0]
+        if package == "google" and "." in name:
+            # google.cloud.* 는 하위 패키지 단위로 구분
+            package = ".".join(name.split(".")[:3])
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="API 모듈 임포트(콜드 스타트) 시간 벤치마크")
+    parser.add_argument("--module", default="src.main", help="임포트할 모듈 (기본값: src.main)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본값: 5)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 패키지 수 (기본값: 15)")
+    args = parser.parse_args()
+
+    timings = []
+    output = ""
+    for _ in range(args.repeat):
+        elapsed, output = run_import(args.module)
+        timings.append(elapsed)
+
+    print(f"{args.module} 임포트 (인터프리터 기동 포함, {args.repeat}회)")
+    print(f"  중앙값: {statistics.median(timings) * 1000:.0f}ms, 최소: {min(timings) * 1000:.0f}ms, 최대: {max(timings) * 1000:.0f}ms")
+
+    modules = parse_importtime(output)
+    cumulative = modules.get(args.module, (0, 0))[1]
+    print(f"  -X importtime 누적: {cumulative / 1000:.0f}ms (모듈 {len(modules)}개)")
+
+    print(f"\n{'패키지':<40} {'자체 시간(ms)':>14} {'비율':>8}")
+    total = sum(self_us for self_us, _ in modules.values()) or 1
+    for package, self_us in top_level_packages(modules)[:args.top]:
+        print(f"{package:<40} {self_us / 1000:>14.1f} {self_us / total:>8.1%}")
+
+if __name__ == "__main__":
+    main()
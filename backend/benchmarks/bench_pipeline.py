@@ -0,0 +1,285 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import argparse
+import resource
+import tempfile
+import threading
+import contextlib
+import statistics
+import subprocess
+from typing import Dict, List, Optional
+
+from benchmarks.emulators import Emulators, FaultModel
+
+# 기본 지연/오류 프로필 ('중앙값[,sigma[,오류율]]', 초 단위)
+DEFAULT_PROFILES = {
+    "gcs": "0.02,0.3",
+    "speech": "1.0,0.3",
+    "translate": "0.05,0.4",
+    "tts": "0.08,0.4",
+    "pyannote": "0.8,0.3",
+}
+
+def generate_video(path: str, duration: float, width: int = 640, height: int = 360) -> None:
+    """테스트 패턴 영상과 음성 대역 톤을 섞은 합성 MP4 생성"""
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"testsrc=size={width}x{height}:rate=25:duration={duration}",
+            "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=44100:duration={duration}",
+            "-f", "lavfi", "-i", f"anoisesrc=color=pink:amplitude=0.05:sample_rate=44100:duration={duration}",
+            "-filter_complex", "[1:a][2:a]amix=inputs=2[a]",
+            "-map", "0:v", "-map", "[a]",
+            "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest", path,
+        ],
+        check=True
+    )
+
+def current_rss() -> int:
+    """현재 프로세스 RSS(바이트), /proc이 없으면 지금까지의 최대 RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class RSSSampler:
+    """백그라운드 스레드에서 RSS를 주기적으로 읽어 구간 최대값 기록"""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = 0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while self.running:
+            self.peak = max(self.peak, current_rss())
+            time.sleep(self.interval)
+
+    def __enter__(self) -> "RSSSampler":
+        self.peak = current_rss()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.running = False
+        self.thread.join()
+
+def cpu_seconds() -> float:
+    """프로세스(모든 스레드)와 종료된 자식 프로세스(ffmpeg 등)의 CPU 시간 합계"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+class StageTimer:
+    """
+    파이프라인 단계 함수를 감싸 호출별 벽시계 시간과 CPU 시간 기록
+
+    CPU 시간은 프로세스 전체 기준이므로 동시 실행 수가 1일 때만 단계별로 정확하고,
+    그 이상에서는 겹쳐 실행된 다른 작업의 CPU 시간이 함께 잡힙니다.
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[tuple]] = {}
+
+    def record(self, stage: str, wall: float, cpu: float) -> None:
+        self.samples.setdefault(stage, []).append((wall, cpu))
+
+    def wrap(self, owner, attribute: str, stage: str) -> None:
+        func = getattr(owner, attribute)
+
+        async def timed(*args, **kwargs):
+            started, cpu_started = time.perf_counter(), cpu_seconds()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started, cpu_seconds() - cpu_started)
+
+        setattr(owner, attribute, timed)
+
+    def reset(self) -> None:
+        self.samples = {}
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+async def run_job(source_video: str, timer: StageTimer, background_mode: str, output_mode: str, keep: bool,
+                  profile: bool = False) -> bool:
+    """업로드 엔드포인트와 같은 순서로 입력을 준비하고 process_video_file 실행"""
+    from src.routes import process
+    from src.services.workspace import TaskWorkspace
+    from src.services.task_manager import task_manager
+
+    task_id = str(uuid.uuid4())
+    workspace = TaskWorkspace(task_id)
+    try:
+        input_dir = workspace.dir("input_videos")
+        video_path = os.path.join(input_dir, "bench.mp4")
+        shutil.copyfile(source_video, video_path)
+
+        started, cpu_started = time.perf_counter(), cpu_seconds()
+        denoised_audio_path, original_audio_path = await process.extract_audio(
+            video_path,
+            os.path.join(input_dir, "bench.wav"),
+            os.path.join(input_dir, "bench_denoised.wav")
+        )
+        timer.record("extract", time.perf_counter() - started, cpu_seconds() - cpu_started)
+
+        started, cpu_started = time.perf_counter(), cpu_seconds()
+        await process.upload_inputs_to_gcs(workspace, video_path, original_audio_path, denoised_audio_path)
+        timer.record("upload", time.perf_counter() - started, cpu_seconds() - cpu_started)
+
+        await task_manager.create_task(task_id)
+        started, cpu_started = time.perf_counter(), cpu_seconds()
+        await process.process_video_file(
+            video_path, task_id, denoised_audio_path, original_audio_path,
+            process.BackgroundMode(background_mode), process.OutputMode(output_mode), profile
+        )
+        timer.record("total", time.perf_counter() - started, cpu_seconds() - cpu_started)
+        return True
+    except Exception as e:
+        print(f"작업 실패 ({task_id}): {str(e)}", file=sys.stderr)
+        return False
+    finally:
+        if not keep:
+            workspace.remove()
+
+async def run_level(source_video: str, concurrency: int, jobs: int, timer: StageTimer, args) -> Dict:
+    """동시 실행 수를 제한하여 jobs개 작업 실행"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited() -> bool:
+        async with semaphore:
+            return await run_job(source_video, timer, args.background_mode, args.output_mode, args.keep, args.profile)
+
+    timer.reset()
+    started, cpu_started = time.perf_counter(), cpu_seconds()
+    with RSSSampler() as sampler:
+        results = await asyncio.gather(*(limited() for _ in range(jobs)))
+    wall = time.perf_counter() - started
+    completed = sum(results)
+    return {
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "completed": completed,
+        "failed": jobs - completed,
+        "wall": wall,
+        "jobs_per_minute": completed / wall * 60 if wall else 0.0,
+        "cpu_per_job": (cpu_seconds() - cpu_started) / jobs,
+        "peak_rss_mb": sampler.peak / (1024 * 1024),
+        "peak_child_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "stages": {
+            stage: {
+                "count": len(samples),
+                "wall_mean": statistics.mean(wall for wall, _ in samples),
+                "wall_p95": percentile([wall for wall, _ in samples], 0.95),
+                "cpu_mean": statistics.mean(cpu for _, cpu in samples),
+            }
+            for stage, samples in timer.samples.items()
+        },
+    }
+
+def install_timers(timer: StageTimer) -> None:
+    """단계 함수 감싸기 (process_video_file이 호출하는 이름 기준)"""
+    from src.routes import process
+    timer.wrap(process.stt_service, "process_video", "stt")
+    timer.wrap(process.diarization_service, "process_video", "diarization")
+    timer.wrap(process.diarization_stt_merger, "merge_results", "merge")
+    timer.wrap(process.nmt_service, "process_transcript", "translation")
+    timer.wrap(process.tts_service, "process_text", "tts")
+    timer.wrap(process.video_audio_merger, "process_video", "mux")
+    timer.wrap(process, "process_progressive_output", "tts+mux(hls)")
+
+def print_report(levels: List[Dict], emulators: Emulators) -> None:
+    print(f"\n{'동시 실행':>8} {'완료':>6} {'실패':>6} {'총 시간(s)':>11} {'작업/분':>9} {'CPU/작업(s)':>12} {'최대 RSS(MB)':>13} {'자식 최대 RSS(MB)':>17}")
+    for level in levels:
+        print(
+            f"{level['concurrency']:>8} {level['completed']:>6} {level['failed']:>6} {level['wall']:>11.2f} "
+            f"{level['jobs_per_minute']:>9.2f} {level['cpu_per_job']:>12.2f} {level['peak_rss_mb']:>13.1f} "
+            f"{level['peak_child_rss_mb']:>17.1f}"
+        )
+
+    for level in levels:
+        note = "" if level["concurrency"] == 1 else " (CPU는 동시 실행 작업과 겹쳐 측정됨)"
+        print(f"\n[동시 실행 {level['concurrency']}] 단계별 시간{note}")
+        print(f"{'단계':<16} {'횟수':>6} {'평균(s)':>9} {'p95(s)':>9} {'CPU 평균(s)':>12}")
+        for stage, stats in level["stages"].items():
+            print(f"{stage:<16} {stats['count']:>6} {stats['wall_mean']:>9.3f} {stats['wall_p95']:>9.3f} {stats['cpu_mean']:>12.3f}")
+
+    print("\n에뮬레이터 호출 수 (주입 오류)")
+    for name, stats in emulators.stats().items():
+        print(f"  {name:<10} {stats['calls']:>7} ({stats['errors']})")
+
+async def run(args, emulators: Emulators, source_video: str) -> List[Dict]:
+    timer = StageTimer()
+    install_timers(timer)
+    levels = []
+    for concurrency in args.concurrency:
+        print(f"동시 실행 {concurrency}: 작업 {args.jobs}개 실행 중...")
+        output = open(os.devnull, "w") if not args.verbose else sys.stdout
+        with contextlib.redirect_stdout(output):
+            levels.append(await run_level(source_video, concurrency, args.jobs, timer, args))
+        if output is not sys.stdout:
+            output.close()
+    return levels
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="외부 서비스 에뮬레이터를 사용한 전체 파이프라인(process_video_file) 벤치마크")
+    parser.add_argument("--duration", type=float, default=30, help="합성 영상 길이(초) (기본값: 30)")
+    parser.add_argument("--jobs", type=int, default=4, help="동시 실행 수 단계마다 실행할 작업 수 (기본값: 4)")
+    parser.add_argument("--concurrency", type=lambda value: [int(v) for v in value.split(",")], default=[1, 2, 4],
+                        help="쉼표로 구분한 동시 실행 수 목록 (기본값: 1,2,4)")
+    parser.add_argument("--background-mode", default="ducking", choices=["ducking", "separation"], help="배경음 방식 (기본값: ducking)")
+    parser.add_argument("--output-mode", default="mp4", choices=["mp4", "hls"], help="출력 방식 (기본값: mp4)")
+    for name, spec in DEFAULT_PROFILES.items():
+        parser.add_argument(f"--{name}", default=spec, help=f"{name} 지연/오류 '중앙값[,sigma[,오류율]]' (기본값: {spec})")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="STT/화자 분리 작업 확인 간격(초) (기본값: 0.05)")
+    parser.add_argument("--seed", type=int, default=0, help="지연/오류 난수 시드 (기본값: 0)")
+    parser.add_argument("--tts-cache", action="store_true", help="TTS 캐시 사용 (기본값: 사용 안 함, 모든 합성이 에뮬레이터를 호출)")
+    parser.add_argument("--keep", action="store_true", help="작업 공간을 삭제하지 않음")
+    parser.add_argument("--profile", action="store_true", help="작업마다 프로파일 저장 (--keep과 함께 사용하면 작업 공간의 profile 디렉토리에 남음)")
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 로그 출력")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    # 설정 모듈이 읽기 전에 환경 변수 지정
+    os.environ["STT_POLL_INTERVAL"] = str(args.poll_interval)
+    os.environ["DIARIZATION_POLL_INTERVAL"] = str(args.poll_interval)
+    os.environ["PROGRESS_MIN_INTERVAL"] = os.environ.get("PROGRESS_MIN_INTERVAL", "0.2")
+    os.environ["TTS_CACHE_ENABLED"] = "true" if args.tts_cache else "false"
+
+    emulators = Emulators({
+        name: FaultModel.parse(getattr(args, name), seed=args.seed + index)
+        for index, name in enumerate(DEFAULT_PROFILES)
+    })
+    emulators.install()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        source_video = os.path.join(work_dir, "source.mp4")
+        print(f"합성 영상 생성: {args.duration:.0f}초")
+        generate_video(source_video, args.duration)
+        levels = asyncio.run(run(args, emulators, source_video))
+
+    print_report(levels, emulators)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "args": {key: value for key, value in vars(args).items() if key != "json"},
+                "levels": levels,
+                "emulators": emulators.stats(),
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import time
+import wave
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+from src.services.separation import SeparationService
+
+def generate_music_like(path: str, duration: float, sample_rate: int = 44100, seed: int = 0) -> None:
+    """화음, 타악기 유사 잡음, 음성 유사 배음을 섞은 스테레오 WAV 생성"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    chord = sum(np.sin(2 * np.pi * f * t) for f in (220.0, 277.2, 329.6)) / 3
+    beat = rng.normal(0, 1, len(t)) * np.exp(-((t * 2) % 1) * 20)
+    voice = np.sin(2 * np.pi * (180 + 20 * np.sin(2 * np.pi * 0.5 * t)) * t) * np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+    left = 0.4 * chord + 0.2 * beat + 0.3 * voice
+    right = 0.4 * chord + 0.2 * np.roll(beat, 200) + 0.3 * voice
+    pcm = (np.clip(np.stack([left, right], axis=1), -1, 1) * 32767).astype("<i2")
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+
+async def measure(workers: int, audio_path: str, repeat: int) -> float:
+    """워커 수별 평균 분리 시간(초) (모델/프로세스 풀 준비 시간 제외)"""
+    service = SeparationService(num_workers=workers)
+    service.output_dir = tempfile.mkdtemp(prefix="bench_separation_")
+    try:
+        # 모델 로드와 워커 프로세스 기동을 측정에서 제외하기 위한 예열
+        await service.separate(audio_path, job_id="warmup")
+        started = time.perf_counter()
+        for i in range(repeat):
+            await service.separate(audio_path, job_id=f"run-{i}")
+        return (time.perf_counter() - started) / repeat
+    finally:
+        await service.shutdown()
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Demucs 구간 분리 코어 확장성 벤치마크")
+    parser.add_argument("--duration", type=float, default=120, help="입력 길이(초) (기본값: 120)")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help="측정할 워커 수")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (기본값: 1)")
+    args = parser.parse_args()
+
+    audio_path = os.path.join(tempfile.mkdtemp(prefix="bench_separation_"), "input.wav")
+    generate_music_like(audio_path, args.duration)
+
+    print(f"{'워커':>6} {'시간(s)':>10} {'x실시간':>10} {'가속':>8}")
+    baseline = None
+    for workers in args.workers:
+        elapsed = asyncio.run(measure(workers, audio_path, args.repeat))
+        baseline = baseline or elapsed
+        print(f"{workers:>6} {elapsed:>10.2f} {args.duration / elapsed:>10.2f} {baseline / elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
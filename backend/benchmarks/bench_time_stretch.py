@@ -0,0 +1,56 @@
+import time
+import argparse
+import numpy as np
+from pydub import AudioSegment
+from src.services.time_stretch import time_stretch
+
+def generate_speech_like(duration: float, sample_rate: int, seed: int = 0) -> np.ndarray:
+    """배음과 음절 단위 진폭 변조를 가진 음성 유사 신호 생성"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    signal = sum(np.sin(phase * h) / h for h in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t + rng.uniform(0, np.pi)), 0, None)
+    noise = rng.normal(0, 0.02, len(t))
+    return (np.clip(signal * envelope * 0.3 + noise, -1, 1) * 32767).astype(np.int16)
+
+def run_pydub(samples: np.ndarray, sample_rate: int, factor: float) -> int:
+    """pydub speedup 결과 길이(프레임)"""
+    segment = AudioSegment(samples.tobytes(), frame_rate=sample_rate, sample_width=2, channels=1)
+    return int(segment.speedup(playback_speed=factor).frame_count())
+
+def run_wsola(samples: np.ndarray, sample_rate: int, factor: float) -> int:
+    """WSOLA 결과 길이(프레임)"""
+    return len(time_stretch(samples, int(len(samples) / factor), sample_rate))
+
+def measure(func, samples: np.ndarray, sample_rate: int, factor: float, repeat: int):
+    """처리량(오디오 초/실행 초)과 목표 길이 대비 오차(ms)"""
+    target = int(len(samples) / factor)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        length = func(samples, sample_rate, factor)
+    elapsed = (time.perf_counter() - started) / repeat
+    throughput = len(samples) / sample_rate / elapsed
+    error_ms = abs(length - target) / sample_rate * 1000
+    return throughput, error_ms
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="시간 축 조절 벤치마크 (pydub speedup vs WSOLA)")
+    parser.add_argument("--durations", type=float, nargs="+", default=[2, 8, 30], help="세그먼트 길이(초)")
+    parser.add_argument("--factors", type=float, nargs="+", default=[1.05, 1.2, 1.5], help="배속")
+    parser.add_argument("--sample-rate", type=int, default=24000, help="샘플레이트 (기본값: 24000)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본값: 3)")
+    args = parser.parse_args()
+
+    print(f"{'길이(s)':>8} {'배속':>6} {'pydub(x실시간)':>14} {'pydub 오차(ms)':>14} {'wsola(x실시간)':>14} {'wsola 오차(ms)':>14}")
+    for duration in args.durations:
+        samples = generate_speech_like(duration, args.sample_rate)
+        for factor in args.factors:
+            pydub_speed, pydub_error = measure(run_pydub, samples, args.sample_rate, factor, args.repeat)
+            wsola_speed, wsola_error = measure(run_wsola, samples, args.sample_rate, factor, args.repeat)
+            print(f"{duration:>8g} {factor:>6.2f} {pydub_speed:>14.1f} {pydub_error:>14.1f} {wsola_speed:>14.1f} {wsola_error:>14.1f}")
+
+if __name__ == "__main__":
+    main()
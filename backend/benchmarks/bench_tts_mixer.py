@@ -0,0 +1,69 @@
+import time
+import random
+import argparse
+import tracemalloc
+import numpy as np
+from pydub import AudioSegment
+from src.services.audio_mixer import TimelineMixer
+
+def generate_segments(minutes: float, segments_per_minute: int, sample_rate: int, seed: int = 0):
+    """긴 트랜스크립트를 흉내 낸 (시작 시간, int16 PCM) 세그먼트 목록 생성"""
+    rng = np.random.default_rng(seed)
+    random.seed(seed)
+    total = minutes * 60
+    segments = []
+    for _ in range(int(minutes * segments_per_minute)):
+        start = random.uniform(0, total - 1)
+        duration = random.uniform(0.5, 6.0)
+        frames = int(duration * sample_rate)
+        samples = rng.integers(-8000, 8000, size=frames, dtype=np.int16)
+        segments.append((start, samples))
+    return total, segments
+
+def run_pydub(total: float, segments, sample_rate: int) -> None:
+    """기존 방식: 세그먼트마다 전체 트랙을 복사하는 pydub overlay"""
+    final_audio = AudioSegment.silent(duration=int(total * 1000), frame_rate=sample_rate)
+    for start, samples in segments:
+        segment = AudioSegment(samples.tobytes(), frame_rate=sample_rate, sample_width=2, channels=1)
+        final_audio = final_audio.overlay(segment, position=int(start * 1000))
+    final_audio.raw_data
+
+def run_mixer(total: float, segments, sample_rate: int) -> None:
+    """미리 할당한 버퍼에 제자리 합성"""
+    mixer = TimelineMixer(total, sample_rate)
+    for start, samples in segments:
+        mixer.add(samples, start)
+    mixer.to_int16()
+
+def measure(func, *args):
+    """실행 시간(초)과 최대 메모리 사용량(MB) 측정"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="TTS 타임라인 조립 벤치마크 (pydub overlay vs TimelineMixer)")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 30], help="트랜스크립트 길이(분)")
+    parser.add_argument("--density", type=int, default=30, help="분당 세그먼트 수 (기본값: 30)")
+    parser.add_argument("--sample-rate", type=int, default=24000, help="샘플레이트 (기본값: 24000)")
+    parser.add_argument("--skip-pydub", action="store_true", help="pydub 측정 생략 (긴 입력용)")
+    args = parser.parse_args()
+
+    print(f"{'길이(분)':>8} {'세그먼트':>8} {'pydub(s)':>10} {'pydub(MB)':>10} {'mixer(s)':>10} {'mixer(MB)':>10} {'배속':>8}")
+    for minutes in args.minutes:
+        total, segments = generate_segments(minutes, args.density, args.sample_rate)
+        mixer_time, mixer_mem = measure(run_mixer, total, segments, args.sample_rate)
+        if args.skip_pydub:
+            pydub_time, pydub_mem = float("nan"), float("nan")
+        else:
+            pydub_time, pydub_mem = measure(run_pydub, total, segments, args.sample_rate)
+        speedup = pydub_time / mixer_time if mixer_time else float("nan")
+        print(f"{minutes:>8g} {len(segments):>8d} {pydub_time:>10.3f} {pydub_mem:>10.1f} {mixer_time:>10.3f} {mixer_mem:>10.1f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+"""
+외부 서비스 에뮬레이터 (오프라인 파이프라인 벤치마크용)
+
+Google Cloud(Speech v2 배치 인식, Translation v3, Text-to-Speech, GCS), PyAnnote.ai REST API,
+Redis를 프로세스 안의 가짜 구현으로 대체합니다. 각 에뮬레이터는 서비스가 실제로 사용하는
+호출 형태와 응답 구조만 흉내 내며, 호출마다 FaultModel에 따른 지연과 오류를 넣습니다.
+블로킹 클라이언트 호출은 실제 클라이언트처럼 호출한 스레드를 막습니다.
+"""
+import io
+import re
+import json
+import math
+import time
+import wave
+import random
+import threading
+import numpy as np
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+class EmulatedServiceError(Exception):
+    """에뮬레이터가 주입한 오류"""
+
+class FaultModel:
+    """
+    호출 지연(로그정규 분포)과 오류 확률
+
+    Args:
+        median (float): 지연 중앙값(초)
+        sigma (float): 로그정규 분포의 sigma (0이면 항상 median)
+        error_rate (float): 호출이 실패할 확률 (0~1)
+        seed (Optional[int]): 난수 시드
+    """
+
+    def __init__(self, median: float = 0.0, sigma: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    @classmethod
+    def parse(cls, spec: str, seed: Optional[int] = None) -> "FaultModel":
+        """'중앙값[,sigma[,오류율]]' 형식 문자열로 생성 (예: 0.2,0.5,0.01)"""
+        values = [float(value) for value in spec.split(",")]
+        return cls(*values[:3], seed=seed)
+
+    def sample(self) -> Tuple[float, bool]:
+        """(지연 시간(초), 실패 여부) 추출"""
+        with self.lock:
+            self.calls += 1
+            delay = self.median * math.exp(self.rng.gauss(0, self.sigma)) if self.median > 0 else 0.0
+            failed = self.rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def apply(self, name: str) -> None:
+        """지연만큼 블로킹 대기 후 확률적으로 EmulatedServiceError 발생"""
+        delay, failed = self.sample()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise EmulatedServiceError(f"{name}: 에뮬레이터 주입 오류")
+
+    def __repr__(self) -> str:
+        return f"FaultModel(median={self.median}, sigma={self.sigma}, error_rate={self.error_rate})"
+
+WORDS = (
+    "the quick team shipped a new build today and everyone wanted to see how the "
+    "video pipeline handles long recordings with many speakers talking over music "
+    "while we measure latency throughput memory and cost for each stage"
+).split()
+
+def wav_duration(data: bytes) -> float:
+    """WAV 바이트의 길이(초)"""
+    with wave.open(io.BytesIO(data), "rb") as reader:
+        return reader.getnframes() / float(reader.getframerate())
+
+def synthetic_script(duration: float, speakers: int = 2, seed: int = 0) -> List[Dict]:
+    """
+    오디오 길이에 맞는 가짜 발화 목록 생성 (STT와 화자 분리 에뮬레이터가 같은 타임라인을 공유)
+
+    Returns:
+        List[Dict]: {"speaker", "start", "end", "words": [(단어, 시작, 끝), ...]} 목록
+    """
+    rng = random.Random(seed)
+    script = []
+    position = 0.3
+    turn = 0
+    while position < duration - 1.0:
+        start = position
+        words = []
+        for _ in range(rng.randint(6, 14)):
+            length = rng.uniform(0.25, 0.5)
+            if position + length > duration - 0.2:
+                break
+            words.append((rng.choice(WORDS), round(position, 2), round(position + length, 2)))
+            position += length + rng.uniform(0.02, 0.12)
+        if not words:
+            break
+        # 문장 끝 구두점 (병합기의 문장 분할용)
+        word, word_start, word_end = words[-1]
+        words[-1] = (word + ".", word_start, word_end)
+        script.append({
+            "speaker": f"SPEAKER_{turn % speakers:02d}",
+            "start": words[0][1],
+            "end": words[-1][2],
+            "words": words,
+        })
+        position += rng.uniform(0.4, 1.2)
+        turn += 1
+    return script
+
+def pcm_wav(duration: float, sample_rate: int, frequency: float = 220.0) -> bytes:
+    """LINEAR16 모노 WAV 바이트 (TTS 응답처럼 헤더 포함)"""
+    frames = max(1, int(duration * sample_rate))
+    t = np.arange(frames, dtype=np.float32) / sample_rate
+    samples = (0.2 * 32767 * np.sin(2 * np.pi * frequency * t)).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+def split_gcs_uri(uri: str) -> Tuple[str, str]:
+    bucket, _, name = uri.replace("gs://", "", 1).partition("/")
+    return bucket, name
+
+class FakeBlob:
+    def __init__(self, storage: "FakeStorageClient", bucket: str, name: str):
+        self.storage = storage
+        self.bucket_name = bucket
+        self.name = name
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.bucket_name, self.name
+
+    def upload_from_filename(self, filename: str, **kwargs) -> None:
+        with open(filename, "rb") as f:
+            self.upload_from_string(f.read())
+
+    def upload_from_string(self, data, content_type: Optional[str] = None, **kwargs) -> None:
+        self.storage.fault.apply("gcs.upload")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.storage.put(self.key, data)
+
+    def download_as_bytes(self, **kwargs) -> bytes:
+        self.storage.fault.apply("gcs.download")
+        data = self.storage.objects.get(self.key)
+        if data is None:
+            raise FileNotFoundError(f"gs://{self.bucket_name}/{self.name}")
+        return data
+
+    def download_to_filename(self, filename: str, **kwargs) -> None:
+        data = self.download_as_bytes()
+        with open(filename, "wb") as f:
+            f.write(data)
+
+    def exists(self, **kwargs) -> bool:
+        return self.key in self.storage.objects
+
+    def delete(self, **kwargs) -> None:
+        self.storage.objects.pop(self.key, None)
+
+    def generate_signed_url(self, **kwargs) -> str:
+        return f"https://storage.example.invalid/{self.bucket_name}/{self.name}"
+
+class FakeBucket:
+    def __init__(self, storage: "FakeStorageClient", name: str):
+        self.storage = storage
+        self.name = name
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self.storage, self.name, name)
+
+class FakeStorageClient:
+    """메모리에 객체를 저장하는 GCS 클라이언트"""
+
+    def __init__(self, fault: Optional[FaultModel] = None):
+        self.fault = fault or FaultModel()
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        self.lock = threading.Lock()
+        self.uploaded_bytes = 0
+
+    def put(self, key: Tuple[str, str], data: bytes) -> None:
+        with self.lock:
+            self.objects[key] = data
+            self.uploaded_bytes += len(data)
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(self, name)
+
+class FakeOperation:
+    """Speech v2 batch_recognize 장기 실행 작업"""
+
+    def __init__(self, ready_at: float, started_at: float, response=None, error: Optional[Exception] = None):
+        self.ready_at = ready_at
+        self.started_at = started_at
+        self.response = response
+        self.error = error
+
+    def done(self) -> bool:
+        return time.monotonic() >= self.ready_at
+
+    @property
+    def metadata(self):
+        span = max(self.ready_at - self.started_at, 1e-6)
+        percent = min(100, int(100 * (time.monotonic() - self.started_at) / span))
+        return SimpleNamespace(progress_percent=percent)
+
+    def result(self):
+        if self.error:
+            raise self.error
+        return self.response
+
+class FakeSpeechClient:
+    """
+    Speech v2 배치 인식 클라이언트
+
+    입력 오디오를 가짜 GCS에서 읽어 길이를 구하고, synthetic_script 타임라인의 단어와 오프셋을
+    실제 배치 인식 결과와 같은 JSON 구조로 결과 경로에 기록합니다. 작업 완료까지의 시간은
+    FaultModel 지연을 따르며, 오류는 operation.result()에서 발생합니다.
+    """
+
+    def __init__(self, storage: FakeStorageClient, fault: Optional[FaultModel] = None, speakers: int = 2):
+        self.storage = storage
+        self.fault = fault or FaultModel()
+        self.speakers = speakers
+
+    def batch_recognize(self, request=None, **kwargs) -> FakeOperation:
+        audio_uri = request.files[0].uri
+        output_uri = request.recognition_output_config.gcs_output_config.uri
+        delay, failed = self.fault.sample()
+        started = time.monotonic()
+        if failed:
+            return FakeOperation(started + delay, started, error=EmulatedServiceError("speech.batch_recognize: 에뮬레이터 주입 오류"))
+
+        audio = self.storage.bucket(split_gcs_uri(audio_uri)[0]).blob(split_gcs_uri(audio_uri)[1]).download_as_bytes()
+        results = [
+            {"alternatives": [{
+                "transcript": " ".join(word for word, _, _ in line["words"]),
+                "words": [
+                    {"word": word, "startOffset": f"{start:.3f}s", "endOffset": f"{end:.3f}s"}
+                    for word, start, end in line["words"]
+                ],
+            }]}
+            for line in synthetic_script(wav_duration(audio), self.speakers)
+        ]
+        result_uri = output_uri.rstrip("/") + "/" + audio_uri.rsplit("/", 1)[-1].rsplit(".", 1)[0] + "_transcript.json"
+        bucket, name = split_gcs_uri(result_uri)
+        self.storage.put((bucket, name), json.dumps({"results": results}).encode("utf-8"))
+        response = SimpleNamespace(results={audio_uri: SimpleNamespace(uri=result_uri)})
+        return FakeOperation(started + delay, started, response=response)
+
+HANGUL = "가나다라마바사아자차카타파하서울부산대구인천광주대전"
+
+class FakeTranslationClient:
+    """Translation v3 클라이언트 (단어마다 길이가 비슷한 한글 음절열을 돌려줌)"""
+
+    def __init__(self, fault: Optional[FaultModel] = None):
+        self.fault = fault or FaultModel()
+
+    def translate_text(self, request=None, **kwargs):
+        self.fault.apply("translate.translate_text")
+        translated = []
+        for content in request.contents:
+            words = [
+                "".join(HANGUL[(sum(map(ord, word)) + i) % len(HANGUL)] for i in range(max(1, len(word) // 2)))
+                for word in content.split()
+            ]
+            translated.append(SimpleNamespace(translated_text=" ".join(words)))
+        return SimpleNamespace(translations=translated)
+
+class FakeTTSClient:
+    """
+    Text-to-Speech 클라이언트 (v1 synthesize_speech와 v1beta1 SSML mark 시점 모두 지원)
+
+    합성 길이는 글자 수 / (chars_per_second × speaking_rate)이며 LINEAR16 WAV를 돌려줍니다.
+    """
+
+    MARK = re.compile(r'<mark name="([^"]+)"/>')
+    TAG = re.compile(r"<[^>]+>")
+
+    def __init__(self, fault: Optional[FaultModel] = None, chars_per_second: float = 6.0, sample_rate: int = 24000):
+        self.fault = fault or FaultModel()
+        self.chars_per_second = chars_per_second
+        self.sample_rate = sample_rate
+        self.characters = 0
+
+    def _seconds(self, text: str, speaking_rate: float) -> float:
+        return len(text.replace(" ", "")) / (self.chars_per_second * (speaking_rate or 1.0))
+
+    def synthesize_speech(self, request=None, input=None, voice=None, audio_config=None, **kwargs):
+        if request is not None:
+            input, audio_config = request.input, request.audio_config
+        self.fault.apply("tts.synthesize_speech")
+        sample_rate = getattr(audio_config, "sample_rate_hertz", 0) or self.sample_rate
+        speaking_rate = getattr(audio_config, "speaking_rate", 1.0) or 1.0
+
+        timepoints = []
+        if getattr(input, "ssml", ""):
+            # mark 사이 텍스트 길이로 각 mark 시점 계산
+            position = 0.0
+            for piece in re.split(r"(<mark name=\"[^\"]+\"/>)", input.ssml):
+                mark = self.MARK.fullmatch(piece)
+                if mark:
+                    timepoints.append(SimpleNamespace(mark_name=mark.group(1), time_seconds=position))
+                else:
+                    position += self._seconds(self.TAG.sub("", piece), speaking_rate)
+            duration, text = position, self.TAG.sub("", input.ssml)
+        else:
+            text = input.text
+            duration = self._seconds(text, speaking_rate)
+        self.characters += len(text)
+        return SimpleNamespace(audio_content=pcm_wav(duration, sample_rate), timepoints=timepoints)
+
+class FakeResponse:
+    """requests.Response 중 서비스가 사용하는 부분"""
+
+    def __init__(self, status_code: int, payload: Optional[Dict] = None):
+        self.status_code = status_code
+        self.payload = payload or {}
+
+    def json(self) -> Dict:
+        return self.payload
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self.payload)
+
+class FakePyAnnoteAPI:
+    """
+    PyAnnote.ai REST API (`requests` 모듈 자리에 주입)
+
+    POST /media/input → pre-signed URL, PUT 업로드, POST /diarize → jobId,
+    GET /jobs/<id> → FaultModel 지연이 지나기 전에는 running, 이후 succeeded와 output.diarization.
+    오류는 해당 호출의 503 응답으로 주입합니다.
+    """
+
+    def __init__(self, fault: Optional[FaultModel] = None, speakers: int = 2):
+        self.fault = fault or FaultModel()
+        self.speakers = speakers
+        self.media: Dict[str, float] = {}
+        self.jobs: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+        self.counter = 0
+
+    def _fail(self) -> Optional[FakeResponse]:
+        _, failed = self.fault.sample()
+        return FakeResponse(503, {"message": "에뮬레이터 주입 오류"}) if failed else None
+
+    def post(self, url: str, json: Optional[Dict] = None, headers: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        failure = self._fail()
+        if failure:
+            return failure
+        if url.endswith("/media/input"):
+            return FakeResponse(201, {"url": f"https://upload.example.invalid/{json['url'].replace('media://', '')}"})
+        if url.endswith("/diarize"):
+            with self.lock:
+                self.counter += 1
+                job_id = f"job-{self.counter}"
+                delay, _ = self.fault.sample()
+                key = json["url"].replace("media://", "")
+                self.jobs[job_id] = {"ready_at": time.monotonic() + delay, "duration": self.media.get(key, 0.0)}
+            return FakeResponse(200, {"jobId": job_id, "status": "created"})
+        return FakeResponse(404, {"message": url})
+
+    def put(self, url: str, headers: Optional[Dict] = None, data: bytes = b"", **kwargs) -> FakeResponse:
+        failure = self._fail()
+        if failure:
+            return failure
+        with self.lock:
+            self.media[url.rsplit("/", 1)[-1]] = wav_duration(data)
+        return FakeResponse(200)
+
+    def get(self, url: str, headers: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        job = self.jobs.get(url.rsplit("/", 1)[-1])
+        if job is None:
+            return FakeResponse(404, {"message": url})
+        if time.monotonic() < job["ready_at"]:
+            return FakeResponse(200, {"status": "running"})
+        segments = [
+            {"speaker": line["speaker"], "start": line["start"], "end": line["end"]}
+            for line in synthetic_script(job["duration"], self.speakers)
+        ]
+        return FakeResponse(200, {"status": "succeeded", "output": {"diarization": segments}})
+
+class Emulators:
+    """에뮬레이터 묶음을 만들어 서비스 싱글턴에 설치"""
+
+    SERVICES = ("gcs", "speech", "translate", "tts", "pyannote")
+
+    def __init__(self, faults: Optional[Dict[str, FaultModel]] = None, speakers: int = 2):
+        faults = faults or {}
+        self.faults = {name: faults.get(name) or FaultModel() for name in self.SERVICES}
+        self.storage = FakeStorageClient(self.faults["gcs"])
+        self.speech = FakeSpeechClient(self.storage, self.faults["speech"], speakers)
+        self.translate = FakeTranslationClient(self.faults["translate"])
+        self.tts = FakeTTSClient(self.faults["tts"])
+        self.pyannote = FakePyAnnoteAPI(self.faults["pyannote"], speakers)
+        self.redis = None
+
+    def install(self) -> None:
+        """클라이언트 레지스트리, PyAnnote 클라이언트의 requests, 작업 관리자의 Redis를 교체"""
+        try:
+            from fakeredis import aioredis as fake_aioredis
+        except ImportError:
+            raise SystemExit("fakeredis가 필요합니다: pip install fakeredis")
+        from src.services.clients import clients
+        from src.services import diarization
+        from src.services.task_manager import task_manager, TaskEventBroker
+
+        clients.override("storage", self.storage)
+        clients.override("speech", self.speech)
+        clients.override("translate", self.translate)
+        clients.override("tts", self.tts)
+        clients.override("tts_batch", self.tts)
+        diarization.requests = self.pyannote
+
+        self.redis = fake_aioredis.FakeRedis(decode_responses=True)
+        task_manager.redis = self.redis
+        task_manager.events = TaskEventBroker(self.redis)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """서비스별 호출/주입 오류 수"""
+        return {name: {"calls": fault.calls, "errors": fault.errors} for name, fault in self.faults.items()}
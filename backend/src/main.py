@@ -1,13 +1,21 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from src.routes import process
+from src.services import config
+from src.services.separation import separation_service
+from src.services.task_manager import task_manager
+from src.services.janitor import artifact_janitor
+from src.services.clients import clients
+from src.services.metrics import metrics
+from prometheus_client import CONTENT_TYPE_LATEST
 import os
+import time
 import logging
 
 # 로깅 설정
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=config.LOG_LEVEL)
 logger = logging.getLogger("uvicorn")
 
 # Load environment variables
@@ -40,20 +48,64 @@ app.add_middleware(
 
 @app.middleware("http")
 async def log_requests(request, call_next):
-    logger.debug(f"Request: {request.method} {request.url}")
-    logger.debug(f"Headers: {request.headers}")
+    # 요청 경로에서는 DEBUG가 켜진 경우에만 메시지를 만들고, 처리 시간은 라우트 템플릿 단위로 기록
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug(f"Request: {request.method} {request.url}")
+        logger.debug(f"Headers: {request.headers}")
+    started = time.perf_counter()
     response = await call_next(request)
-    logger.debug(f"Response status: {response.status_code}")
+    route = request.scope.get("route")
+    metrics.observe_request(request.method, getattr(route, "path", "unmatched"),
+                            response.status_code, time.perf_counter() - started)
+    if debug:
+        logger.debug(f"Response status: {response.status_code}")
     return response
 
+@app.on_event("startup")
+async def start_workers():
+    # 음원 분리 워커 시작 (설정 시 Demucs 모델 미리 로드)
+    if config.DEMUCS_PRELOAD:
+        separation_service.start(preload=True)
+    # 산출물 정리 주기 작업 시작
+    artifact_janitor.start()
+    # 이벤트 루프 지연 측정 시작
+    metrics.start()
+    # 설정된 클라이언트 미리 생성 (기본값은 첫 사용 시 생성)
+    if config.CLIENT_WARMUP:
+        names = None if config.CLIENT_WARMUP == "all" else [name.strip() for name in config.CLIENT_WARMUP.split(",") if name.strip()]
+        print(f"클라이언트 미리 생성 완료: {await clients.warmup(names)}")
+
+@app.on_event("shutdown")
+async def stop_workers():
+    await separation_service.shutdown()
+    await artifact_janitor.stop()
+    await metrics.stop()
+    await task_manager.close()
+
 # 라우터 등록
 app.include_router(process.router, prefix="/api/process", tags=["process"])
 
+# 정적 파일 리다이렉트 모드에서 별도 정적 서버가 없으면 작업 결과 영상만 직접 제공 (TEMP_DIR 전체를 공개하지 않음)
+if config.DOWNLOAD_REDIRECT_MODE == "static" and config.DOWNLOAD_STATIC_BASE_URL.startswith("/"):
+    app.add_api_route(
+        f"{config.DOWNLOAD_STATIC_BASE_URL.rstrip('/')}/{{task_id}}/{{filename}}",
+        process.serve_output_file,
+        methods=["GET"],
+        include_in_schema=False
+    )
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+# Prometheus 지표 수집 endpoint
+if config.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        return Response(await metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
 # Root endpoint
 @app.get("/")
 async def root():
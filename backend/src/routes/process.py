@@ -1,30 +1,37 @@
 import os
 import uuid
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, FileResponse
+from enum import Enum
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Request, Query
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
 import re
 import yt_dlp
 import ffmpeg
-from pathlib import Path
 import subprocess
 from src.services import config
-from src.services.task_manager import TaskManager, TaskStatus, ProcessingStage
+from src.services.task_manager import task_manager, TaskStatus, ProcessingStage
 from src.services.stt import stt_service
 from src.services.nmt import nmt_service
 from src.services.tts import tts_service
-from src.services.video_audio_merger import video_audio_merger
+from src.services.video_audio_merger import video_audio_merger, BackgroundMode, OutputMode
+from src.services.ducking import speech_intervals
+from src.services.ffmpeg_runner import ffmpeg_runner
+from src.services.file_delivery import file_delivery
+from src.services.progress import ProgressReporter
+from src.services.janitor import artifact_janitor, ArtifactKind
+from src.services.workspace import TaskWorkspace
+from src.services.clients import clients
+from src.services.tracing import tracer, file_size
+from src.services.profiling import task_profiler
 from src.services.diarization import diarization_service
 from src.services.diarization_stt_merger import diarization_stt_merger
-from google.cloud import storage
 import tempfile
 import asyncio
 import shutil
 import json
 
 router = APIRouter()
-task_manager = TaskManager()
 
 # CORS 설정
 origins = [
@@ -36,10 +43,35 @@ class YouTubeRequest(BaseModel):
     url: str
     source_language: Optional[str] = "ko"
     target_language: Optional[str] = "en"
+    background_mode: Optional[BackgroundMode] = None  # separation(고품질) 또는 ducking(빠름), 미지정 시 서버 기본값
+    output_mode: Optional[OutputMode] = None  # mp4 또는 hls(생성되는 대로 재생 가능), 미지정 시 서버 기본값
+    profile: bool = False  # 처리 과정 프로파일링 (PROFILING_ENABLED일 때만 허용)
 
 class FeedbackRequest(BaseModel):
     rating: int
 
+class BulkStatusRequest(BaseModel):
+    task_ids: List[str]
+
+class TraceFormat(str, Enum):
+    SUMMARY = "summary"  # 구간 목록과 이름별 시간 합계
+    OTLP = "otlp"  # OpenTelemetry OTLP/HTTP JSON (수집기로 그대로 전송 가능)
+
+class ProfileArtifact(str, Enum):
+    FLAMEGRAPH = "flamegraph"  # 스택 샘플링 결과 SVG 플레임그래프
+    STACKS = "stacks"  # folded stacks 텍스트 (flamegraph.pl, speedscope 입력)
+    MEMORY = "memory"  # 단계 경계별 tracemalloc 할당 보고서
+
+PROFILE_MEDIA_TYPES = {
+    ProfileArtifact.FLAMEGRAPH: "image/svg+xml",
+    ProfileArtifact.STACKS: "text/plain; charset=utf-8",
+    ProfileArtifact.MEMORY: "text/plain; charset=utf-8",
+}
+
+def check_profiling_allowed(profile: bool) -> None:
+    if profile and not task_profiler.enabled:
+        raise HTTPException(status_code=403, detail="작업 프로파일링이 허용되지 않은 서버입니다. (PROFILING_ENABLED)")
+
 class TaskStatusUpdate(BaseModel):
     status: str
     stage: Optional[str] = None
@@ -47,6 +79,12 @@ class TaskStatusUpdate(BaseModel):
     result: Optional[str] = None
     error: Optional[str] = None
 
+def public_status(task_status: Optional[dict]) -> Optional[dict]:
+    """응답용 작업 상태 (산출물 manifest는 서버 내부 절대 경로이므로 이름만 공개)"""
+    if task_status is None:
+        return None
+    return {**task_status, "artifacts": sorted(task_status.get("artifacts") or {})}
+
 def sanitize_filename(filename: str) -> str:
     """파일명에서 특수문자 제거 및 공백을 언더스코어로 변경"""
     filename = re.sub(r"[\\/*?:\"<>|#']", '_', filename)
@@ -57,21 +95,23 @@ async def extract_audio(video_path: str, original_audio_path: str, denoised_audi
     """비디오 파일에서 오디오를 추출하는 함수"""
     try:
         # 원본 오디오 추출
-        stream = ffmpeg.input(video_path)
-        stream = ffmpeg.output(stream, original_audio_path,
-                             acodec='pcm_s16le',
-                             ac=2,
-                             ar='44.1k')
-        ffmpeg.run(stream, overwrite_output=True, quiet=True)
+        original_stream = ffmpeg.output(ffmpeg.input(video_path), original_audio_path,
+                                        acodec='pcm_s16le',
+                                        ac=2,
+                                        ar='44.1k')
         
         # 노이즈 제거 오디오 추출
-        stream = ffmpeg.input(video_path)
-        stream = ffmpeg.output(stream, denoised_audio_path,
-                            acodec='pcm_s16le',
-                            ac=1,
-                            ar='16k',
-                            af='afftdn=nf=-25')
-        ffmpeg.run(stream, overwrite_output=True, quiet=True)
+        denoised_stream = ffmpeg.output(ffmpeg.input(video_path), denoised_audio_path,
+                                        acodec='pcm_s16le',
+                                        ac=1,
+                                        ar='16k',
+                                        af='afftdn=nf=-25')
+        
+        # 두 추출 작업을 동시에 실행 (동시 프로세스 수는 실행기에서 제한)
+        await asyncio.gather(
+            ffmpeg_runner.run(original_stream),
+            ffmpeg_runner.run(denoised_stream)
+        )
         
         return denoised_audio_path, original_audio_path
         
@@ -90,13 +130,13 @@ async def upload_to_gcs(local_path: str, gcs_path: str) -> bool:
         blob_name = gcs_parts[1] if len(gcs_parts) > 1 else os.path.basename(local_path)
         
         # 스토리지 클라이언트 생성
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
+        bucket = clients.storage.bucket(bucket_name)
         blob = bucket.blob(blob_name)
         
         # 파일 업로드
         print(f"파일 업로드 시작: {local_path} -> gs://{bucket_name}/{blob_name}")
-        blob.upload_from_filename(local_path)
+        with tracer.span("gcs.upload", bytes=file_size(local_path), object=blob_name):
+            blob.upload_from_filename(local_path)
         print(f"파일 업로드 완료: {local_path} -> gs://{bucket_name}/{blob_name}")
         
         return True
@@ -104,10 +144,9 @@ async def upload_to_gcs(local_path: str, gcs_path: str) -> bool:
         print(f"GCS 업로드 오류: {str(e)}")
         return False
 
-async def download_youtube_video(url: str) -> Tuple[str, str, str]:
-    """유튜브 영상을 다운로드하고 오디오를 추출"""
-    output_dir = os.path.join(config.TEMP_DIR, "input_videos")
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+async def download_youtube_video(url: str, workspace: TaskWorkspace) -> Tuple[str, str, str]:
+    """유튜브 영상을 작업 공간에 다운로드하고 오디오를 추출"""
+    output_dir = workspace.dir("input_videos")
     
     try:
         # 비디오 다운로드 옵션
@@ -143,9 +182,10 @@ async def download_youtube_video(url: str) -> Tuple[str, str, str]:
                 
                 # 다운로드 옵션 업데이트 - 정제된 파일명으로 다운로드
                 ydl_opts['outtmpl'] = os.path.join(output_dir, f"{sanitized_title}.%(ext)s")
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl_download:
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl_download, tracer.span("youtube.download") as span:
                     # 영상 다운로드
                     ydl_download.download([url])
+                    span.set(bytes=file_size(os.path.join(output_dir, f"{sanitized_title}.mp4")))
                 
                 # 정제된 파일 경로 (이미 정제된 이름으로 다운로드됨)
                 sanitized_video_path = os.path.join(output_dir, f"{sanitized_title}.mp4")
@@ -168,16 +208,8 @@ async def download_youtube_video(url: str) -> Tuple[str, str, str]:
                     sanitized_denoised_audio_path
                 )
 
-                # GCS 버킷에 업로드 (정제된 파일 이름 사용)
-                gcs_bucket = "gs://onevoice-test-bucket/resources/input_videos"
-                # 정제된 파일명 사용
-                sanitized_video_filename = os.path.basename(video_path)
-                sanitized_original_audio_filename = os.path.basename(original_audio_path)
-                sanitized_denoised_audio_filename = os.path.basename(denoised_audio_path)
-                
-                await upload_to_gcs(video_path, f"{gcs_bucket}/{sanitized_video_filename}")
-                await upload_to_gcs(original_audio_path, f"{gcs_bucket}/{sanitized_original_audio_filename}")
-                await upload_to_gcs(denoised_audio_path, f"{gcs_bucket}/{sanitized_denoised_audio_filename}")
+                # GCS 버킷에 업로드 (작업 ID 경로 아래)
+                await upload_inputs_to_gcs(workspace, video_path, original_audio_path, denoised_audio_path)
 
                 return video_path, denoised_audio_path, original_audio_path
                     
@@ -192,33 +224,64 @@ async def download_youtube_video(url: str) -> Tuple[str, str, str]:
             raise e
         raise HTTPException(status_code=500, detail=str(e))
 
-async def process_video_file(video_path: str, task_id: str, denoised_audio_path: str = None, original_audio_path: str = None):
-    """비디오 파일 처리 프로세스"""
+async def upload_inputs_to_gcs(workspace: TaskWorkspace, *paths: str) -> None:
+    """입력 영상과 추출 오디오를 작업 ID가 붙은 GCS 경로에 업로드 (STT가 이 경로의 오디오를 사용)"""
+    await asyncio.gather(*(
+        upload_to_gcs(path, f"gs://onevoice-test-bucket/{workspace.gcs_path('input_videos', os.path.basename(path))}")
+        for path in paths
+    ))
+
+async def process_video_file(video_path: str, task_id: str, denoised_audio_path: str = None, original_audio_path: str = None,
+                             background_mode: Optional[BackgroundMode] = None,
+                             output_mode: Optional[OutputMode] = None,
+                             profile: bool = False):
+    """
+    비디오 파일 처리 프로세스 (단계와 외부 호출 구간을 작업 추적에 기록)
+
+    profile이 True면 스택 샘플링과 단계별 메모리 스냅샷을 작업 공간의 profile 디렉토리에 저장합니다.
+    """
+    async with tracer.trace(
+        task_id,
+        "pipeline",
+        background_mode=BackgroundMode(background_mode or config.BACKGROUND_MODE).value,
+        output_mode=OutputMode(output_mode or config.OUTPUT_MODE).value
+    ) as root:
+        if not profile:
+            await run_pipeline(video_path, task_id, denoised_audio_path, original_audio_path, background_mode, output_mode)
+            return
+        async with task_profiler.profile(task_id, root):
+            await run_pipeline(video_path, task_id, denoised_audio_path, original_audio_path, background_mode, output_mode)
+
+async def run_pipeline(video_path: str, task_id: str, denoised_audio_path: str = None, original_audio_path: str = None,
+                       background_mode: Optional[BackgroundMode] = None,
+                       output_mode: Optional[OutputMode] = None):
+    """
+    비디오 파일 처리 단계 실행
+
+    전체 진행률 구간: STT·화자 분리 0~20, 병합 20~25, 번역 25~60, TTS 60~85, 배경음 85~95, 합성 95~100
+    (HLS 출력 모드에서는 TTS와 배경음이 60~90을 함께 사용하고 합성이 90~100)
+    """
+    progress = ProgressReporter(task_id)
+    workspace = TaskWorkspace(task_id)
+    await workspace.register("input_video", video_path)
+    await workspace.register("denoised_audio", denoised_audio_path)
+    await workspace.register("original_audio", original_audio_path)
     try:
-        # STT와 화자 분리를 병렬로 실행
-        # 1. STT 작업 시작
-        await task_manager.update_task_status(
-            task_id,
-            status=TaskStatus.PROCESSING,
-            stage=ProcessingStage.STT,
-            progress=0
-        )
-        
-        # 2. 화자 분리 작업 시작
-        await task_manager.update_task_status(
-            task_id,
-            status=TaskStatus.PROCESSING,
-            stage=ProcessingStage.DIARIZATION,
-            progress=0
+        # 1~2. STT와 화자 분리를 병렬로 실행
+        stt_progress, diarization_progress = progress.parallel_callbacks(
+            [ProcessingStage.STT, ProcessingStage.DIARIZATION], 0, 20
         )
+        stt_progress(0.0)
         
         # 두 작업을 동시에 실행
-        stt_task = asyncio.create_task(
-            stt_service.process_video(video_path, denoised_audio_path, original_audio_path)
-        )
-        diarization_task = asyncio.create_task(
-            diarization_service.process_video(video_path, denoised_audio_path, original_audio_path)
-        )
+        stt_task = asyncio.create_task(tracer.traced(
+            "stage.stt",
+            stt_service.process_video(video_path, denoised_audio_path, original_audio_path, stt_progress, workspace)
+        ))
+        diarization_task = asyncio.create_task(tracer.traced(
+            "stage.diarization",
+            diarization_service.process_video(video_path, denoised_audio_path, original_audio_path, diarization_progress, workspace)
+        ))
         
         # 두 작업이 모두 완료될 때까지 대기
         stt_result, diarization_result = await asyncio.gather(stt_task, diarization_task)
@@ -231,32 +294,23 @@ async def process_video_file(video_path: str, task_id: str, denoised_audio_path:
             print("경고: 화자 분리에 실패했습니다. STT 결과만 사용합니다.")
         
         # 3. 결과 병합 단계
-        await task_manager.update_task_status(
-            task_id,
-            status=TaskStatus.PROCESSING,
-            stage=ProcessingStage.MERGE,
-            progress=20
-        )
+        progress.report(ProcessingStage.MERGE, 20)
         
         # 화자 분리 결과가 있는 경우, 병합 수행
         merged_result_path = None
         if diarization_result:
-            merged_result_path = await diarization_stt_merger.merge_results(
+            merged_result_path = await tracer.traced("stage.merge", diarization_stt_merger.merge_results(
                 stt_result, 
                 diarization_result,
-                denoised_audio_path
-            )
+                denoised_audio_path,
+                workspace
+            ))
             
             if merged_result_path:
                 await task_manager.update_merged_result(task_id, merged_result_path)
         
         # 4. 번역 단계
-        await task_manager.update_task_status(
-            task_id,
-            status=TaskStatus.PROCESSING,
-            stage=ProcessingStage.TRANSLATION,
-            progress=40
-        )
+        progress.report(ProcessingStage.TRANSLATION, 25)
         
         # NMT: 병합된 결과 파일 내용을 읽어서 한국어로 번역
         input_filename = os.path.basename(video_path)
@@ -264,44 +318,142 @@ async def process_video_file(video_path: str, task_id: str, denoised_audio_path:
         with open(merged_result_path, 'r', encoding='utf-8') as f:
             merged_content = f.read()
             
-        translated_text = await nmt_service.process_transcript(merged_content, task_id, input_filename)
+        translated_text = await tracer.traced("stage.translation", nmt_service.process_transcript(
+            merged_content,
+            task_id,
+            input_filename,
+            progress.stage_callback(ProcessingStage.TRANSLATION, 25, 60),
+            workspace
+        ))
         if not translated_text:
             raise Exception("번역에 실패했습니다.")
             
         # 5. TTS 단계
-        await task_manager.update_task_status(
-            task_id,
-            status=TaskStatus.PROCESSING,
-            stage=ProcessingStage.TTS,
-            progress=70
-        )
-        
-        # TTS: 번역된 텍스트를 음성으로 변환
-        tts_audio_path = await tts_service.process_text(task_id, video_path)
-        if not tts_audio_path:
-            raise Exception("음성 합성에 실패했습니다.")
+        progress.report(ProcessingStage.TTS, 60)
         
-        # 6. 비디오와 오디오 병합
-        output_path = await video_audio_merger.process_video(task_id, video_path, tts_audio_path, original_audio_path)
+        if OutputMode(output_mode or config.OUTPUT_MODE) == OutputMode.HLS:
+            output_path = await process_progressive_output(
+                task_id, video_path, original_audio_path, background_mode, diarization_result, progress, workspace
+            )
+        else:
+            # TTS: 번역된 텍스트를 음성으로 변환
+            tts_audio_path = await tracer.traced("stage.tts", tts_service.process_text(
+                task_id,
+                video_path,
+                progress_callback=progress.stage_callback(ProcessingStage.TTS, 60, 85),
+                workspace=workspace
+            ))
+            if not tts_audio_path:
+                raise Exception("음성 합성에 실패했습니다.")
+            
+            # 6. 배경음 준비 후 비디오와 오디오 병합
+            progress.report(ProcessingStage.SEPARATION, 85)
+            output_path = await video_audio_merger.process_video(
+                task_id,
+                video_path,
+                tts_audio_path,
+                original_audio_path,
+                background_mode=background_mode,
+                speech_intervals=speech_intervals(diarization_result),
+                progress_callback=progress.stage_callback(ProcessingStage.MUX, 95, 100),
+                background_progress_callback=progress.stage_callback(ProcessingStage.SEPARATION, 85, 95),
+                workspace=workspace
+            )
         if not output_path:
             raise Exception("비디오 합성에 실패했습니다.")
         
-        # 작업 완료
-        await task_manager.complete_task(task_id, output_path)
+        # 진행률 기록이 완료 상태를 덮어쓰지 않도록 먼저 반영
+        await progress.flush()
+        tracer.current_span().set(progress_reports=progress.reports, progress_writes=progress.writes)
+        
+        # 작업 완료 (MP4/HLS 출력 모두 mux 단계에서 끝남)
+        await task_manager.complete_task(task_id, output_path, stage=ProcessingStage.MUX)
+        
+        # 결과물만 남기고 중간 산출물 삭제
+        if config.CLEANUP_INTERMEDIATES:
+            freed = await artifact_janitor.cleanup_task(task_id)
+            print(f"중간 산출물 정리: {freed / (1024 * 1024):.1f}MB")
         
     except Exception as e:
+        await progress.flush()
         await task_manager.fail_task(task_id, str(e))
         raise e
 
+async def process_progressive_output(task_id: str, video_path: str, original_audio_path: str,
+                                     background_mode: Optional[BackgroundMode], diarization_result,
+                                     progress: ProgressReporter, workspace: TaskWorkspace) -> Optional[str]:
+    """TTS 합성, 배경음 준비, HLS 게시를 동시에 진행 (앞부분부터 재생 가능)"""
+    # 배경음 분리가 늦어져도 TTS 오디오가 메모리에 계속 쌓이지 않도록 대기열 크기를 제한
+    tts_queue: asyncio.Queue = asyncio.Queue(maxsize=config.HLS_TTS_QUEUE_MAX_CHUNKS)
+    
+    async def tts_chunks():
+        while True:
+            chunk = await tts_queue.get()
+            if chunk is None:
+                return
+            yield chunk
+    
+    tts_progress, background_progress = progress.parallel_callbacks(
+        [ProcessingStage.TTS, ProcessingStage.SEPARATION], 60, 90
+    )
+    await task_manager.update_playlist(task_id, os.path.join(video_audio_merger.hls_dir(task_id), "playlist.m3u8"))
+    await workspace.register("hls", video_audio_merger.hls_dir(task_id), ArtifactKind.OUTPUT)
+    merge_task = asyncio.create_task(video_audio_merger.process_video_progressive(
+        task_id,
+        video_path,
+        tts_chunks(),
+        tts_service.sample_rate,
+        original_audio_path,
+        background_mode=background_mode,
+        speech_intervals=speech_intervals(diarization_result),
+        background_progress_callback=background_progress,
+        workspace=workspace
+    ))
+    
+    async def feed(chunk: Optional[bytes]) -> None:
+        """대기열에 자리가 날 때까지 기다리되, HLS 생성이 먼저 끝나면(오류 포함) 더 기다리지 않음"""
+        put = asyncio.ensure_future(tts_queue.put(chunk))
+        await asyncio.wait([put, merge_task], return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            merge_task.result()
+            raise Exception("HLS 생성이 오디오를 모두 받기 전에 종료되었습니다.")
+    
+    try:
+        # TTS: 번역된 텍스트를 음성으로 변환 (확정된 앞부분부터 HLS 생성기로 전달)
+        tts_audio_path = await tracer.traced("stage.tts", tts_service.process_text(
+            task_id,
+            video_path,
+            audio_callback=lambda samples: feed(samples.tobytes()),
+            progress_callback=tts_progress,
+            workspace=workspace
+        ))
+        if not tts_audio_path:
+            raise Exception("음성 합성에 실패했습니다.")
+        await feed(None)
+        output_path = await merge_task
+        progress.report(ProcessingStage.MUX, 100)
+        return output_path
+    finally:
+        if not merge_task.done():
+            merge_task.cancel()
+
 @router.post("")
 async def upload_video(
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    background_mode: Optional[BackgroundMode] = Form(None),
+    output_mode: Optional[OutputMode] = Form(None),
+    profile: bool = Form(False)
 ):
     """MP4 파일 업로드 엔드포인트"""
     if not file.filename.endswith('.mp4'):
         raise HTTPException(status_code=400, detail="MP4 파일만 업로드 가능합니다.")
+    check_profiling_allowed(profile)
     
+    # 작업 ID 생성 후 작업 공간의 input_videos 디렉토리에 저장
+    task_id = str(uuid.uuid4())
+    workspace = TaskWorkspace(task_id)
     try:
         # 파일 이름 정제
         original_filename = file.filename
@@ -310,9 +462,7 @@ async def upload_video(
         print(f"원본 파일명: {original_filename}")
         print(f"정제된 파일명: {sanitized_filename}")
         
-        # input_videos 디렉토리 경로 설정
-        input_videos_dir = os.path.join(config.TEMP_DIR, "input_videos")
-        Path(input_videos_dir).mkdir(parents=True, exist_ok=True)
+        input_videos_dir = workspace.dir("input_videos")
         
         # 정제된 이름으로 input_videos 디렉토리에 파일 저장
         video_path = os.path.join(input_videos_dir, sanitized_filename)
@@ -325,26 +475,17 @@ async def upload_video(
         denoised_audio_path = os.path.join(input_videos_dir, f"{sanitized_base}_denoised.wav")
         original_audio_path = os.path.join(input_videos_dir, f"{sanitized_base}.wav")
         
-        # 오디오 추출 함수 호출
-        denoised_audio_path, original_audio_path = await extract_audio(
-            video_path, 
-            original_audio_path, 
-            denoised_audio_path
-        )
-        
-        # GCS 버킷에 업로드 (정제된 파일 이름 사용)
-        gcs_bucket = "gs://onevoice-test-bucket/resources/input_videos"
-        # 정제된 파일명 사용
-        sanitized_video_filename = os.path.basename(video_path)
-        sanitized_original_audio_filename = os.path.basename(original_audio_path)
-        sanitized_denoised_audio_filename = os.path.basename(denoised_audio_path)
-        
-        await upload_to_gcs(video_path, f"{gcs_bucket}/{sanitized_video_filename}")
-        await upload_to_gcs(original_audio_path, f"{gcs_bucket}/{sanitized_original_audio_filename}")
-        await upload_to_gcs(denoised_audio_path, f"{gcs_bucket}/{sanitized_denoised_audio_filename}")
+        async with tracer.trace(task_id, "ingest", source="upload", bytes=len(content)):
+            # 오디오 추출 함수 호출
+            denoised_audio_path, original_audio_path = await extract_audio(
+                video_path, 
+                original_audio_path, 
+                denoised_audio_path
+            )
+            
+            # GCS 버킷에 업로드 (작업 ID 경로 아래)
+            await upload_inputs_to_gcs(workspace, video_path, original_audio_path, denoised_audio_path)
         
-        # 작업 ID 생성
-        task_id = str(uuid.uuid4())
         await task_manager.create_task(task_id)
         
         # 백그라운드 작업 시작
@@ -353,12 +494,17 @@ async def upload_video(
             video_path,
             task_id,
             denoised_audio_path,
-            original_audio_path
+            original_audio_path,
+            background_mode,
+            output_mode,
+            profile
         )
         
         return {"task_id": task_id, "status": TaskStatus.PENDING}
     
     except Exception as e:
+        # 작업이 만들어지기 전에 실패하면 정리기가 추적하지 않으므로 직접 삭제
+        workspace.remove()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.options("/youtube")
@@ -393,18 +539,21 @@ async def process_youtube(
     request: YouTubeRequest
 ):
     """YouTube 비디오 처리 엔드포인트"""
+    check_profiling_allowed(request.profile)
+    # 작업 ID 생성 (다운로드 파일은 작업 공간에 저장)
+    task_id = str(uuid.uuid4())
+    workspace = TaskWorkspace(task_id)
     try:
         # URL 유효성 검사
         if not request.url or not isinstance(request.url, str):
             raise HTTPException(status_code=400, detail="유효한 YouTube URL을 입력해주세요.")
 
         # 비디오 다운로드
-        video_path, denoised_audio_path, original_audio_path = await download_youtube_video(request.url)
+        async with tracer.trace(task_id, "ingest", source="youtube"):
+            video_path, denoised_audio_path, original_audio_path = await download_youtube_video(request.url, workspace)
         if not video_path:
             raise HTTPException(status_code=500, detail="비디오 다운로드에 실패했습니다.")
         
-        # 작업 ID 생성
-        task_id = str(uuid.uuid4())
         await task_manager.create_task(task_id)
         
         # 백그라운드 작업 시작
@@ -413,26 +562,122 @@ async def process_youtube(
             video_path,
             task_id,
             denoised_audio_path,
-            original_audio_path
+            original_audio_path,
+            request.background_mode,
+            request.output_mode,
+            request.profile
         )
         
         return {"task_id": task_id, "status": TaskStatus.PENDING}
     
     except Exception as e:
+        # 작업이 만들어지기 전에 실패하면 정리기가 추적하지 않으므로 직접 삭제
+        workspace.remove()
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status/{task_id}")
 async def get_status(task_id: str):
-    """작업 상태 조회 엔드포인트"""
+    """
+    작업 상태 조회 엔드포인트
+
+    기존 필드(status, stage, progress, result, error 등)에 더해 다음 필드를 함께 반환합니다.
+    필드 추가만 있고 기존 필드의 의미는 같으므로 기존 클라이언트는 그대로 동작합니다.
+
+    - artifacts: 등록된 산출물 이름 목록 (서버 경로는 공개하지 않음)
+    - created_at, updated_at: 작업 생성/마지막 갱신 시각 (Unix 초)
+    - playlist: HLS 출력 모드일 때 플레이리스트가 설정됨 (그 외에는 null)
+
+    이전 형식으로 저장된 작업에는 created_at, updated_at, playlist가 없을 수 있습니다.
+    """
     task_status = await task_manager.get_task_status(task_id)
     if not task_status:
         raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
-    return task_status
+    return public_status(task_status)
+
+@router.post("/status/bulk")
+async def get_bulk_status(request: BulkStatusRequest):
+    """여러 작업의 상태를 한 번에 조회 (없는 작업은 null)"""
+    if len(request.task_ids) > task_manager.MAX_BULK_TASKS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {task_manager.MAX_BULK_TASKS}개 작업까지 조회할 수 있습니다."
+        )
+    statuses = await task_manager.get_task_statuses(request.task_ids)
+    return {task_id: public_status(task_status) for task_id, task_status in statuses.items()}
+
+@router.get("/tasks")
+async def list_tasks(
+    status: Optional[TaskStatus] = None,
+    stage: Optional[ProcessingStage] = None,
+    older_than: Optional[float] = Query(None, ge=0, description="기준 시각(상태/단계 진입 또는 생성)이 이 초보다 오래된 작업"),
+    newer_than: Optional[float] = Query(None, ge=0, description="기준 시각이 이 초 이내인 작업"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """상태/단계/생성 시각 인덱스로 작업 목록 조회 (예: 10분 넘게 처리 중인 작업 → status=processing&older_than=600)"""
+    tasks = await task_manager.query_tasks(
+        status=status,
+        stage=stage,
+        older_than=older_than,
+        newer_than=newer_than,
+        limit=limit,
+        offset=offset
+    )
+    return {"tasks": [public_status(task) for task in tasks], "counts": await task_manager.count_tasks()}
+
+@router.get("/janitor/stats")
+async def get_janitor_stats():
+    """산출물 정리 통계 (정리 사유별 확보 용량, 디스크 사용률, 마지막 정리 결과)"""
+    return await artifact_janitor.stats()
+
+@router.get("/trace/{task_id}")
+async def get_trace(task_id: str, format: TraceFormat = TraceFormat.SUMMARY):
+    """작업의 단계·외부 호출 구간 조회 (시작 시각, 소요 시간, 바이트, 재시도 횟수)"""
+    spans = await tracer.get_spans(task_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="작업 추적 정보를 찾을 수 없습니다.")
+    if format == TraceFormat.OTLP:
+        return tracer.to_otlp(task_id, spans)
+    return {"task_id": task_id, "breakdown": tracer.breakdown(spans), "spans": spans}
+
+@router.get("/profile/{task_id}")
+async def get_profile(task_id: str, artifact: ProfileArtifact = ProfileArtifact.FLAMEGRAPH):
+    """프로파일링을 요청한 작업의 플레임그래프, folded stacks, 메모리 보고서 다운로드"""
+    path = await TaskWorkspace(task_id).resolve(f"profile_{artifact.value}")
+    if not path:
+        raise HTTPException(status_code=404, detail="작업 프로파일을 찾을 수 없습니다.")
+    return FileResponse(path, media_type=PROFILE_MEDIA_TYPES[artifact])
+
+@router.get("/events/{task_id}")
+async def stream_task_events(task_id: str, request: Request):
+    """작업 상태 변경을 Server-Sent Events로 전달 (Redis pub/sub 기반, 완료/실패 시 종료)"""
+    if not await task_manager.get_task_status(task_id):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    async def event_stream():
+        # 연결이 끊기면 브라우저가 3초 후 재연결
+        yield "retry: 3000\n\n"
+        async for state in task_manager.watch_task(task_id):
+            if await request.is_disconnected():
+                break
+            if state is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: status\ndata: {json.dumps(public_status(state), ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 @router.get("/download/{task_id}")
-async def download_video(task_id: str):
+async def download_video(task_id: str, request: Request):
     """완성된 비디오 파일 다운로드"""
     try:
         # 작업 상태 확인
@@ -459,18 +704,81 @@ async def download_video(task_id: str):
         if not os.path.exists(full_path):
             raise HTTPException(status_code=404, detail=f"결과 파일을 찾을 수 없습니다: {full_path}")
             
-        # 파일 응답 반환
-        return FileResponse(
+        # 파일 응답 반환 (Range/조건부 요청 지원, 설정 시 서명 URL로 리다이렉트)
+        await artifact_janitor.touch(task_id, full_path)
+        is_output_video = (task_status.get("artifacts") or {}).get("output_video") == full_path
+        return await file_delivery.respond(
+            request,
             full_path,
             media_type="video/mp4",
-            filename=os.path.basename(full_path)
+            filename=os.path.basename(full_path),
+            gcs_blob_name=video_audio_merger.output_blob_name(full_path, TaskWorkspace(task_id)),
+            task_id=task_id if is_output_video else None
         )
             
     except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
         raise HTTPException(status_code=500, detail=f"다운로드 중 오류가 발생했습니다: {str(e)}")
 
+async def serve_output_file(task_id: str, filename: str, request: Request):
+    """
+    정적 경로 리다이렉트 대상 (DOWNLOAD_STATIC_BASE_URL이 /로 시작할 때 main에서 등록)
+
+    작업 manifest에 등록된 결과 영상(output_video)과 파일명이 일치할 때만 전송합니다.
+    """
+    output_path = await TaskWorkspace(task_id).resolve("output_video")
+    if not output_path or os.path.basename(output_path) != filename:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    
+    await artifact_janitor.touch(task_id, output_path)
+    return await file_delivery.respond(request, output_path, media_type="video/mp4", filename=filename, redirect=False)
+
+@router.get("/hls/{task_id}/playlist.m3u8")
+async def get_hls_playlist(task_id: str):
+    """점진적으로 게시되는 HLS 플레이리스트 (첫 구간이 생성된 뒤부터 재생 가능)"""
+    task_status = await task_manager.get_task_status(task_id)
+    if not task_status:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    playlist_path = task_status.get("playlist")
+    if not playlist_path:
+        raise HTTPException(status_code=404, detail="HLS 출력 모드로 처리 중인 작업이 아닙니다.")
+    if not os.path.exists(playlist_path):
+        raise HTTPException(status_code=404, detail="아직 재생 가능한 구간이 없습니다.")
+    
+    await artifact_janitor.touch(task_id, os.path.dirname(playlist_path))
+    
+    # 처리 중에는 플레이리스트가 계속 갱신되므로 캐시하지 않음
+    return FileResponse(
+        playlist_path,
+        media_type="application/vnd.apple.mpegurl",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@router.get("/hls/{task_id}/{segment_name}")
+async def get_hls_segment(task_id: str, segment_name: str):
+    """HLS 초기화 구간(init.mp4) 및 미디어 구간(seg_*.m4s)"""
+    if not re.fullmatch(r"init\.mp4|seg_\d+\.m4s", segment_name):
+        raise HTTPException(status_code=404, detail="구간을 찾을 수 없습니다.")
+    
+    task_status = await task_manager.get_task_status(task_id)
+    if not task_status or not task_status.get("playlist"):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    segment_path = os.path.join(os.path.dirname(task_status["playlist"]), segment_name)
+    if not os.path.exists(segment_path):
+        raise HTTPException(status_code=404, detail="구간을 찾을 수 없습니다.")
+    
+    # 한 번 게시된 구간은 변경되지 않음
+    return FileResponse(
+        segment_path,
+        media_type="video/mp4" if segment_name == "init.mp4" else "video/iso.segment",
+        headers={"Cache-Control": "public, max-age=86400, immutable"}
+    )
+
 @router.get("/download-merged/{task_id}")
-async def download_merged_result(task_id: str):
+async def download_merged_result(task_id: str, request: Request):
     """병합된 화자 분리 및 STT 결과 다운로드"""
     try:
         # 작업 상태 확인
@@ -499,14 +807,18 @@ async def download_merged_result(task_id: str):
         if not os.path.exists(full_path):
             raise HTTPException(status_code=404, detail=f"결과 파일을 찾을 수 없습니다: {full_path}")
             
-        # 파일 응답 반환
-        return FileResponse(
+        # 파일 응답 반환 (Range/조건부 요청 지원)
+        await artifact_janitor.touch(task_id, full_path)
+        return await file_delivery.respond(
+            request,
             full_path,
             media_type=media_type,
             filename=os.path.basename(full_path)
         )
             
     except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
         raise HTTPException(status_code=500, detail=f"다운로드 중 오류가 발생했습니다: {str(e)}")
 
 @router.post("/feedback/{task_id}")
@@ -521,7 +833,7 @@ async def submit_feedback(task_id: str, request: FeedbackRequest):
     
     # 피드백 저장 (Redis에 저장)
     feedback_key = f"feedback:{task_id}"
-    task_manager.redis.set(feedback_key, request.rating)
+    await task_manager.redis.set(feedback_key, request.rating, ex=task_manager.ttl)
     
     return {"message": "피드백이 성공적으로 저장되었습니다."}
 
@@ -534,21 +846,20 @@ async def update_task_status(task_id: str, status_update: TaskStatusUpdate):
         if not task_data:
             raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
         
-        # 상태 업데이트
-        task_data["status"] = status_update.status
+        # 변경된 필드만 Redis에 저장
+        fields = {"status": status_update.status}
         if status_update.stage:
-            task_data["stage"] = status_update.stage
+            fields["stage"] = status_update.stage
         if status_update.progress is not None:
-            task_data["progress"] = status_update.progress
+            fields["progress"] = status_update.progress
         if status_update.result:
-            task_data["result"] = status_update.result
+            fields["result"] = status_update.result
         if status_update.error:
-            task_data["error"] = status_update.error
-        
-        # Redis에 업데이트된 상태 저장
-        task_manager.redis.set(f"task:{task_id}", json.dumps(task_data))
+            fields["error"] = status_update.error
+        await task_manager.update_fields(task_id, fields)
+        task_data.update(fields)
         
-        return {"message": "작업 상태가 업데이트되었습니다.", "task_data": task_data}
+        return {"message": "작업 상태가 업데이트되었습니다.", "task_data": public_status(task_data)}
     
     except Exception as e:
         if isinstance(e, HTTPException):
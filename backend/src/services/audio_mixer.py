@@ -0,0 +1,91 @@
+import struct
+import wave
+from typing import Optional, Tuple
+import numpy as np
+
+def decode_linear16(audio_content: bytes) -> Tuple[np.ndarray, Optional[int], int]:
+    """
+    TTS LINEAR16 응답(WAV 헤더 포함 또는 헤더 없는 PCM)을 복사 없이 int16 배열로 변환
+
+    Args:
+        audio_content (bytes): synthesize_speech 응답의 audio_content
+
+    Returns:
+        Tuple[np.ndarray, Optional[int], int]: (샘플 배열, 샘플레이트, 채널 수)
+            헤더가 없는 경우 샘플레이트는 None
+    """
+    if audio_content[:4] != b"RIFF" or audio_content[8:12] != b"WAVE":
+        return np.frombuffer(audio_content, dtype="<i2", count=len(audio_content) // 2), None, 1
+
+    sample_rate = None
+    channels = 1
+    offset = 12
+    while offset + 8 <= len(audio_content):
+        chunk_id = audio_content[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", audio_content, offset + 4)[0]
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            channels, sample_rate = struct.unpack_from("<HI", audio_content, body + 2)
+        elif chunk_id == b"data":
+            # 스트리밍 응답은 data 크기가 0xFFFFFFFF일 수 있으므로 실제 길이로 제한
+            data_size = min(chunk_size, len(audio_content) - body)
+            samples = np.frombuffer(audio_content, dtype="<i2", count=data_size // 2, offset=body)
+            return samples, sample_rate, channels
+
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise ValueError("WAV 데이터 청크를 찾을 수 없습니다.")
+
+class TimelineMixer:
+    """미리 할당한 하나의 버퍼에 세그먼트를 제자리에서 더하는 타임라인 믹서"""
+
+    def __init__(self, duration_sec: float, sample_rate: int, channels: int = 1):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.num_frames = max(0, int(round(duration_sec * sample_rate)))
+        # 누적은 float32로 수행하고 저장 시 한 번만 int16 범위로 클리핑
+        self.buffer = np.zeros((self.num_frames, channels), dtype=np.float32)
+        # release()로 이미 내보낸 프레임 수
+        self.released_frames = 0
+
+    def add(self, samples: np.ndarray, start_sec: float) -> None:
+        """start_sec 위치에 int16 샘플을 더함 (타임라인 범위를 벗어난 부분은 버림)"""
+        self.add_at_frame(samples, int(round(start_sec * self.sample_rate)))
+
+    def add_at_frame(self, samples: np.ndarray, start_frame: int) -> None:
+        """start_frame 위치에 int16 샘플을 더함"""
+        frames = samples.reshape(-1, self.channels)
+        if start_frame < 0:
+            frames = frames[-start_frame:]
+            start_frame = 0
+        end_frame = min(self.num_frames, start_frame + len(frames))
+        if end_frame <= start_frame:
+            return
+        self.buffer[start_frame:end_frame] += frames[:end_frame - start_frame]
+
+    def release(self, until_frame: Optional[int] = None) -> np.ndarray:
+        """
+        아직 내보내지 않은 프레임 중 until_frame 이전까지를 int16 PCM으로 반환 (점진적 출력용)
+
+        호출자는 until_frame 이전 위치에 더 이상 세그먼트가 더해지지 않음을 보장해야 합니다.
+        """
+        until_frame = self.num_frames if until_frame is None else min(max(until_frame, 0), self.num_frames)
+        start_frame = self.released_frames
+        if until_frame <= start_frame:
+            return np.zeros((0, self.channels), dtype=np.int16)
+        self.released_frames = until_frame
+        return np.clip(self.buffer[start_frame:until_frame], -32768, 32767).astype(np.int16)
+
+    def to_int16(self) -> np.ndarray:
+        """클리핑 후 int16 PCM 배열 반환"""
+        return np.clip(self.buffer, -32768, 32767).astype(np.int16)
+
+    def write_wav(self, output_path: str) -> str:
+        """믹싱 결과를 WAV 파일로 한 번에 저장"""
+        with wave.open(output_path, "wb") as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(self.to_int16())
+        return output_path
@@ -0,0 +1,115 @@
+import time
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+def _storage_client():
+    from google.cloud import storage
+    return storage.Client()
+
+def _speech_client():
+    from google.cloud import speech_v2
+    return speech_v2.SpeechClient()
+
+def _translate_client():
+    from google.cloud import translate_v3
+    return translate_v3.TranslationServiceClient()
+
+def _tts_client():
+    from google.cloud import texttospeech
+    return texttospeech.TextToSpeechClient()
+
+def _tts_batch_client():
+    # SSML mark 시점(timepoint)은 v1beta1 API에서만 제공
+    from google.cloud import texttospeech_v1beta1
+    return texttospeech_v1beta1.TextToSpeechClient()
+
+class ClientRegistry:
+    """
+    프로세스 전역 Google Cloud 클라이언트 레지스트리
+
+    클라이언트(및 gRPC 채널, 인증 정보 조회)는 처음 사용할 때 한 번만 생성하여 모든 서비스가
+    공유합니다. 따라서 모듈 임포트나 /health 응답에는 클라이언트 생성 비용이 들지 않습니다.
+    서버 시작 시 미리 만들어 두려면 warmup()을, 테스트·벤치마크에서 가짜 클라이언트를 쓰려면
+    override()를 사용합니다.
+    """
+
+    FACTORIES: Dict[str, Callable[[], Any]] = {
+        "storage": _storage_client,
+        "speech": _speech_client,
+        "translate": _translate_client,
+        "tts": _tts_client,
+        "tts_batch": _tts_batch_client,
+    }
+
+    def __init__(self):
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.init_seconds: Dict[str, float] = {}
+
+    def get(self, name: str) -> Any:
+        """클라이언트 조회 (없으면 생성, 여러 스레드에서 호출해도 한 번만 생성)"""
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            if name not in self._clients:
+                started = time.perf_counter()
+                self._clients[name] = self.FACTORIES[name]()
+                self.init_seconds[name] = time.perf_counter() - started
+            return self._clients[name]
+
+    def override(self, name: str, client: Any) -> None:
+        """클라이언트를 지정한 객체로 대체 (테스트·벤치마크용)"""
+        if name not in self.FACTORIES:
+            raise KeyError(name)
+        with self._lock:
+            self._clients[name] = client
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """생성된 클라이언트를 버림 (다음 사용 시 다시 생성)"""
+        with self._lock:
+            if name is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(name, None)
+
+    async def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        클라이언트를 미리 생성 (생성은 블로킹이므로 스레드에서 동시에 수행)
+
+        Returns:
+            Dict[str, float]: 클라이언트별 생성 시간(초)
+        """
+        names = list(names or self.FACTORIES)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.get, name) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                print(f"클라이언트 미리 생성 실패 ({name}): {str(result)}")
+        return {name: self.init_seconds[name] for name in names if name in self.init_seconds}
+
+    @property
+    def storage(self):
+        return self.get("storage")
+
+    @property
+    def speech(self):
+        return self.get("speech")
+
+    @property
+    def translate(self):
+        return self.get("translate")
+
+    @property
+    def tts(self):
+        return self.get("tts")
+
+    @property
+    def tts_batch(self):
+        return self.get("tts_batch")
+
+# 전역 레지스트리 인스턴스 생성
+clients = ClientRegistry()
@@ -1,14 +1,12 @@
 import os
-from google.cloud import speech, translate_v2 as translate, texttospeech
+from google.cloud import texttospeech
 from dotenv import load_dotenv
 
 # 환경 변수 로드
 load_dotenv()
 
-# Google Cloud 클라이언트 초기화
-speech_client = speech.SpeechClient()
-translate_client = translate.Client()
-tts_client = texttospeech.TextToSpeechClient()
+# Google Cloud 클라이언트는 services/clients.py의 레지스트리에서 처음 사용할 때 생성
+CLIENT_WARMUP = os.getenv('CLIENT_WARMUP', '')  # 서버 시작 시 미리 생성할 클라이언트 (쉼표 구분, 예: storage,tts / all)
 
 # 프로젝트 설정
 PROJECT_ID = os.getenv('GOOGLE_CLOUD_PROJECT_ID')
@@ -33,4 +31,91 @@ AUDIO_CONFIG = texttospeech.AudioConfig(
     audio_encoding=texttospeech.AudioEncoding.LINEAR16,
     speaking_rate=1.0,
     pitch=0.0
-) 
\ No newline at end of file
+)
+
+# TTS 동시 요청 설정
+TTS_MAX_CONCURRENCY = int(os.getenv('TTS_MAX_CONCURRENCY', 8))  # 최대 동시 synthesize_speech 요청 수
+TTS_VOICE_MAX_RPS = float(os.getenv('TTS_VOICE_MAX_RPS', 0))  # 음성별 초당 최대 요청 수 (0이면 제한 없음)
+TTS_SAMPLE_RATE = int(os.getenv('TTS_SAMPLE_RATE', 24000))  # TTS 출력 및 믹싱 샘플레이트
+
+# TTS 오디오 캐시 설정
+TTS_CACHE_ENABLED = os.getenv('TTS_CACHE_ENABLED', 'true').lower() == 'true'
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', os.path.join(TEMP_DIR, 'tts_cache'))
+TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_BYTES', 1024 * 1024 * 1024))  # 기본 1GB
+TTS_CACHE_BUCKET_PREFIX = os.getenv('TTS_CACHE_BUCKET_PREFIX', '')  # 예: resources/tts_cache (비어 있으면 버킷 미사용)
+
+# 목표 길이 기반 합성 설정
+TTS_DEFAULT_CPS = float(os.getenv('TTS_DEFAULT_CPS', 6.0))  # 학습 전 기본 초당 글자 수 (speaking_rate 1.0 기준)
+TTS_MAX_SPEAKING_RATE = float(os.getenv('TTS_MAX_SPEAKING_RATE', 2.0))  # 요청 가능한 최대 speaking_rate
+TTS_MAX_LOCAL_STRETCH = float(os.getenv('TTS_MAX_LOCAL_STRETCH', 1.1))  # 재합성 없이 로컬에서 보정할 최대 배속
+TTS_RATE_MODEL_PATH = os.getenv('TTS_RATE_MODEL_PATH', os.path.join(TEMP_DIR, 'tts_rate_model.json'))
+
+# SSML 일괄 합성 설정 (<mark> 시점을 지원하는 음성에서만 사용, 현재 음성 프로필인 Chirp3-HD는 미지원이므로 기본값 꺼짐)
+# 켜더라도 mark 시점을 돌려주지 않는 음성은 첫 요청 이후 세그먼트별 합성으로 전환
+TTS_SSML_BATCH_ENABLED = os.getenv('TTS_SSML_BATCH_ENABLED', 'false').lower() == 'true'
+TTS_SSML_BATCH_MAX_SEGMENTS = int(os.getenv('TTS_SSML_BATCH_MAX_SEGMENTS', 8))  # 요청당 최대 세그먼트 수
+TTS_SSML_BATCH_MAX_BYTES = int(os.getenv('TTS_SSML_BATCH_MAX_BYTES', 4500))  # 요청당 최대 SSML 크기 (API 제한 5000바이트)
+
+# 음원 분리(Demucs) 설정
+DEMUCS_MODEL = os.getenv('DEMUCS_MODEL', 'htdemucs')
+DEMUCS_THREADS = int(os.getenv('DEMUCS_THREADS', os.cpu_count() or 1))  # 분리 워커의 torch CPU 스레드 수
+DEMUCS_PRELOAD = os.getenv('DEMUCS_PRELOAD', 'false').lower() == 'true'  # 서버 시작 시 모델 미리 로드
+# 구간 분리를 나눠 처리할 프로세스 수 (1이면 워커 스레드에서 처리)
+# 프로세스마다 torch와 Demucs 모델을 따로 올리므로 워커 하나당 약 1~2GB 메모리가 더 필요함 (코어 수가 아닌 메모리에 맞춰 설정)
+DEMUCS_WORKERS = int(os.getenv('DEMUCS_WORKERS', 2))
+DEMUCS_CHUNK_SECONDS = float(os.getenv('DEMUCS_CHUNK_SECONDS', 30))  # 분리 구간 길이
+DEMUCS_CHUNK_OVERLAP_SECONDS = float(os.getenv('DEMUCS_CHUNK_OVERLAP_SECONDS', 2))  # 구간 사이 크로스페이드 길이
+DEMUCS_SHUTDOWN_TIMEOUT = float(os.getenv('DEMUCS_SHUTDOWN_TIMEOUT', 10))  # 서버 종료 시 진행 중인 분리 작업을 기다리는 최대 시간(초)
+
+# 배경음 보존 방식 설정
+BACKGROUND_MODE = os.getenv('BACKGROUND_MODE', 'separation')  # separation: Demucs 음원 분리, ducking: 발화 구간 볼륨 감소
+DUCKING_GAIN_DB = float(os.getenv('DUCKING_GAIN_DB', -18))  # 발화 구간 원본 오디오 게인
+DUCKING_FADE_MS = float(os.getenv('DUCKING_FADE_MS', 150))  # 게인 전환 길이
+DUCKING_PAD_MS = float(os.getenv('DUCKING_PAD_MS', 100))  # 발화 구간 앞뒤 여유
+
+# ffmpeg 실행 설정
+FFMPEG_MAX_PROCESSES = int(os.getenv('FFMPEG_MAX_PROCESSES', max(1, (os.cpu_count() or 2) // 2)))  # 노드당 동시 ffmpeg 프로세스 수
+FFMPEG_TIMEOUT = float(os.getenv('FFMPEG_TIMEOUT', 1800))  # ffmpeg 1회 실행 제한 시간(초), 0이면 제한 없음
+
+# 결과 출력 방식 설정
+OUTPUT_MODE = os.getenv('OUTPUT_MODE', 'mp4')  # mp4: 완료 후 한 번에 생성, hls: fMP4 HLS 구간을 생성되는 대로 게시
+# hls 모드의 첫 구간은 배경음 준비가 끝난 뒤에 생성됨: separation 모드는 전체 음원 분리(Demucs)를 기다리므로
+# 그동안 TTS는 대기열이 가득 차면 멈추고, 첫 구간까지의 시간을 줄이려면 BACKGROUND_MODE=ducking을 사용
+HLS_SEGMENT_SECONDS = float(os.getenv('HLS_SEGMENT_SECONDS', 6))  # HLS 구간 길이 (비디오 키프레임 기준으로 잘림)
+HLS_TTS_QUEUE_MAX_CHUNKS = int(os.getenv('HLS_TTS_QUEUE_MAX_CHUNKS', 16))  # HLS 생성기로 넘기기 전 대기할 수 있는 TTS 오디오 조각 수 (가득 차면 합성을 멈춤)
+
+# 결과 다운로드 설정
+DOWNLOAD_REDIRECT_MODE = os.getenv('DOWNLOAD_REDIRECT_MODE', 'none')  # none: API에서 직접 전송, signed: GCS 서명 URL, static: 정적 파일 경로로 리다이렉트
+DOWNLOAD_SIGNED_URL_TTL = int(os.getenv('DOWNLOAD_SIGNED_URL_TTL', 300))  # 서명 URL 유효 시간(초)
+DOWNLOAD_STATIC_BASE_URL = os.getenv('DOWNLOAD_STATIC_BASE_URL', '/files')  # 작업 결과 영상을 /{작업 ID}/{파일명}으로 제공하는 정적 서버 주소 (/로 시작하면 API가 manifest의 output_video만 확인해 제공)
+
+# 진행률 기록 설정
+PROGRESS_MIN_INTERVAL = float(os.getenv('PROGRESS_MIN_INTERVAL', 1.0))  # 작업별 진행률 Redis 쓰기 최소 간격(초)
+
+# 작업 산출물 정리 설정
+CLEANUP_INTERMEDIATES = os.getenv('CLEANUP_INTERMEDIATES', 'true').lower() == 'true'  # 작업 완료 즉시 중간 산출물(입력 영상, WAV, TSV, 분리 음원 등) 삭제
+ARTIFACT_TTL_SECONDS = int(os.getenv('ARTIFACT_TTL_SECONDS', 24 * 3600))  # 끝난 작업의 산출물을 마지막 사용 후 보관하는 시간(초)
+JANITOR_INTERVAL = float(os.getenv('JANITOR_INTERVAL', 300))  # 정리 주기(초), 0이면 주기 정리 안 함
+DISK_HIGH_WATER = float(os.getenv('DISK_HIGH_WATER', 0.85))  # TEMP_DIR 볼륨 사용률이 이 값을 넘으면 오래 사용하지 않은 산출물부터 삭제
+DISK_LOW_WATER = float(os.getenv('DISK_LOW_WATER', 0.75))  # 삭제를 멈추는 사용률
+
+# 원격 작업 상태 확인 주기 설정
+STT_POLL_INTERVAL = float(os.getenv('STT_POLL_INTERVAL', 5))  # Speech v2 배치 인식 작업 확인 간격(초)
+DIARIZATION_POLL_INTERVAL = float(os.getenv('DIARIZATION_POLL_INTERVAL', 10))  # PyAnnote 화자 분리 작업 확인 간격(초)
+
+# 작업 추적 설정
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'true').lower() == 'true'  # 단계·외부 호출 구간 기록 (/api/process/trace/{task_id})
+TRACE_MAX_SPANS = int(os.getenv('TRACE_MAX_SPANS', 5000))  # 작업당 최대 저장 구간 수 (초과분은 개수만 기록)
+OTLP_ENDPOINT = os.getenv('OTLP_ENDPOINT', '')  # OTLP/HTTP 수집기 주소 (예: http://localhost:4318/v1/traces, 비어 있으면 내보내지 않음)
+OTLP_SERVICE_NAME = os.getenv('OTLP_SERVICE_NAME', 'onevoice-backend')  # 내보내는 구간의 service.name
+
+# 운영 지표 설정
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'  # Prometheus 형식 지표 수집 및 /metrics 제공
+METRICS_LOOP_LAG_INTERVAL = float(os.getenv('METRICS_LOOP_LAG_INTERVAL', 0.5))  # 이벤트 루프 지연 측정 간격(초), 0이면 측정 안 함
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')  # 애플리케이션 로그 레벨 (DEBUG면 요청마다 헤더 기록)
+
+# 작업 프로파일링 설정
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'  # 요청별 프로파일링 허용 (profile=true 요청만 프로파일링)
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', 0.01))  # 스택 샘플링 간격(초)
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv('PROFILE_TRACEMALLOC_FRAMES', 1))  # 할당 위치로 기록할 호출 스택 깊이
+PROFILE_TOP_ALLOCATIONS = int(os.getenv('PROFILE_TOP_ALLOCATIONS', 15))  # 단계마다 보고할 할당 증가 상위 항목 수
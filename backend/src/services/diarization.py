@@ -1,11 +1,14 @@
 import os
 import requests
 import json
+import math
 import time
 import asyncio
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from . import config
+from .workspace import TaskWorkspace
+from .tracing import tracer, file_size
 
 class PyAnnoteClient:
     """PyAnnote.ai API 클라이언트"""
@@ -188,63 +191,90 @@ class DiarizationService:
         self.output_dir = os.path.join(config.TEMP_DIR, "diarization")
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
     
-    async def process_audio(self, audio_path: str, num_speakers: Optional[int] = None) -> Optional[Dict[str, Any]]:
-        """오디오 파일에 대한 화자 분리 수행"""
+    async def process_audio(self, audio_path: str, num_speakers: Optional[int] = None,
+                            progress_callback: Optional[Callable[[float], None]] = None,
+                            workspace: Optional[TaskWorkspace] = None) -> Optional[Dict[str, Any]]:
+        """
+        오디오 파일에 대한 화자 분리 수행
+
+        PyAnnote.ai 작업 상태에는 진행률이 없으므로 progress_callback에는 업로드/작업 생성 후
+        대기 횟수에 따라 점근적으로 증가하는 추정 진행률(0~1)을 전달합니다.
+        workspace가 주어지면 결과 JSON을 작업 공간에 저장하고 manifest에 등록합니다.
+        """
+        report = progress_callback or (lambda fraction: None)
         try:
             print(f"화자 분리 시작: {audio_path}")
             
             # 1. PyAnnote.ai에 파일 업로드
-            media_url = await self.client.upload_file_to_pyannote(audio_path)
+            with tracer.span("pyannote.upload", bytes=file_size(audio_path)) as span:
+                media_url = await self.client.upload_file_to_pyannote(audio_path)
+                if not media_url:
+                    span.fail("업로드 실패")
             if not media_url:
                 print("오류: 파일 업로드에 실패했습니다.")
                 return None
-            
-            # 2. 화자 분리 작업 생성
-            job_id = await self.client.create_diarization_job(media_url, num_speakers)
-            if not job_id:
-                print("오류: 화자 분리 작업 생성에 실패했습니다.")
-                return None
-            
-            # 3. 작업 완료 대기
-            max_attempts = 60  # 최대 60번 시도 (약 10분)
-            attempt = 0
-            while attempt < max_attempts:
-                status_result = await self.client.get_job_status(job_id)
-                if not status_result:
-                    print("작업 상태 확인 실패")
+            report(0.1)
+            
+            # 2~3. 화자 분리 작업 생성 후 완료 대기 (하나의 구간으로 기록)
+            with tracer.span("pyannote.diarize") as span:
+                job_id = await self.client.create_diarization_job(media_url, num_speakers)
+                if not job_id:
+                    print("오류: 화자 분리 작업 생성에 실패했습니다.")
+                    span.fail("작업 생성 실패")
                     return None
+                span.set(job_id=job_id)
+                report(0.2)
+                
+                max_attempts = 60  # 최대 60번 시도 (기본 간격 10초 기준 약 10분)
+                attempt = 0
+                while attempt < max_attempts:
+                    status_result = await self.client.get_job_status(job_id)
+                    if not status_result:
+                        print("작업 상태 확인 실패")
+                        return None
+                        
+                    status = status_result.get("status")
+                    print(f"현재 작업 상태: {status}")
                     
-                status = status_result.get("status")
-                print(f"현재 작업 상태: {status}")
+                    if status == "succeeded":  # API 응답 상태가 succeeded로 변경됨
+                        break
+                    elif status in ["failed", "error"]:
+                        print("작업 처리 중 오류가 발생했습니다.")
+                        span.fail(f"작업 상태: {status}")
+                        return None
+                    
+                    attempt += 1
+                    report(0.2 + 0.7 * (1 - math.exp(-attempt / 6)))
+                    print(f"작업 완료 대기 중... ({attempt}/{max_attempts})")
+                    await asyncio.sleep(config.DIARIZATION_POLL_INTERVAL)
+                span.set(polls=attempt)
                 
-                if status == "succeeded":  # API 응답 상태가 succeeded로 변경됨
-                    break
-                elif status in ["failed", "error"]:
-                    print("작업 처리 중 오류가 발생했습니다.")
+                if attempt >= max_attempts:
+                    print("작업 시간 초과")
+                    span.fail("작업 시간 초과")
                     return None
-                
-                attempt += 1
-                print(f"작업 완료 대기 중... ({attempt}/{max_attempts})")
-                await asyncio.sleep(10)  # 10초 대기
-            
-            if attempt >= max_attempts:
-                print("작업 시간 초과")
-                return None
             
             # 4. 결과 가져오기
-            result = await self.client.get_diarization_result(job_id)
+            with tracer.span("pyannote.result") as span:
+                result = await self.client.get_diarization_result(job_id)
+                if not result:
+                    span.fail("결과 조회 실패")
             if not result:
                 print("오류: 화자 분리 결과를 가져오는데 실패했습니다.")
                 return None
             
             # 5. 결과 저장
             file_name = os.path.basename(audio_path).split('.')[0]
-            output_file = os.path.join(self.output_dir, f"{file_name}_diarization.json")
+            output_dir = workspace.dir("diarization") if workspace else self.output_dir
+            output_file = os.path.join(output_dir, f"{file_name}_diarization.json")
             
             with open(output_file, "w", encoding="utf-8") as f:
                 json.dump(result, f, ensure_ascii=False, indent=2)
+            if workspace:
+                await workspace.register("diarization", output_file)
             
             print(f"화자 분리 결과 저장 완료: {output_file}")
+            report(1.0)
             
             return result
         
@@ -252,11 +282,13 @@ class DiarizationService:
             print(f"화자 분리 처리 오류: {e}")
             return None
     
-    async def process_video(self, video_path: str, denoised_audio_path: str, original_audio_path: str) -> Optional[Dict[str, Any]]:
+    async def process_video(self, video_path: str, denoised_audio_path: str, original_audio_path: str,
+                            progress_callback: Optional[Callable[[float], None]] = None,
+                            workspace: Optional[TaskWorkspace] = None) -> Optional[Dict[str, Any]]:
         """비디오에서 화자 분리"""
         try:
             # 노이즈가 제거된 오디오 파일 사용
-            result = await self.process_audio(denoised_audio_path)
+            result = await self.process_audio(denoised_audio_path, progress_callback=progress_callback, workspace=workspace)
             return result
             
         except Exception as e:
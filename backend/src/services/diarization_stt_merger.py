@@ -3,6 +3,8 @@ import json
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from . import config
+from .workspace import TaskWorkspace
+from .janitor import ArtifactKind
 
 class DiarizationSTTMerger:
     """STT 결과와 화자 분리 결과를 통합하는 클래스"""
@@ -14,7 +16,8 @@ class DiarizationSTTMerger:
     async def merge_results(self, 
                            stt_transcript: str, 
                            diarization_result: Dict[str, Any], 
-                           audio_path: str) -> Optional[str]:
+                           audio_path: str,
+                           workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
         """
         STT 트랜스크립트와 화자 분리 결과를 병합
         
@@ -22,6 +25,7 @@ class DiarizationSTTMerger:
             stt_transcript (str): STT 서비스에서 생성된 타임스탬프가 포함된 트랜스크립트
             diarization_result (Dict[str, Any]): PyAnnote.ai에서 반환된 화자 분리 결과
             audio_path (str): 오디오 파일 경로
+            workspace (Optional[TaskWorkspace]): 작업 공간 (결과를 저장하고 manifest에 등록)
             
         Returns:
             Optional[str]: 병합된 결과 파일 경로
@@ -50,7 +54,8 @@ class DiarizationSTTMerger:
             sentence_segments = self._merge_segments_into_sentences(merged_segments)
             
             # 5. 텍스트 형식으로 결과 저장
-            output_file = os.path.join(self.output_dir, f"{base_filename}_merged.txt")
+            output_dir = workspace.dir("merged_results") if workspace else self.output_dir
+            output_file = os.path.join(output_dir, f"{base_filename}_merged.txt")
             with open(output_file, "w", encoding="utf-8") as f:
                 for segment in sentence_segments:
                     start_time = segment["start"]
@@ -60,6 +65,9 @@ class DiarizationSTTMerger:
                     f.write(f"[{start_time:.2f}s - {end_time:.2f}s] 화자 {speaker}: {text}\n")
             
             print(f"결과 병합 완료: {output_file}")
+            if workspace:
+                # 다운로드 가능한 결과물이므로 완료 후에도 보관
+                await workspace.register("merged_result", output_file, ArtifactKind.OUTPUT)
             return output_file
             
         except Exception as e:
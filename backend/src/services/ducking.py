@@ -0,0 +1,104 @@
+import os
+import wave
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict, Any
+import numpy as np
+from . import config
+
+Interval = Tuple[float, float]
+
+def speech_intervals(diarization_result: Optional[Dict[str, Any]]) -> List[Interval]:
+    """화자 분리 결과에서 발화 구간(초)을 추출하여 정렬·병합"""
+    if not diarization_result:
+        return []
+    intervals = []
+    for segment in diarization_result.get("diarization", []):
+        start, end = segment.get("start"), segment.get("end")
+        if start is not None and end is not None and float(end) > float(start):
+            intervals.append((float(start), float(end)))
+    return merge_intervals(intervals)
+
+def merge_intervals(intervals: List[Interval], gap: float = 0.0) -> List[Interval]:
+    """겹치거나 gap 이내로 가까운 구간을 병합"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def gain_breakpoints(intervals: List[Interval],
+                     sample_rate: int,
+                     duck_gain: float,
+                     fade_sec: float,
+                     pad_sec: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    발화 구간에서 볼륨을 낮추는 게인 엔벨로프의 꺾은선 좌표 (프레임, 게인)
+
+    각 구간 앞뒤로 pad_sec만큼 넓힌 뒤 fade_sec 동안 선형으로 게인을 내리고 올립니다.
+    """
+    # 페이드 구간끼리 겹치지 않도록 가까운 구간은 하나로 병합
+    padded = merge_intervals(
+        [(max(0.0, start - pad_sec), end + pad_sec) for start, end in intervals],
+        gap=2 * fade_sec
+    )
+    xs = [0.0]
+    ys = [1.0]
+    for start, end in padded:
+        fade_start = max(xs[-1], start - fade_sec)
+        xs += [fade_start, max(fade_start, start), end, end + fade_sec]
+        ys += [1.0, duck_gain, duck_gain, 1.0]
+    return np.asarray(xs) * sample_rate, np.asarray(ys, dtype=np.float32)
+
+def duck_background(audio_path: str,
+                    intervals: List[Interval],
+                    output_path: str,
+                    gain_db: Optional[float] = None,
+                    fade_ms: Optional[float] = None,
+                    pad_ms: Optional[float] = None,
+                    block_frames: int = 1 << 18) -> str:
+    """
+    원본 오디오의 발화 구간 볼륨을 낮춰 배경음으로 사용 (음원 분리 대신 사용하는 빠른 모드)
+
+    16비트 PCM WAV를 블록 단위로 읽어 게인 엔벨로프를 곱하므로 메모리 사용량은 블록 크기에 비례합니다.
+
+    Args:
+        audio_path (str): 원본 오디오 WAV 경로 (16비트 PCM)
+        intervals (List[Interval]): 발화 구간 목록 (초)
+        output_path (str): 결과 WAV 경로
+        gain_db (Optional[float]): 발화 구간 게인 (dB)
+        fade_ms (Optional[float]): 게인 전환 길이 (ms)
+        pad_ms (Optional[float]): 발화 구간 앞뒤 여유 (ms)
+        block_frames (int): 한 번에 처리할 프레임 수
+
+    Returns:
+        str: 결과 WAV 경로
+    """
+    gain_db = config.DUCKING_GAIN_DB if gain_db is None else gain_db
+    fade_ms = config.DUCKING_FADE_MS if fade_ms is None else fade_ms
+    pad_ms = config.DUCKING_PAD_MS if pad_ms is None else pad_ms
+    Path(os.path.dirname(output_path)).mkdir(parents=True, exist_ok=True)
+
+    with wave.open(audio_path, "rb") as reader, wave.open(output_path, "wb") as writer:
+        if reader.getsampwidth() != 2:
+            raise ValueError(f"16비트 PCM WAV만 지원합니다: {audio_path}")
+        channels = reader.getnchannels()
+        sample_rate = reader.getframerate()
+        writer.setnchannels(channels)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+
+        xs, ys = gain_breakpoints(intervals, sample_rate, 10 ** (gain_db / 20), fade_ms / 1000, pad_ms / 1000)
+        position = 0
+        while True:
+            data = reader.readframes(block_frames)
+            if not data:
+                break
+            block = np.frombuffer(data, dtype="<i2").reshape(-1, channels)
+            gain = np.interp(np.arange(position, position + len(block)), xs, ys).astype(np.float32)
+            ducked = np.clip(np.round(block * gain[:, None]), -32768, 32767).astype("<i2")
+            writer.writeframes(ducked.tobytes())
+            position += len(block)
+
+    return output_path
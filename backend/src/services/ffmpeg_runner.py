@@ -0,0 +1,159 @@
+import os
+import time
+import asyncio
+from typing import Optional, Callable, List, Union, Dict, AsyncIterator
+import ffmpeg
+from . import config
+from .tracing import tracer, file_size
+
+ProgressCallback = Callable[[float], None]
+
+class FFmpegRunner:
+    """
+    ffmpeg를 비동기 서브프로세스로 실행하는 공용 실행기
+
+    `-progress pipe:1` 출력을 파싱하여 0~1 진행률을 콜백으로 전달하고, 타임아웃과 취소 시
+    프로세스를 종료합니다. 노드당 동시에 실행되는 ffmpeg 프로세스 수는 max_processes로 제한합니다.
+    """
+
+    def __init__(self, max_processes: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_processes = max_processes or config.FFMPEG_MAX_PROCESSES
+        self.timeout = timeout if timeout is not None else config.FFMPEG_TIMEOUT
+        self.semaphore = asyncio.Semaphore(self.max_processes)
+        self.running = 0
+
+    async def run(self,
+                  stream: Union[ffmpeg.nodes.OutputStream, List[str]],
+                  duration: Optional[float] = None,
+                  progress_callback: Optional[ProgressCallback] = None,
+                  timeout: Optional[float] = None,
+                  min_interval: float = 0.5,
+                  input_chunks: Optional[AsyncIterator[bytes]] = None) -> None:
+        """
+        ffmpeg 실행
+
+        Args:
+            stream: ffmpeg-python 출력 스트림 또는 ffmpeg 인자 목록
+            duration (Optional[float]): 출력 길이(초) (진행률 계산용, 없으면 완료 시에만 1.0 전달)
+            progress_callback (Optional[ProgressCallback]): 0~1 진행률을 받는 콜백
+            timeout (Optional[float]): 최대 실행 시간(초) (0이면 제한 없음)
+            min_interval (float): 진행률 콜백 최소 간격(초)
+            input_chunks (Optional[AsyncIterator[bytes]]): 표준 입력(pipe:0)으로 순서대로 전달할 데이터
+
+        Raises:
+            ffmpeg.Error: ffmpeg가 0이 아닌 코드로 종료된 경우
+            asyncio.TimeoutError: 제한 시간을 초과한 경우
+        """
+        args = stream if isinstance(stream, list) else stream.overwrite_output().compile()
+        args = [args[0], "-nostats", "-progress", "pipe:1"] + args[1:]
+        timeout = self.timeout if timeout is None else timeout
+
+        # 실행 슬롯 대기 시간을 포함한 전체를 하나의 구간으로 기록 (bytes는 출력 파일 크기)
+        # 출력 경로는 마지막 옵션이 아닌 인자 (ffmpeg-python은 -y를 맨 뒤에 붙임)
+        output = next((arg for arg in reversed(args) if not arg.startswith("-")), "")
+        with tracer.span("ffmpeg", output=os.path.basename(output)) as span:
+            queued = time.perf_counter()
+            async with self.semaphore:
+                span.set(queue_wait=round(time.perf_counter() - queued, 4))
+                self.running += 1
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *args,
+                        stdin=asyncio.subprocess.PIPE if input_chunks else asyncio.subprocess.DEVNULL,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                    feeder = asyncio.create_task(self._feed(process, input_chunks)) if input_chunks else None
+                    try:
+                        stderr = await asyncio.wait_for(
+                            self._communicate(process, duration, progress_callback, min_interval),
+                            timeout=timeout or None
+                        )
+                    except BaseException:
+                        # 타임아웃·취소 시 프로세스가 남지 않도록 종료
+                        if process.returncode is None:
+                            process.kill()
+                            await process.wait()
+                        raise
+                    finally:
+                        if feeder and not feeder.done():
+                            feeder.cancel()
+                finally:
+                    self.running -= 1
+
+            if process.returncode != 0:
+                raise ffmpeg.Error(args[0], None, stderr)
+            span.set(bytes=file_size(output))
+            if progress_callback:
+                progress_callback(1.0)
+
+    @staticmethod
+    async def _feed(process: asyncio.subprocess.Process, input_chunks: AsyncIterator[bytes]) -> None:
+        """입력 데이터를 표준 입력에 순서대로 쓰고 끝나면 닫음 (ffmpeg가 먼저 종료되면 중단)"""
+        try:
+            async for chunk in input_chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            if not process.stdin.is_closing():
+                process.stdin.close()
+
+    async def _communicate(self,
+                           process: asyncio.subprocess.Process,
+                           duration: Optional[float],
+                           progress_callback: Optional[ProgressCallback],
+                           min_interval: float) -> bytes:
+        """진행률 출력을 읽으면서 stderr를 수집하고 종료를 기다림"""
+        stderr_task = asyncio.create_task(process.stderr.read())
+        try:
+            fields: Dict[str, str] = {}
+            last_report = 0.0
+            async for line in process.stdout:
+                key, _, value = line.decode(errors="ignore").strip().partition("=")
+                fields[key] = value
+                # 한 블록은 progress=continue|end 줄로 끝남
+                if key != "progress" or not progress_callback or not duration:
+                    continue
+                now = time.monotonic()
+                if now - last_report < min_interval and value != "end":
+                    continue
+                out_time = self._parse_out_time(fields)
+                if out_time is not None:
+                    last_report = now
+                    progress_callback(min(max(out_time / duration, 0.0), 1.0))
+            await process.wait()
+            return await stderr_task
+        finally:
+            if not stderr_task.done():
+                stderr_task.cancel()
+
+    @staticmethod
+    def _parse_out_time(fields: Dict[str, str]) -> Optional[float]:
+        """progress 블록의 현재 출력 시각(초)"""
+        # out_time_ms도 마이크로초 단위로 출력됨
+        for key in ("out_time_us", "out_time_ms"):
+            try:
+                return int(fields[key]) / 1_000_000
+            except (KeyError, ValueError):
+                continue
+        return None
+
+    async def probe_duration(self, path: str) -> Optional[float]:
+        """ffprobe로 미디어 길이(초) 조회 (실패 시 None)"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ffprobe", "-v", "error", "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1", path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+            return float(stdout.decode().strip())
+        except Exception as e:
+            print(f"미디어 길이 조회 실패: {str(e)}")
+            return None
+
+# 서비스 인스턴스 생성
+ffmpeg_runner = FFmpegRunner()
@@ -0,0 +1,172 @@
+import os
+import re
+import asyncio
+import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple, Iterator
+from urllib.parse import quote
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse, RedirectResponse
+from . import config
+from .clients import clients
+
+class FileDelivery:
+    """
+    결과 파일 전송 (Range 요청, ETag/Last-Modified 조건부 GET, 리다이렉트 지원)
+
+    DOWNLOAD_REDIRECT_MODE가 signed이면 GCS 서명 URL로, static이면 작업 결과 영상의 정적 경로
+    (`{DOWNLOAD_STATIC_BASE_URL}/{작업 ID}/{파일명}`)로 리다이렉트하여 대용량 파일이 API 프로세스를
+    거치지 않도록 합니다.
+    """
+
+    def __init__(self):
+        self.redirect_mode = config.DOWNLOAD_REDIRECT_MODE
+        self.bucket_name = "onevoice-test-bucket"
+        self.chunk_size = 1024 * 1024
+
+    @staticmethod
+    def make_etag(stat: os.stat_result) -> str:
+        """파일 크기와 수정 시각 기반의 재시작 후에도 동일한 ETag"""
+        return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    @staticmethod
+    def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+        """
+        단일 바이트 범위 헤더를 (시작, 끝) 포함 구간으로 변환
+
+        Returns:
+            Optional[Tuple[int, int]]: 범위 (해석할 수 없거나 다중 범위이면 None → 전체 전송)
+
+        Raises:
+            ValueError: 파일 범위를 벗어난 요청 (416)
+        """
+        match = re.fullmatch(r"\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*", range_header or "")
+        if not match or match.group(1) == match.group(2) == "":
+            return None
+        first, last = match.groups()
+        if first == "":
+            # 끝에서부터 N바이트
+            length = int(last)
+            if length == 0:
+                raise ValueError("빈 범위")
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or start > end:
+            raise ValueError("범위를 벗어난 요청")
+        return start, end
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _if_range_matches(request: Request, etag: str, mtime: float) -> bool:
+        if_range = request.headers.get("if-range")
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == etag
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_range).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    def _iter_file(self, path: str, start: int, length: int) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            f.seek(start)
+            while length > 0:
+                chunk = f.read(min(self.chunk_size, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+
+    async def _redirect_url(self, path: str, gcs_blob_name: Optional[str], task_id: Optional[str]) -> Optional[str]:
+        """리다이렉트 대상 URL (사용할 수 없으면 None)"""
+        if self.redirect_mode == "signed" and gcs_blob_name:
+            try:
+                blob = clients.storage.bucket(self.bucket_name).blob(gcs_blob_name)
+                # 업로드가 실패했거나 아직 끝나지 않았으면 404를 반환할 서명 URL 대신 직접 전송
+                if not await asyncio.to_thread(blob.exists):
+                    print(f"GCS에 결과 파일이 없어 직접 전송합니다: {gcs_blob_name}")
+                    return None
+                return blob.generate_signed_url(
+                    version="v4",
+                    expiration=datetime.timedelta(seconds=config.DOWNLOAD_SIGNED_URL_TTL),
+                    method="GET",
+                    response_disposition=f"attachment; filename*=utf-8''{quote(os.path.basename(path))}"
+                )
+            except Exception as e:
+                print(f"서명 URL 생성 실패 (직접 전송으로 대체): {str(e)}")
+                return None
+        if self.redirect_mode == "static" and task_id:
+            return f"{config.DOWNLOAD_STATIC_BASE_URL.rstrip('/')}/{quote(task_id)}/{quote(os.path.basename(path))}"
+        return None
+
+    async def respond(self, request: Request, path: str, media_type: str,
+                      filename: Optional[str] = None, gcs_blob_name: Optional[str] = None,
+                      task_id: Optional[str] = None, redirect: bool = True) -> Response:
+        """
+        파일 응답 생성
+
+        Args:
+            request (Request): 요청 (Range/조건부 헤더 확인용)
+            path (str): 로컬 파일 경로
+            media_type (str): Content-Type
+            filename (Optional[str]): 다운로드 파일명
+            gcs_blob_name (Optional[str]): 같은 파일이 업로드된 GCS 객체 이름 (서명 URL 리다이렉트용)
+            task_id (Optional[str]): 작업의 결과 영상(output_video)이면 작업 ID (정적 경로 리다이렉트용)
+            redirect (bool): False이면 설정과 관계없이 직접 전송 (정적 경로 처리기용)
+        """
+        redirect_url = await self._redirect_url(path, gcs_blob_name, task_id) if redirect else None
+        if redirect_url:
+            return RedirectResponse(redirect_url, status_code=307, headers={"Cache-Control": "no-store"})
+
+        stat = os.stat(path)
+        size = stat.st_size
+        etag = self.make_etag(stat)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        }
+        if filename:
+            headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+
+        if self._not_modified(request, etag, stat.st_mtime):
+            return Response(status_code=304, headers=headers)
+
+        byte_range = None
+        if request.headers.get("range") and self._if_range_matches(request, etag, stat.st_mtime):
+            try:
+                byte_range = self.parse_range(request.headers["range"], size)
+            except ValueError:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        if byte_range is None:
+            headers["Content-Length"] = str(size)
+            return StreamingResponse(self._iter_file(path, 0, size), media_type=media_type, headers=headers)
+
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            self._iter_file(path, start, end - start + 1),
+            status_code=206,
+            media_type=media_type,
+            headers=headers
+        )
+
+# 서비스 인스턴스 생성
+file_delivery = FileDelivery()
@@ -0,0 +1,266 @@
+import os
+import time
+import shutil
+import asyncio
+from enum import Enum
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+from . import config
+from .task_manager import task_manager
+
+class ArtifactKind(str, Enum):
+    INTERMEDIATE = "intermediate"  # 처리 중에만 필요한 파일 (입력 영상, 추출 WAV, TSV, TTS 오디오, 배경음 등)
+    OUTPUT = "output"  # 다운로드/재생에 쓰이는 결과물 (더빙 영상, HLS, 병합 자막)
+
+class ArtifactJanitor:
+    """
+    작업별 산출물을 추적하고 TEMP_DIR 디스크 사용량을 관리하는 정리기
+
+    - 작업이 완료되면 중간 산출물을 바로 삭제합니다 (CLEANUP_INTERMEDIATES).
+    - 끝난 작업의 산출물은 마지막 사용 후 ARTIFACT_TTL_SECONDS가 지나면 삭제합니다.
+    - 볼륨 사용률이 DISK_HIGH_WATER를 넘으면 DISK_LOW_WATER 아래로 내려갈 때까지 끝난 작업의
+      산출물을 오래 사용하지 않은 순으로 삭제하고, 그래도 부족하면 등록된 캐시를 줄입니다.
+
+    산출물 목록은 Redis에 저장하여 여러 프로세스와 재시작 후에도 공유합니다.
+    - `task-artifacts:<id>`: 경로 → 종류
+    - `artifacts:lru`: `<id>:<경로>` → 마지막 사용 시각
+    - `janitor:stats`: 정리 사유별 확보 바이트/파일 수
+    """
+
+    LRU_INDEX = "artifacts:lru"
+    STATS_KEY = "janitor:stats"
+    BATCH_SIZE = 500
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or config.TEMP_DIR
+        self.interval = config.JANITOR_INTERVAL
+        self.ttl = config.ARTIFACT_TTL_SECONDS
+        self.high_water = config.DISK_HIGH_WATER
+        self.low_water = min(config.DISK_LOW_WATER, config.DISK_HIGH_WATER)
+        self.caches = []
+        self.loop_task: Optional[asyncio.Task] = None
+        self.last_sweep: Optional[Dict[str, Any]] = None
+
+    @property
+    def redis(self):
+        return task_manager.redis
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task-artifacts:{task_id}"
+
+    def register_cache(self, cache) -> None:
+        """디스크가 부족할 때 줄일 캐시 등록 (evict(max_bytes) -> 확보한 바이트 수)"""
+        self.caches.append(cache)
+
+    async def track(self, task_id: str, path: Optional[str],
+                    kind: ArtifactKind = ArtifactKind.INTERMEDIATE) -> None:
+        """작업 산출물(파일 또는 디렉토리) 등록"""
+        if not path:
+            return
+        path = os.path.abspath(path)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(self._key(task_id), path, ArtifactKind(kind).value)
+                pipe.zadd(self.LRU_INDEX, {f"{task_id}:{path}": time.time()})
+                await pipe.execute()
+        except Exception as e:
+            print(f"산출물 등록 실패: {str(e)}")
+
+    async def touch(self, task_id: str, path: str) -> None:
+        """산출물 사용 시각 갱신 (다운로드·재생 시 호출)"""
+        try:
+            await self.redis.zadd(self.LRU_INDEX, {f"{task_id}:{os.path.abspath(path)}": time.time()}, xx=True)
+        except Exception as e:
+            print(f"산출물 사용 시각 갱신 실패: {str(e)}")
+
+    async def cleanup_task(self, task_id: str,
+                           kinds: Iterable[ArtifactKind] = (ArtifactKind.INTERMEDIATE,),
+                           reason: str = "intermediate") -> int:
+        """
+        작업의 산출물 중 지정한 종류를 삭제
+
+        Returns:
+            int: 확보한 바이트 수
+        """
+        kinds = {ArtifactKind(kind).value for kind in kinds}
+        try:
+            artifacts = await self.redis.hgetall(self._key(task_id))
+        except Exception as e:
+            print(f"산출물 목록 조회 실패: {str(e)}")
+            return 0
+        freed = 0
+        for path, kind in artifacts.items():
+            if kind in kinds:
+                freed += await self._delete(task_id, path, reason) or 0
+        return freed
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        """파일 또는 디렉토리를 삭제하고 확보한 바이트 수 반환"""
+        if os.path.isdir(path):
+            size = 0
+            for directory, _, files in os.walk(path):
+                for name in files:
+                    try:
+                        size += os.path.getsize(os.path.join(directory, name))
+                    except OSError:
+                        pass
+            shutil.rmtree(path, ignore_errors=True)
+            return size
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+            return size
+        except FileNotFoundError:
+            return 0
+
+    def _remove_empty_parents(self, path: str) -> None:
+        """산출물을 지운 뒤 비어 있는 작업 공간 디렉토리 정리"""
+        tasks_root = os.path.abspath(os.path.join(self.root, "tasks"))
+        directory = os.path.dirname(os.path.abspath(path))
+        while directory.startswith(tasks_root + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                return
+            directory = os.path.dirname(directory)
+
+    async def _delete(self, task_id: str, path: str, reason: str) -> Optional[int]:
+        """산출물 삭제 (확보한 바이트 수, 삭제하지 못하면 None - 목록에는 남겨 다음 정리 때 다시 시도)"""
+        try:
+            size = await asyncio.to_thread(self._remove, path)
+            await asyncio.to_thread(self._remove_empty_parents, path)
+        except OSError as e:
+            print(f"산출물 삭제 실패 ({path}): {str(e)}")
+            return None
+        await self._record(reason, size, 1, task_id, path)
+        return size
+
+    async def _record(self, reason: str, size: int, files: int,
+                      task_id: Optional[str] = None, path: Optional[str] = None) -> None:
+        """삭제 결과를 산출물 목록과 통계에 반영"""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                if task_id:
+                    pipe.hdel(self._key(task_id), path)
+                    pipe.zrem(self.LRU_INDEX, f"{task_id}:{path}")
+                pipe.hincrby(self.STATS_KEY, "reclaimed_bytes", size)
+                pipe.hincrby(self.STATS_KEY, "reclaimed_files", files)
+                pipe.hincrby(self.STATS_KEY, f"reclaimed_bytes:{reason}", size)
+                pipe.hincrby(self.STATS_KEY, f"reclaimed_files:{reason}", files)
+                await pipe.execute()
+        except Exception as e:
+            print(f"정리 통계 기록 실패: {str(e)}")
+
+    async def _evict(self, members: List[str], reason: str,
+                     target_bytes: Optional[float] = None) -> Tuple[int, int, int]:
+        """
+        산출물을 주어진 순서대로 삭제 (처리 중인 작업의 산출물은 건너뜀)
+
+        Returns:
+            Tuple[int, int, int]: (확보한 바이트 수, 건너뛴 항목 수, 삭제에 실패한 항목 수)
+        """
+        entries = [member.split(":", 1) for member in members]
+        statuses = await task_manager.get_task_statuses([task_id for task_id, _ in entries])
+        freed = skipped = failed = 0
+        for task_id, path in entries:
+            if target_bytes is not None and freed >= target_bytes:
+                break
+            status = statuses.get(task_id)
+            # 키가 만료된 작업은 끝난 작업으로 간주
+            if status is not None and status.get("status") not in task_manager.TERMINAL_STATUSES:
+                skipped += 1
+                continue
+            size = await self._delete(task_id, path, reason)
+            if size is None:
+                failed += 1
+            else:
+                freed += size
+        return freed, skipped, failed
+
+    def disk_usage(self) -> float:
+        """TEMP_DIR 볼륨 사용률 (0~1)"""
+        usage = shutil.disk_usage(self.root)
+        return usage.used / usage.total if usage.total else 0.0
+
+    async def sweep(self) -> Dict[str, Any]:
+        """만료 산출물 삭제, 디스크 상한 적용, 만료된 작업 인덱스 정리를 한 번 수행"""
+        started = time.time()
+        result = {"ttl_bytes": 0, "quota_bytes": 0, "cache_bytes": 0, "pruned_tasks": 0}
+
+        # 1. 마지막 사용 후 보관 시간이 지난 산출물
+        expired = await self.redis.zrangebyscore(self.LRU_INDEX, "-inf", started - self.ttl)
+        for offset in range(0, len(expired), self.BATCH_SIZE):
+            freed, _, _ = await self._evict(expired[offset:offset + self.BATCH_SIZE], "ttl")
+            result["ttl_bytes"] += freed
+
+        # 2. 디스크 사용률 상한
+        usage = shutil.disk_usage(self.root)
+        if usage.total and usage.used > self.high_water * usage.total:
+            target = usage.used - self.low_water * usage.total
+            offset = 0
+            while result["quota_bytes"] < target:
+                batch = await self.redis.zrange(self.LRU_INDEX, offset, offset + self.BATCH_SIZE - 1)
+                if not batch:
+                    break
+                freed, skipped, failed = await self._evict(batch, "quota", target - result["quota_bytes"])
+                result["quota_bytes"] += freed
+                # 삭제된 항목은 인덱스에서 빠지므로 건너뛰거나 삭제하지 못한 항목만큼만 이동
+                offset += skipped + failed
+                if not freed and not skipped and not failed:
+                    # 진행이 없으면 같은 묶음을 반복하게 되므로 중단 (정리 기록 실패로 인덱스에 남은 항목 등)
+                    break
+            for cache in self.caches:
+                remaining = target - result["quota_bytes"] - result["cache_bytes"]
+                if remaining <= 0:
+                    break
+                freed = await asyncio.to_thread(cache.evict, int(remaining))
+                result["cache_bytes"] += freed
+                await self._record("cache", freed, 0)
+
+        # 3. 만료된 작업 키의 인덱스 항목
+        result["pruned_tasks"] = await task_manager.prune_indexes(started - task_manager.ttl)
+
+        result["duration"] = time.time() - started
+        result["finished_at"] = time.time()
+        self.last_sweep = result
+        if result["ttl_bytes"] or result["quota_bytes"] or result["cache_bytes"]:
+            print(f"산출물 정리 완료: 만료 {result['ttl_bytes']}B, 용량 {result['quota_bytes']}B, 캐시 {result['cache_bytes']}B")
+        return result
+
+    async def stats(self) -> Dict[str, Any]:
+        """누적 정리 통계와 현재 디스크 사용률"""
+        reclaimed = await self.redis.hgetall(self.STATS_KEY)
+        return {
+            **{name: int(value) for name, value in reclaimed.items()},
+            "tracked_artifacts": await self.redis.zcard(self.LRU_INDEX),
+            "disk_usage": self.disk_usage(),
+            "high_water": self.high_water,
+            "low_water": self.low_water,
+            "last_sweep": self.last_sweep,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"산출물 정리 오류: {str(e)}")
+
+    def start(self) -> None:
+        """주기 정리 시작 (이벤트 루프 안에서 호출)"""
+        if self.interval > 0 and (self.loop_task is None or self.loop_task.done()):
+            self.loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.loop_task and not self.loop_task.done():
+            self.loop_task.cancel()
+            try:
+                await self.loop_task
+            except asyncio.CancelledError:
+                pass
+        self.loop_task = None
+
+# 서비스 인스턴스 생성
+artifact_janitor = ArtifactJanitor()
@@ -0,0 +1,155 @@
+import asyncio
+from typing import Optional, Dict, Any
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, ProcessCollector, GCCollector,
+    generate_latest
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from . import config
+from .task_manager import task_manager
+
+# 단계는 수 초~수십 분, 외부 호출은 수십 ms~수 분, 이벤트 루프 지연은 ms 단위
+STAGE_BUCKETS = (1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+class CacheCollector:
+    """등록된 캐시의 조회 통계를 수집 시점에 읽어 내보내는 수집기 (조회 경로에는 비용 없음)"""
+
+    def __init__(self):
+        self.caches: Dict[str, Any] = {}
+
+    def collect(self):
+        requests = CounterMetricFamily(
+            "onevoice_cache_requests", "캐시 조회 수 (result: hit/miss)", labels=["cache", "result"]
+        )
+        hit_rate = GaugeMetricFamily("onevoice_cache_hit_ratio", "프로세스 시작 이후 캐시 적중률", labels=["cache"])
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            requests.add_metric([name, "hit"], stats["hits"])
+            requests.add_metric([name, "miss"], stats["misses"])
+            hit_rate.add_metric([name], stats["hit_rate"])
+        yield requests
+        yield hit_rate
+
+class Metrics:
+    """
+    Prometheus 형식 운영 지표
+
+    단계 지연 시간, 외부 호출 지연 시간과 동시 호출 수, 단계별 업로드 바이트는 추적 구간(tracing)이
+    끝날 때 한 번씩 기록되므로 호출 경로에 별도 계측을 두지 않습니다. 작업 상태별 개수와 캐시 적중률은
+    /metrics 수집 시점에 읽고, 이벤트 루프 지연은 주기 작업이 측정합니다.
+
+    지표는 프로세스별 레지스트리에 모이므로 여러 워커로 실행할 때는 워커별로 수집해야 합니다.
+    """
+
+    def __init__(self):
+        self.enabled = config.METRICS_ENABLED
+        self.loop_lag_interval = config.METRICS_LOOP_LAG_INTERVAL
+        self.loop_task: Optional[asyncio.Task] = None
+        self.registry = CollectorRegistry()
+        ProcessCollector(registry=self.registry)
+        GCCollector(registry=self.registry)
+
+        self.stage_seconds = Histogram(
+            "onevoice_stage_duration_seconds", "파이프라인 단계 처리 시간",
+            ["stage", "status"], buckets=STAGE_BUCKETS, registry=self.registry
+        )
+        self.call_seconds = Histogram(
+            "onevoice_external_call_duration_seconds", "외부 호출(GCP, PyAnnote, Demucs, ffmpeg 등) 시간",
+            ["call", "status"], buckets=CALL_BUCKETS, registry=self.registry
+        )
+        self.calls_in_flight = Gauge(
+            "onevoice_external_calls_in_flight", "진행 중인 외부 호출 수",
+            ["service"], registry=self.registry
+        )
+        self.call_retries = Counter(
+            "onevoice_external_call_retries", "외부 호출 재시도 수",
+            ["call"], registry=self.registry
+        )
+        self.uploaded_bytes = Counter(
+            "onevoice_uploaded_bytes", "단계별 업로드 바이트 (GCS, PyAnnote)",
+            ["stage"], registry=self.registry
+        )
+        self.tasks = Gauge(
+            "onevoice_tasks", "상태별 작업 수 (Redis 인덱스 기준)",
+            ["status"], registry=self.registry
+        )
+        self.loop_lag = Histogram(
+            "onevoice_event_loop_lag_seconds", "이벤트 루프 예약 지연",
+            buckets=LOOP_LAG_BUCKETS, registry=self.registry
+        )
+        self.http_seconds = Histogram(
+            "onevoice_http_request_duration_seconds", "HTTP 요청 처리 시간",
+            ["method", "route", "status"], registry=self.registry
+        )
+        self.cache_collector = CacheCollector()
+        self.registry.register(self.cache_collector)
+
+    def register_cache(self, name: str, cache) -> None:
+        """적중률을 내보낼 캐시 등록 (stats()가 hits, misses, hit_rate를 반환)"""
+        self.cache_collector.caches[name] = cache
+
+    @staticmethod
+    def _service(name: str) -> str:
+        return name.split(".", 1)[0]
+
+    @staticmethod
+    def _is_call(span) -> bool:
+        # 최상위 구간(pipeline, ingest)과 단계 구간을 제외한 구간이 외부 호출
+        return span.parent_id is not None and not span.name.startswith("stage.")
+
+    def span_started(self, span) -> None:
+        if self.enabled and self._is_call(span):
+            self.calls_in_flight.labels(self._service(span.name)).inc()
+
+    def span_finished(self, span) -> None:
+        """끝난 구간을 단계/외부 호출 지표에 반영"""
+        if not self.enabled:
+            return
+        if span.name.startswith("stage."):
+            self.stage_seconds.labels(span.stage, span.status).observe(span.duration)
+        elif self._is_call(span):
+            self.calls_in_flight.labels(self._service(span.name)).dec()
+            self.call_seconds.labels(span.name, span.status).observe(span.duration)
+            if span.retries:
+                self.call_retries.labels(span.name).inc(span.retries)
+            if span.name.endswith(".upload") and span.bytes:
+                self.uploaded_bytes.labels(span.stage).inc(span.bytes)
+
+    def observe_request(self, method: str, route: str, status: int, duration: float) -> None:
+        if self.enabled:
+            self.http_seconds.labels(method, route, str(status)).observe(duration)
+
+    async def render(self) -> bytes:
+        """수집 시점 지표(작업 상태별 개수)를 갱신하고 텍스트 형식으로 반환"""
+        try:
+            for status, count in (await task_manager.count_tasks()).items():
+                self.tasks.labels(status).set(count)
+        except Exception as e:
+            print(f"작업 수 조회 실패: {str(e)}")
+        return generate_latest(self.registry)
+
+    async def _watch_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.loop_lag_interval
+            await asyncio.sleep(self.loop_lag_interval)
+            self.loop_lag.observe(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        """이벤트 루프 지연 측정 시작 (이벤트 루프 안에서 호출)"""
+        if self.enabled and self.loop_lag_interval > 0 and (self.loop_task is None or self.loop_task.done()):
+            self.loop_task = asyncio.create_task(self._watch_loop_lag())
+
+    async def stop(self) -> None:
+        if self.loop_task and not self.loop_task.done():
+            self.loop_task.cancel()
+            try:
+                await self.loop_task
+            except asyncio.CancelledError:
+                pass
+        self.loop_task = None
+
+# 서비스 인스턴스 생성
+metrics = Metrics()
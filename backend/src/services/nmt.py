@@ -1,25 +1,31 @@
-from google.cloud import storage
 import os
 from pathlib import Path
 import re
-from typing import Optional
-import pandas as pd
+from typing import Optional, Callable
 from . import config
+from .clients import clients
+from .workspace import TaskWorkspace
+from .tracing import tracer, file_size
 from google.cloud import translate_v3 as translate
 
 class NMTService:
     def __init__(self):
-        # 번역 클라이언트 초기화
-        self.client = translate.TranslationServiceClient()
         self.project_id = config.PROJECT_ID
         self.location = config.LOCATION
         self.parent = f"projects/{self.project_id}/locations/{self.location}"
         
-        self.storage_client = storage.Client()
         self.bucket_name = "onevoice-test-bucket"
         self.output_dir = os.path.join(config.TEMP_DIR, "text_ko")
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
 
+    @property
+    def client(self):
+        return clients.translate
+
+    @property
+    def storage_client(self):
+        return clients.storage
+
     async def _upload_to_gcs(self, local_path: str, gcs_path: str) -> bool:
         """GCS에 파일 업로드"""
         try:
@@ -34,7 +40,8 @@ class NMTService:
             
             # 파일 업로드
             print(f"파일 업로드 시작: {local_path} -> {gcs_path}")
-            blob.upload_from_filename(local_path)
+            with tracer.span("gcs.upload", bytes=file_size(local_path), object=blob_name):
+                blob.upload_from_filename(local_path)
             print(f"파일 업로드 완료: {local_path} -> {gcs_path}")
             
             return True
@@ -56,7 +63,8 @@ class NMTService:
             )
             
             # 번역 요청 실행
-            response = self.client.translate_text(request)
+            with tracer.span("translate.translate_text", bytes=len(text.encode("utf-8"))):
+                response = self.client.translate_text(request)
             
             # 응답에서 번역된 텍스트 추출
             if response.translations and len(response.translations) > 0:
@@ -70,7 +78,9 @@ class NMTService:
             print(f"번역 실패: {str(e)}")
             return None
 
-    async def process_transcript(self, text: str, task_id: str, input_filename: str) -> Optional[str]:
+    async def process_transcript(self, text: str, task_id: str, input_filename: str,
+                                 progress_callback: Optional[Callable[[float], None]] = None,
+                                 workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
         """
         타임스탬프가 포함된 텍스트를 번역 (입력 형식: [start_time s - end_time s] 화자 speaker_id: text)
         
@@ -78,6 +88,8 @@ class NMTService:
             text (str): 번역할 텍스트 (파일 전체 내용)
             task_id (str): 작업 ID
             input_filename (str): 입력 파일명
+            progress_callback (Optional[Callable[[float], None]]): 처리한 줄 비율(0~1)을 받는 콜백
+            workspace (Optional[TaskWorkspace]): 작업 공간 (TSV를 저장하고 manifest에 translation으로 등록)
         """
         try:
             translated_lines = []
@@ -88,6 +100,8 @@ class NMTService:
             line_pattern = re.compile(r"^\s*\[\s*(\d+\.\d+)s\s*-\s*(\d+\.\d+)s\s*\]\s*화자\s*(\w+):\s*(.*)$")
             
             for i, line in enumerate(lines):
+                if progress_callback:
+                    progress_callback(i / total_lines)
                 match = line_pattern.match(line)
                 
                 if match:
@@ -112,20 +126,28 @@ class NMTService:
                 else:
                     print(f"경고: 라인 {i+1} 형식이 맞지 않아 건너뜁니다: {line}")
             
+            if progress_callback:
+                progress_callback(1.0)
+            
             # 입력 파일명에서 확장자를 제거하고 .tsv 확장자 추가
             base_filename = os.path.splitext(input_filename)[0]
             output_filename = f"{base_filename}.tsv"
             
             # TSV 파일로 저장
-            output_path = os.path.join(self.output_dir, output_filename)
+            output_dir = workspace.dir("text_ko") if workspace else self.output_dir
+            output_path = os.path.join(output_dir, output_filename)
             with open(output_path, 'w', encoding='utf-8') as f:
                 # 헤더 순서 변경: start_time, end_time, speaker_id, translated_text
                 f.write("start_time\tend_time\tspeaker_id\ttranslated_text\n")
                 f.write('\n'.join(translated_lines))
             
             # GCS에 업로드
-            gcs_bucket = "gs://onevoice-test-bucket/resources/text_ko"
-            await self._upload_to_gcs(output_path, f"{gcs_bucket}/{output_filename}")
+            if workspace:
+                await workspace.register("translation", output_path)
+                await self._upload_to_gcs(output_path, f"gs://{self.bucket_name}/{workspace.gcs_path('text_ko', output_filename)}")
+            else:
+                gcs_bucket = "gs://onevoice-test-bucket/resources/text_ko"
+                await self._upload_to_gcs(output_path, f"{gcs_bucket}/{output_filename}")
             
             return '\n'.join(translated_lines)
             
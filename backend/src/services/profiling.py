@@ -0,0 +1,250 @@
+import os
+import sys
+import time
+import zlib
+import asyncio
+import threading
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from xml.sax.saxutils import escape
+from typing import Optional, Dict, List, AsyncIterator
+from . import config
+from .janitor import ArtifactKind
+from .workspace import TaskWorkspace
+
+# 메모리 보고서에서 제외할 할당 위치 (측정 도구 자체)
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+def _size(size: int, sign: bool = False) -> str:
+    value, unit = (size / (1024 * 1024), "MB") if abs(size) >= 1024 * 1024 else (size / 1024, "KB")
+    return f"{value:+.1f}{unit}" if sign else f"{value:.1f}{unit}"
+
+class StackSampler:
+    """
+    주기적으로 모든 스레드의 호출 스택을 수집하는 샘플링 프로파일러
+
+    스택은 `스레드;바깥 함수;...;안쪽 함수` 형식(folded stacks)으로 모으며, 대기 중인 스레드도
+    포함하므로 CPU 시간이 아닌 경과 시간 기준입니다. 같은 프로세스의 다른 작업도 함께 기록됩니다.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.thread:
+            self.thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """flamegraph.pl, speedscope 등에서 읽을 수 있는 folded stacks 텍스트"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+def render_flamegraph(stacks: Dict[str, int], title: str, width: int = 1200, row: int = 16) -> str:
+    """folded stacks를 외부 도구 없이 볼 수 있는 SVG 플레임그래프로 변환 (막대에 마우스를 올리면 샘플 수 표시)"""
+    root = {"name": "all", "value": 0, "children": {}}
+    for stack, count in stacks.items():
+        node = root
+        node["value"] += count
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"name": name, "value": 0, "children": {}})
+            node["value"] += count
+    depth = max((stack.count(";") + 2 for stack in stacks), default=1)
+    height = (depth + 2) * row
+    total = root["value"] or 1
+    elements = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="{row - 4}">{escape(title)}</text>',
+    ]
+
+    def layout(node, x: float, level: int) -> None:
+        w = node["value"] / total * width
+        if w < 0.5:
+            return
+        y = height - (level + 1) * row
+        hue = zlib.crc32(node["name"].encode("utf-8")) % 60
+        label = escape(node["name"])
+        elements.append(
+            f'<g><title>{label} ({node["value"]} samples, {node["value"] / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="hsl({hue}, 80%, 60%)"/>'
+        )
+        if w > 30:
+            elements.append(f'<text x="{x + 3:.1f}" y="{y + row - 4}">{escape(node["name"][:int(w / 7)])}</text>')
+        elements.append("</g>")
+        for child in sorted(node["children"].values(), key=lambda child: child["name"]):
+            layout(child, x, level + 1)
+            x += child["value"] / total * width
+
+    layout(root, 0.0, 0)
+    elements.append("</svg>")
+    return "\n".join(elements)
+
+class ProfileSession:
+    """
+    작업 하나의 프로파일링 (스택 샘플링 + 단계 경계마다 tracemalloc 스냅샷 비교)
+
+    스냅샷 수집과 비교는 힙 크기에 비례해 오래 걸리므로 이벤트 루프가 아닌 전용 스레드에서
+    순서대로 처리합니다. 단계 경계의 현재/최대 메모리는 경계 시점에 기록하고, 할당 비교는 스레드가
+    스냅샷을 뜨는 시점 기준입니다.
+    """
+
+    def __init__(self, task_id: str, interval: float, top: int):
+        self.task_id = task_id
+        self.top = top
+        self.sampler = StackSampler(interval)
+        self.started = 0.0
+        self.previous: Optional[tracemalloc.Snapshot] = None
+        self.report: List[str] = []
+        self.snapshots = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-snapshot")
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def start(self) -> None:
+        """첫 스냅샷을 뜨고 샘플링 시작 (이벤트 루프 밖에서 호출)"""
+        self.started = time.perf_counter()
+        self.previous = self._snapshot()
+        self.report.append(f"# 작업 {self.task_id} 메모리 프로파일 (단계 경계별 tracemalloc 스냅샷 비교)")
+        self.sampler.start()
+
+    def stage_boundary(self, span) -> None:
+        """단계 구간이 끝날 때 직전 스냅샷 대비 할당 증가 상위 항목 기록을 스냅샷 스레드에 예약"""
+        current, peak = tracemalloc.get_traced_memory()
+        header = (
+            f"\n[{time.perf_counter() - self.started:.1f}s] {span.name} 종료 ({span.duration:.1f}s) "
+            f"- 현재 {_size(current)}, 최대 {_size(peak)}"
+        )
+        self.snapshots.submit(self._compare, header)
+
+    def _compare(self, header: str) -> None:
+        snapshot = self._snapshot()
+        self.report.append(header)
+        for diff in snapshot.compare_to(self.previous, "lineno")[:self.top]:
+            if diff.size_diff:
+                self.report.append(f"  {_size(diff.size_diff, sign=True):>10} ({diff.count_diff:+d}개)  {diff.traceback}")
+        self.previous = snapshot
+
+    def stop(self) -> None:
+        """샘플링을 멈추고 예약된 비교를 마친 뒤 남은 할당 기록 (이벤트 루프 밖에서 호출)"""
+        self.sampler.stop()
+        self.snapshots.shutdown(wait=True)
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        self.report.append(
+            f"\n# 종료 ({time.perf_counter() - self.started:.1f}s) - 현재 {_size(current)}, 최대 {_size(peak)}, "
+            f"스택 샘플 {self.sampler.samples}회"
+        )
+        self.report.append("# 남아 있는 할당 상위 항목")
+        for stat in snapshot.statistics("lineno")[:self.top]:
+            self.report.append(f"  {_size(stat.size):>10} ({stat.count}개)  {stat.traceback}")
+
+    def _write(self, directory: str) -> Dict[str, str]:
+        paths = {
+            "profile_flamegraph": os.path.join(directory, "flamegraph.svg"),
+            "profile_stacks": os.path.join(directory, "stacks.folded"),
+            "profile_memory": os.path.join(directory, "memory.txt"),
+        }
+        title = f"OneVoice task {self.task_id} ({self.sampler.samples} samples, {self.sampler.interval * 1000:g}ms)"
+        with open(paths["profile_flamegraph"], "w", encoding="utf-8") as f:
+            f.write(render_flamegraph(self.sampler.stacks, title))
+        with open(paths["profile_stacks"], "w", encoding="utf-8") as f:
+            f.write(self.sampler.folded())
+        with open(paths["profile_memory"], "w", encoding="utf-8") as f:
+            f.write("\n".join(self.report) + "\n")
+        return paths
+
+    async def save(self, workspace: TaskWorkspace) -> None:
+        """결과 파일을 작업 공간에 저장하고 결과물로 등록 (중간 산출물 정리 대상 아님)"""
+        try:
+            paths = await asyncio.to_thread(self._write, workspace.dir("profile"))
+            for name, path in paths.items():
+                await workspace.register(name, path, ArtifactKind.OUTPUT)
+            print(f"프로파일 저장 완료: {os.path.dirname(paths['profile_memory'])}")
+        except Exception as e:
+            print(f"프로파일 저장 실패: {str(e)}")
+
+class TaskProfiler:
+    """
+    요청 시에만 켜는 작업별 CPU/메모리 프로파일러
+
+    요청에 프로파일링이 지정된 작업만 `profile()` 안에서 실행되며, 지정되지 않은 작업의 경로에는
+    아무것도 추가되지 않습니다. tracemalloc은 프로세스 전체 설정이므로 프로파일 중인 작업이 하나라도
+    있는 동안만 켭니다 (PYTHONTRACEMALLOC 등으로 이미 켜져 있으면 끄지 않음).
+    """
+
+    def __init__(self):
+        self.enabled = config.PROFILING_ENABLED
+        self.interval = config.PROFILE_SAMPLE_INTERVAL
+        self.top = config.PROFILE_TOP_ALLOCATIONS
+        self.sessions = 0
+        self.owns_tracemalloc = False
+
+    def _start_tracemalloc(self) -> None:
+        if self.sessions == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(config.PROFILE_TRACEMALLOC_FRAMES)
+            self.owns_tracemalloc = True
+        self.sessions += 1
+
+    def _stop_tracemalloc(self) -> None:
+        self.sessions -= 1
+        if self.sessions == 0 and self.owns_tracemalloc:
+            tracemalloc.stop()
+            self.owns_tracemalloc = False
+
+    @asynccontextmanager
+    async def profile(self, task_id: str, root) -> AsyncIterator[ProfileSession]:
+        """
+        작업 실행을 프로파일링하고 끝나면 결과를 작업 공간에 저장
+
+        root는 tracer.trace()가 반환한 최상위 구간으로, 이 추적의 `stage.*` 구간이 끝날 때마다
+        메모리 스냅샷을 비교합니다 (추적과 지표가 모두 꺼져 있으면 시작/종료 시점만 비교).
+        """
+        session = ProfileSession(task_id, self.interval, self.top)
+        self._start_tracemalloc()
+        await asyncio.to_thread(session.start)
+        trace = getattr(root, "trace", None)
+        if trace is not None:
+            trace.on_stage_end = session.stage_boundary
+        try:
+            yield session
+        finally:
+            if trace is not None:
+                trace.on_stage_end = None
+            # 샘플러 종료 대기와 마지막 스냅샷은 이벤트 루프 밖에서 처리
+            await asyncio.to_thread(session.stop)
+            self._stop_tracemalloc()
+            await session.save(TaskWorkspace(task_id))
+
+# 서비스 인스턴스 생성
+task_profiler = TaskProfiler()
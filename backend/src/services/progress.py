@@ -0,0 +1,107 @@
+import time
+import asyncio
+from typing import Optional, Callable, List
+from . import config
+from .task_manager import task_manager, TaskStatus, ProcessingStage
+
+ProgressCallback = Callable[[float], None]
+
+class ProgressReporter:
+    """
+    단계별 세부 진행률(0~1)을 전체 진행률(0~100) 구간으로 환산하여 작업 상태에 기록
+
+    보고는 메모리에만 반영하고 Redis 쓰기는 병합합니다. 마지막 쓰기 후 min_interval초가
+    지나야 다음 쓰기를 하며, 그 사이의 보고는 최신 값 하나로 합쳐집니다. 진행률은 감소하지 않습니다.
+    """
+
+    def __init__(self, task_id: str, min_interval: Optional[float] = None, min_delta: float = 1.0):
+        self.task_id = task_id
+        self.min_interval = config.PROGRESS_MIN_INTERVAL if min_interval is None else min_interval
+        self.min_delta = min_delta
+        self.stage: Optional[ProcessingStage] = None
+        self.progress = 0.0
+        self.written_stage: Optional[ProcessingStage] = None
+        self.written_progress: Optional[float] = None
+        self.last_write = 0.0
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.writer: Optional[asyncio.Task] = None
+        self.reports = 0
+        self.writes = 0
+
+    def report(self, stage: ProcessingStage, progress: float) -> None:
+        """전체 진행률(0~100) 보고 (이벤트 루프 스레드에서 호출)"""
+        self.reports += 1
+        self.stage = stage
+        self.progress = max(self.progress, min(float(progress), 100.0))
+        self._schedule()
+
+    def stage_callback(self, stage: ProcessingStage, start: float, end: float) -> ProgressCallback:
+        """단계의 0~1 진행률을 start~end 구간으로 환산하는 콜백"""
+        def callback(fraction: float) -> None:
+            self.report(stage, start + (end - start) * min(max(fraction, 0.0), 1.0))
+        return callback
+
+    def parallel_callbacks(self, stages: List[ProcessingStage], start: float, end: float) -> List[ProgressCallback]:
+        """동시에 진행되는 단계들의 평균 진행률을 start~end 구간으로 환산하는 콜백 목록"""
+        fractions = [0.0] * len(stages)
+
+        def make_callback(index: int) -> ProgressCallback:
+            def callback(fraction: float) -> None:
+                fractions[index] = max(fractions[index], min(max(fraction, 0.0), 1.0))
+                self.report(stages[index], start + (end - start) * sum(fractions) / len(fractions))
+            return callback
+
+        return [make_callback(index) for index in range(len(stages))]
+
+    def _dirty(self) -> bool:
+        return (
+            self.stage != self.written_stage
+            or self.written_progress is None
+            or self.progress - self.written_progress >= self.min_delta
+        )
+
+    def _schedule(self) -> None:
+        if not self._dirty() or self.flush_handle or (self.writer and not self.writer.done()):
+            # 대기 중이거나 진행 중인 쓰기가 최신 값을 반영함
+            return
+        delay = max(0.0, self.last_write + self.min_interval - time.monotonic())
+        self.flush_handle = asyncio.get_running_loop().call_later(delay, self._start_write)
+
+    def _start_write(self) -> None:
+        self.flush_handle = None
+        self.writer = asyncio.create_task(self._write())
+
+    async def _write(self) -> None:
+        stage, progress = self.stage, self.progress
+        self.last_write = time.monotonic()
+        try:
+            await task_manager.update_task_status(
+                self.task_id,
+                status=TaskStatus.PROCESSING,
+                stage=stage,
+                progress=int(progress)
+            )
+            self.written_stage, self.written_progress = stage, progress
+            self.writes += 1
+        except Exception as e:
+            print(f"진행률 기록 실패: {str(e)}")
+        finally:
+            self.writer = None
+        # 쓰는 동안 들어온 보고 반영
+        self._schedule()
+
+    async def flush(self) -> None:
+        """대기 중인 진행률을 즉시 기록 (완료/실패 상태를 쓰기 전에 호출)"""
+        if self.flush_handle:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if self.writer:
+            await self.writer
+        if self.flush_handle:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        if self._dirty():
+            await self._write()
+            if self.flush_handle:
+                self.flush_handle.cancel()
+                self.flush_handle = None
@@ -0,0 +1,374 @@
+import os
+import math
+import uuid
+import wave
+import queue
+import asyncio
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Callable, Iterator, Tuple
+import numpy as np
+from . import config
+from .tracing import tracer, file_size
+
+ProgressCallback = Callable[[float], None]
+
+# 프로세스 풀 워커별로 한 번만 로드하는 모델
+_pool_model = None
+
+def _init_pool_worker(model_name: str, num_threads: int) -> None:
+    """프로세스 풀 워커 초기화 (모델 로드)"""
+    global _pool_model
+    import torch
+    from demucs.pretrained import get_model
+    torch.set_num_threads(num_threads)
+    _pool_model = get_model(model_name)
+    _pool_model.eval()
+
+def _separate_chunk_in_pool(chunk: np.ndarray) -> np.ndarray:
+    return separate_chunk(_pool_model, chunk)
+
+def separate_chunk(model, chunk: np.ndarray) -> np.ndarray:
+    """
+    정규화된 (channels, frames) 구간에서 보컬을 제외한 음원의 합을 계산
+
+    --two-stems vocals와 동일하게 보컬 이외의 음원을 합산합니다.
+    """
+    import torch
+    from demucs.apply import apply_model
+    with torch.no_grad():
+        sources = apply_model(model, torch.from_numpy(chunk)[None], device="cpu",
+                              split=True, overlap=0.25, progress=False)[0]
+    vocals_index = model.sources.index("vocals")
+    return sum(source for i, source in enumerate(sources) if i != vocals_index).numpy()
+
+def _read_frames(wav_file: wave.Wave_read, count: int) -> np.ndarray:
+    """WAV에서 count 프레임을 읽어 (frames, channels) float32 배열로 변환"""
+    data = np.frombuffer(wav_file.readframes(count), dtype="<i2")
+    return data.reshape(-1, wav_file.getnchannels()).astype(np.float32) / 32768
+
+def iter_windows(wav_file: wave.Wave_read, window: int, overlap: int) -> Iterator[np.ndarray]:
+    """겹치는 구간을 가진 고정 길이 창 단위로 WAV를 순차 읽기 (메모리는 창 크기에 비례)"""
+    hop = window - overlap
+    chunk = _read_frames(wav_file, window)
+    while len(chunk):
+        yield chunk
+        if len(chunk) < window:
+            break
+        following = _read_frames(wav_file, hop)
+        if not len(following):
+            break
+        chunk = np.concatenate([chunk[hop:], following])
+
+def count_windows(total_frames: int, window: int, overlap: int) -> int:
+    """iter_windows가 생성하는 창의 개수"""
+    if total_frames <= window:
+        return 1
+    return 1 + math.ceil((total_frames - window) / (window - overlap))
+
+class OverlapAddWriter:
+    """연속된 창의 겹치는 구간을 선형 크로스페이드로 이어 WAV에 순차 기록 (overlap은 창 길이의 절반 이하)"""
+
+    def __init__(self, wav_file: wave.Wave_write, overlap: int):
+        self.wav_file = wav_file
+        self.overlap = overlap
+        self.tail: Optional[np.ndarray] = None
+
+    def write(self, chunk: np.ndarray, last: bool) -> None:
+        """(frames, channels) float 구간 기록 (마지막 창이 아니면 뒤쪽 겹침 구간은 보관)"""
+        if self.tail is not None:
+            n = min(len(self.tail), len(chunk))
+            fade = np.linspace(0.0, 1.0, n, dtype=np.float32)[:, None]
+            self._emit(self.tail[:n] * (1 - fade) + chunk[:n] * fade)
+            chunk = chunk[n:]
+            self.tail = None
+
+        if last or not self.overlap or len(chunk) <= self.overlap:
+            self._emit(chunk)
+        else:
+            self._emit(chunk[:-self.overlap])
+            self.tail = chunk[-self.overlap:]
+
+    def _emit(self, frames: np.ndarray) -> None:
+        if len(frames):
+            # 분리 결과를 전치한 (frames, channels) 배열은 열 우선 순서이므로 행 우선으로 변환하여 기록
+            pcm = np.clip(np.round(frames * 32768), -32768, 32767).astype("<i2", order="C")
+            self.wav_file.writeframes(pcm)
+
+def audio_stats(wav_path: str, block: int = 1 << 20) -> Tuple[float, float]:
+    """demucs CLI와 같은 정규화를 위한 모노 평균/표준편차 (블록 단위 스트리밍 계산)"""
+    total = 0
+    sum_ = 0.0
+    sum_sq = 0.0
+    with wave.open(wav_path, "rb") as wav_file:
+        while True:
+            frames = _read_frames(wav_file, block)
+            if not len(frames):
+                break
+            mono = frames.mean(axis=1, dtype=np.float64)
+            total += len(mono)
+            sum_ += float(mono.sum())
+            sum_sq += float(np.dot(mono, mono))
+    if not total:
+        return 0.0, 1.0
+    mean = sum_ / total
+    std = math.sqrt(max(sum_sq / total - mean * mean, 0.0))
+    return mean, std or 1.0
+
+class SeparationJob:
+    """음원 분리 작업 단위"""
+
+    def __init__(self,
+                 job_id: str,
+                 audio_path: str,
+                 output_dir: str,
+                 loop: asyncio.AbstractEventLoop,
+                 future: asyncio.Future,
+                 progress_callback: Optional[ProgressCallback] = None):
+        self.job_id = job_id
+        self.audio_path = audio_path
+        self.output_dir = output_dir
+        self.loop = loop
+        self.future = future
+        self.progress_callback = progress_callback
+
+    def report(self, progress: float) -> None:
+        """워커 스레드에서 이벤트 루프로 진행률 전달"""
+        if self.progress_callback:
+            self.loop.call_soon_threadsafe(self.progress_callback, progress)
+
+    def resolve(self, output_path: str) -> None:
+        self.loop.call_soon_threadsafe(self._set_result, output_path)
+
+    def reject(self, error: Exception) -> None:
+        self.loop.call_soon_threadsafe(self._set_exception, error)
+
+    def _set_result(self, output_path: str) -> None:
+        if not self.future.done():
+            self.future.set_result(output_path)
+
+    def _set_exception(self, error: Exception) -> None:
+        if not self.future.done():
+            self.future.set_exception(error)
+
+class SeparationCancelled(Exception):
+    """워커 종료로 처리하지 못한 분리 작업"""
+
+class SeparationService:
+    """Demucs 모델을 한 번만 로드하여 로컬 큐로 작업을 받는 상주 음원 분리 워커"""
+
+    # Demucs 사전학습 모델 공통 입력 형식 (프로세스 풀을 쓸 때 모델을 로드하지 않고 창 분할 가능 여부 판단)
+    SAMPLE_RATE = 44100
+    AUDIO_CHANNELS = 2
+
+    def __init__(self,
+                 model_name: Optional[str] = None,
+                 num_threads: Optional[int] = None,
+                 num_workers: Optional[int] = None):
+        self.model_name = model_name or config.DEMUCS_MODEL
+        self.num_threads = num_threads or config.DEMUCS_THREADS
+        self.num_workers = num_workers or config.DEMUCS_WORKERS
+        self.chunk_seconds = config.DEMUCS_CHUNK_SECONDS
+        self.overlap_seconds = config.DEMUCS_CHUNK_OVERLAP_SECONDS
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.output_dir = os.path.join(config.TEMP_DIR, "separation")
+        self.jobs: "queue.Queue[Optional[SeparationJob]]" = queue.Queue()
+        self.model = None
+        self.worker: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+
+    def start(self, preload: bool = False) -> None:
+        """워커 스레드 시작 (preload=True면 모델을 미리 로드)"""
+        with self.lock:
+            if self.worker and self.worker.is_alive():
+                return
+            self.stopping.clear()
+            self.worker = threading.Thread(target=self._run, args=(preload,), name="demucs-worker", daemon=True)
+            self.worker.start()
+
+    async def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        워커 종료 (대기 중인 작업은 SeparationCancelled로 실패 처리하고, 진행 중인 작업은 다음 창에서 중단)
+
+        timeout(기본값 DEMUCS_SHUTDOWN_TIMEOUT)초 안에 워커가 끝나지 않으면 기다리지 않고 반환합니다
+        (데몬 스레드이므로 프로세스 종료를 막지 않음). 이벤트 루프를 막지 않도록 스레드에서 대기합니다.
+        """
+        timeout = config.DEMUCS_SHUTDOWN_TIMEOUT if timeout is None else timeout
+        self.stopping.set()
+        if self.worker and self.worker.is_alive():
+            self.jobs.put(None)
+            await asyncio.to_thread(self.worker.join, timeout)
+            if self.worker.is_alive():
+                print(f"음원 분리 워커가 {timeout:g}초 안에 종료되지 않아 기다리지 않고 종료합니다.")
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    async def separate(self,
+                       audio_path: str,
+                       job_id: Optional[str] = None,
+                       progress_callback: Optional[ProgressCallback] = None,
+                       output_dir: Optional[str] = None) -> str:
+        """
+        오디오에서 보컬을 제외한 배경음(no_vocals.wav)을 분리
+
+        Args:
+            audio_path (str): 원본 오디오 파일 경로
+            job_id (Optional[str]): 작업 ID (작업별 출력 디렉토리 이름)
+            progress_callback (Optional[ProgressCallback]): 0~1 진행률을 받는 콜백 (이벤트 루프에서 호출)
+            output_dir (Optional[str]): 출력 디렉토리 (없으면 공용 분리 디렉토리 아래 job_id)
+
+        Returns:
+            str: 분리된 배경음 파일 경로
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        job_id = job_id or str(uuid.uuid4())
+        job = SeparationJob(
+            job_id,
+            audio_path,
+            output_dir or os.path.join(self.output_dir, job_id),
+            loop,
+            loop.create_future(),
+            progress_callback
+        )
+        # 대기열 대기 시간을 포함한 분리 전체를 하나의 구간으로 기록
+        with tracer.span("demucs.separate", bytes=file_size(audio_path), model=self.model_name) as span:
+            self.jobs.put(job)
+            output_path = await job.future
+            span.set(bytes=file_size(output_path))
+            return output_path
+
+    def _run(self, preload: bool) -> None:
+        if preload:
+            try:
+                if self.num_workers > 1:
+                    self._get_pool()
+                else:
+                    self._load_model()
+            except Exception as e:
+                print(f"Demucs 모델 사전 로드 실패: {str(e)}")
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            if self.stopping.is_set():
+                job.reject(SeparationCancelled("음원 분리 워커가 종료되어 작업을 처리하지 못했습니다."))
+                continue
+            try:
+                job.resolve(self._separate(job))
+            except Exception as e:
+                job.reject(e)
+
+    def _load_model(self):
+        if self.model is None:
+            import torch
+            from demucs.pretrained import get_model
+            torch.set_num_threads(self.num_threads)
+            print(f"Demucs 모델 로드: {self.model_name} (스레드 {self.num_threads}개)")
+            self.model = get_model(self.model_name)
+            self.model.eval()
+        return self.model
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """워커마다 모델을 한 번 로드하는 상주 프로세스 풀"""
+        if self.pool is None:
+            threads_per_worker = max(1, self.num_threads // self.num_workers)
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_pool_worker,
+                initargs=(self.model_name, threads_per_worker)
+            )
+        return self.pool
+
+    def _separate(self, job: SeparationJob) -> str:
+        job.report(0.0)
+        Path(job.output_dir).mkdir(parents=True, exist_ok=True)
+        output_path = os.path.join(job.output_dir, "no_vocals.wav")
+
+        try:
+            with wave.open(job.audio_path, "rb") as wav_file:
+                chunkable = (
+                    wav_file.getsampwidth() == 2
+                    and wav_file.getframerate() == self.SAMPLE_RATE
+                    and wav_file.getnchannels() == self.AUDIO_CHANNELS
+                )
+        except (wave.Error, EOFError):
+            chunkable = False
+        if chunkable:
+            # 프로세스 풀은 워커마다 모델을 로드하므로 이 프로세스에서는 단일 워커일 때만 로드
+            model = self._load_model() if self.num_workers <= 1 else None
+            self._separate_chunked(job, model, output_path)
+        else:
+            self._separate_whole(job, self._load_model(), output_path)
+
+        job.report(1.0)
+        return output_path
+
+    def _separate_chunked(self, job: SeparationJob, model, output_path: str) -> None:
+        """겹치는 창 단위로 나누어 여러 코어에서 분리한 뒤 오버랩-애드로 이어 붙임"""
+        mean, std = audio_stats(job.audio_path)
+        window = int(self.chunk_seconds * self.SAMPLE_RATE)
+        overlap = min(int(self.overlap_seconds * self.SAMPLE_RATE), window // 2)
+        # 동시에 메모리에 올라가는 창 수를 제한하여 트랙 길이와 무관하게 메모리 사용량 유지
+        max_in_flight = max(1, self.num_workers) * 2
+
+        with wave.open(job.audio_path, "rb") as reader, wave.open(output_path, "wb") as output:
+            total = count_windows(reader.getnframes(), window, overlap)
+            output.setnchannels(reader.getnchannels())
+            output.setsampwidth(2)
+            output.setframerate(reader.getframerate())
+            writer = OverlapAddWriter(output, overlap)
+
+            pending = deque()
+            done = 0
+            for chunk in iter_windows(reader, window, overlap):
+                if self.stopping.is_set():
+                    raise SeparationCancelled("음원 분리 워커 종료로 작업을 중단했습니다.")
+                normalized = np.ascontiguousarray(((chunk - mean) / std).T)
+                if self.num_workers > 1:
+                    pending.append(self._get_pool().submit(_separate_chunk_in_pool, normalized))
+                else:
+                    pending.append(separate_chunk(model, normalized))
+
+                while len(pending) >= max_in_flight:
+                    done = self._write_next(job, writer, pending, done, total, mean, std)
+
+            # 창 개수(total)는 진행률 계산에만 쓰고, 실제로 읽은 창을 모두 기록한 뒤 마지막 창에서 겹침 구간을 비움
+            while pending:
+                done = self._write_next(job, writer, pending, done, total, mean, std)
+
+    @staticmethod
+    def _write_next(job: SeparationJob, writer: OverlapAddWriter, pending: deque,
+                    done: int, total: int, mean: float, std: float) -> int:
+        """가장 먼저 제출한 창의 분리 결과를 기록 (대기 중인 창이 없으면 마지막 창)"""
+        result = pending.popleft()
+        result = result if isinstance(result, np.ndarray) else result.result()
+        writer.write(result.T * std + mean, last=not pending)
+        done += 1
+        job.report(0.05 + 0.95 * min(done / total, 1.0))
+        return done
+
+    def _separate_whole(self, job: SeparationJob, model, output_path: str) -> None:
+        """샘플레이트/채널이 모델과 다른 입력은 전체를 한 번에 변환하여 분리"""
+        import torch
+        from demucs.audio import AudioFile, save_audio
+
+        wav = AudioFile(job.audio_path).read(streams=0, samplerate=model.samplerate, channels=model.audio_channels)
+        job.report(0.1)
+
+        # demucs CLI와 동일한 정규화
+        ref = wav.mean(0)
+        mean, std = ref.mean(), ref.std()
+        no_vocals = separate_chunk(model, ((wav - mean) / std).numpy())
+        save_audio(torch.from_numpy(no_vocals) * std + mean, output_path, samplerate=model.samplerate)
+
+# 서비스 인스턴스 생성
+separation_service = SeparationService()
@@ -0,0 +1,93 @@
+import os
+import re
+import json
+import math
+import threading
+from typing import Optional, Dict
+from . import config
+
+class SpeakingRateModel:
+    """음성별 초당 글자 수(CPS)를 과거 합성 결과로 학습하여 발화 길이와 speaking_rate를 예측"""
+
+    def __init__(self,
+                 model_path: Optional[str] = None,
+                 default_cps: Optional[float] = None,
+                 smoothing: float = 0.2,
+                 save_every: int = 20):
+        self.model_path = model_path if model_path is not None else config.TTS_RATE_MODEL_PATH
+        self.default_cps = default_cps or config.TTS_DEFAULT_CPS
+        self.smoothing = smoothing  # 지수 이동 평균 가중치
+        self.save_every = save_every
+        self.cps: Dict[str, float] = {}
+        self.observations: Dict[str, int] = {}
+        self.pending = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.model_path or not os.path.exists(self.model_path):
+            return
+        try:
+            with open(self.model_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for voice, entry in data.items():
+                self.cps[voice] = float(entry["cps"])
+                self.observations[voice] = int(entry.get("observations", 0))
+        except Exception as e:
+            print(f"발화 속도 모델 로드 실패: {str(e)}")
+
+    def save(self) -> None:
+        """학습된 모델을 파일에 저장"""
+        if not self.model_path:
+            return
+        with self.lock:
+            data = {
+                voice: {"cps": cps, "observations": self.observations.get(voice, 0)}
+                for voice, cps in self.cps.items()
+            }
+            self.pending = 0
+        try:
+            temp_path = f"{self.model_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.model_path)
+        except Exception as e:
+            print(f"발화 속도 모델 저장 실패: {str(e)}")
+
+    @staticmethod
+    def count_chars(text: str) -> int:
+        """공백을 제외한 글자 수"""
+        return len(re.sub(r"\s+", "", text))
+
+    def predict_duration(self, voice: str, text: str) -> float:
+        """speaking_rate 1.0 기준 예상 발화 길이(초)"""
+        return self.count_chars(text) / self.cps.get(voice, self.default_cps)
+
+    def choose_speaking_rate(self, voice: str, text: str, target_duration: float) -> float:
+        """목표 길이 안에 들어가도록 요청할 speaking_rate (1.0 ~ TTS_MAX_SPEAKING_RATE)"""
+        if target_duration <= 0:
+            return 1.0
+        rate = self.predict_duration(voice, text) / target_duration
+        return self.quantize(rate)
+
+    @staticmethod
+    def quantize(rate: float) -> float:
+        """캐시 적중률을 위해 0.05 단위로 올림하고 허용 범위로 제한"""
+        rate = math.ceil(rate * 20 - 1e-9) / 20
+        return min(max(rate, 1.0), config.TTS_MAX_SPEAKING_RATE)
+
+    def observe(self, voice: str, text: str, duration: float, speaking_rate: float) -> None:
+        """합성 결과로 음성의 CPS를 갱신"""
+        chars = self.count_chars(text)
+        if chars == 0 or duration <= 0:
+            return
+        # speaking_rate 1.0 기준으로 환산한 CPS
+        observed = chars / (duration * speaking_rate)
+        with self.lock:
+            previous = self.cps.get(voice)
+            self.cps[voice] = observed if previous is None else previous + self.smoothing * (observed - previous)
+            self.observations[voice] = self.observations.get(voice, 0) + 1
+            self.pending += 1
+            should_save = self.pending >= self.save_every
+        if should_save:
+            self.save()
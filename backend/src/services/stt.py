@@ -1,10 +1,12 @@
 import os
 from google.cloud import speech_v2 as speech
-from google.cloud import storage
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Callable
 import asyncio
 from . import config
+from .clients import clients
+from .workspace import TaskWorkspace
+from .tracing import tracer, file_size
 import subprocess
 import time
 import tempfile
@@ -12,18 +14,27 @@ import json
 
 class STTService:
     def __init__(self):
-        self.client = speech.SpeechClient()
-        self.storage_client = storage.Client()
         self.bucket_name = "onevoice-test-bucket"
         self.output_dir = os.path.join(config.TEMP_DIR, "text_en")
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
 
-    async def transcribe_audio(self, audio_path: str) -> Optional[str]:
+    @property
+    def client(self):
+        return clients.speech
+
+    @property
+    def storage_client(self):
+        return clients.storage
+
+    async def transcribe_audio(self, audio_path: str, progress_callback: Optional[Callable[[float], None]] = None,
+                               workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
         """
         오디오 파일을 텍스트로 변환
         
         Args:
             audio_path (str): 노이즈가 제거된 오디오 파일 경로
+            progress_callback (Optional[Callable[[float], None]]): 원격 작업 진행률(0~1)을 받는 콜백
+            workspace (Optional[TaskWorkspace]): 작업 공간 (결과 파일 저장 위치와 GCS 경로, 없으면 공용 디렉토리)
             
         Returns:
             Optional[str]: 변환된 텍스트
@@ -31,12 +42,16 @@ class STTService:
         try:
             # GCS URI 생성 (이미 업로드된 파일 사용)
             file_name = os.path.basename(audio_path)
-            gcs_uri = f"gs://{self.bucket_name}/resources/input_videos/{file_name}"
-            
-            # 결과를 저장할 GCS 경로 생성
             base_name = os.path.splitext(file_name)[0]
             result_filename = f"{base_name}_transcript_{int(time.time())}"
-            results_uri = f"gs://{self.bucket_name}/resources/text_en/{result_filename}/"
+            if workspace:
+                gcs_uri = f"gs://{self.bucket_name}/{workspace.gcs_path('input_videos', file_name)}"
+                results_uri = f"gs://{self.bucket_name}/{workspace.gcs_path('text_en', result_filename)}/"
+                output_dir = workspace.dir("text_en")
+            else:
+                gcs_uri = f"gs://{self.bucket_name}/resources/input_videos/{file_name}"
+                results_uri = f"gs://{self.bucket_name}/resources/text_en/{result_filename}/"
+                output_dir = self.output_dir
             
             print(f"STT: GCS에 업로드된 파일 사용: {gcs_uri}")
             print(f"STT: 결과 저장 위치: {results_uri}")
@@ -64,14 +79,21 @@ class STTService:
                 )
             )
 
-            # 비동기 음성 인식 수행
-            operation = self.client.batch_recognize(request=request)
-            
-            # 진행 상황 모니터링 및 결과 대기
-            while not operation.done():
-                await asyncio.sleep(5)
-            
-            response = operation.result()
+            # 비동기 음성 인식 수행 (요청부터 작업 완료까지 하나의 구간으로 기록)
+            with tracer.span("speech.batch_recognize", bytes=file_size(audio_path)) as span:
+                operation = self.client.batch_recognize(request=request)
+                
+                # 진행 상황 모니터링 및 결과 대기
+                polls = 0
+                while not operation.done():
+                    if progress_callback:
+                        # 배치 인식 작업 메타데이터의 진행률 (0~100)
+                        progress_callback(getattr(operation.metadata, "progress_percent", 0) / 100)
+                    await asyncio.sleep(config.STT_POLL_INTERVAL)
+                    polls += 1
+                span.set(polls=polls)
+                
+                response = operation.result()
             
             # 결과 확인
             if not response.results:
@@ -86,7 +108,7 @@ class STTService:
                 print(f"결과 파일 URI: {result_uri}")
                 
                 # GCS에서 결과 파일 다운로드
-                transcript = await self._download_and_parse_results(result_uri)
+                transcript = await self._download_and_parse_results(result_uri, output_dir)
                 if transcript:
                     break  # 첫 번째 결과 파일만 사용
             
@@ -96,10 +118,12 @@ class STTService:
                 
             # 결과 파일 저장
             file_name = os.path.basename(audio_path).replace(".wav", "_transcript.txt")
-            output_path = os.path.join(self.output_dir, file_name)
+            output_path = os.path.join(output_dir, file_name)
             
             with open(output_path, "w", encoding="utf-8") as f:
                 f.write(transcript)
+            if workspace:
+                await workspace.register("transcript", output_path)
 
             return transcript
 
@@ -109,12 +133,13 @@ class STTService:
             print(traceback.format_exc())
             return None
             
-    async def _download_and_parse_results(self, result_uri: str) -> str:
+    async def _download_and_parse_results(self, result_uri: str, output_dir: Optional[str] = None) -> str:
         """
         GCS에서 결과 파일을 다운로드하고 파싱
         
         Args:
             result_uri (str): 결과 파일의 GCS URI
+            output_dir (Optional[str]): 결과 파일을 내려받을 디렉토리
             
         Returns:
             str: 파싱된 트랜스크립트 텍스트
@@ -135,10 +160,12 @@ class STTService:
             
             # 결과 파일 이름 생성
             result_filename = os.path.basename(object_name)
-            local_result_path = os.path.join(self.output_dir, result_filename)
+            local_result_path = os.path.join(output_dir or self.output_dir, result_filename)
             
             # GCS에서 파일 다운로드하여 text_en 디렉토리에 저장
-            blob.download_to_filename(local_result_path)
+            with tracer.span("gcs.download", object=object_name) as span:
+                blob.download_to_filename(local_result_path)
+                span.set(bytes=file_size(local_result_path))
             print(f"결과 파일 다운로드 완료: {local_result_path}")
             
             # JSON 파일 읽기
@@ -197,7 +224,9 @@ class STTService:
             print(traceback.format_exc())
             return ""
 
-    async def process_video(self, video_path: str, denoised_audio_path: str = None, original_audio_path: str = None) -> Optional[str]:
+    async def process_video(self, video_path: str, denoised_audio_path: str = None, original_audio_path: str = None,
+                            progress_callback: Optional[Callable[[float], None]] = None,
+                            workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
         """비디오에서 텍스트로 변환"""
         try:
             # 노이즈가 제거된 오디오가 없으면 오류 발생
@@ -205,7 +234,7 @@ class STTService:
                 raise Exception("노이즈가 제거된 오디오 파일이 필요합니다.")
 
             # 텍스트 변환 (노이즈가 제거된 오디오만 사용)
-            return await self.transcribe_audio(denoised_audio_path)
+            return await self.transcribe_audio(denoised_audio_path, progress_callback, workspace)
 
         except Exception as e:
             print(f"비디오 처리 실패: {str(e)}")
@@ -1,6 +1,10 @@
 import json
-from typing import Optional, Dict, Any
-import redis
+import time
+import uuid
+import asyncio
+from typing import Optional, Dict, Any, Set, List, AsyncIterator, Callable
+import redis.asyncio as redis
+from redis.exceptions import ResponseError, WatchError
 from enum import Enum
 import os
 
@@ -16,22 +20,182 @@ class ProcessingStage(str, Enum):
     MERGE = "merge"
     TRANSLATION = "translation"
     TTS = "tts"
+    SEPARATION = "separation"
+    MUX = "mux"
+
+class TaskEventBroker:
+    """
+    하나의 Redis pub/sub 연결로 작업별 채널을 구독하여 프로세스 내 구독자 큐로 분배
+
+    구독자 수와 관계없이 프로세스당 연결 하나만 사용하며, 마지막 구독자가 떠나면 채널 구독을 해제합니다.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self.pubsub = None
+        self.listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self.reader: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+    async def subscribe(self, channel: str) -> asyncio.Queue:
+        """채널을 구독하고 메시지를 받을 큐 반환"""
+        queue: asyncio.Queue = asyncio.Queue()
+        async with self.lock:
+            if self.pubsub is None:
+                self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            if channel not in self.listeners:
+                self.listeners[channel] = set()
+                await self.pubsub.subscribe(channel)
+            self.listeners[channel].add(queue)
+            if self.reader is None or self.reader.done():
+                self.reader = asyncio.create_task(self._read())
+        return queue
+
+    async def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        """구독 해제 (채널의 마지막 구독자면 Redis 구독도 해제)"""
+        async with self.lock:
+            queues = self.listeners.get(channel)
+            if queues is None:
+                return
+            queues.discard(queue)
+            if not queues:
+                del self.listeners[channel]
+                await self.pubsub.unsubscribe(channel)
+
+    async def _read(self) -> None:
+        while self.listeners:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as e:
+                print(f"작업 이벤트 수신 오류: {str(e)}")
+                await asyncio.sleep(1.0)
+                continue
+            if message and message.get("type") == "message":
+                for queue in list(self.listeners.get(message["channel"], ())):
+                    queue.put_nowait(json.loads(message["data"]))
+
+    async def close(self) -> None:
+        if self.reader and not self.reader.done():
+            self.reader.cancel()
+        if self.pubsub is not None:
+            await self.pubsub.aclose()
+            self.pubsub = None
 
 class TaskManager:
+    """
+    Redis 해시(`task:<id>`)에 작업 상태를 필드 단위로 저장하는 비동기 작업 관리자
+
+    각 필드 값은 JSON으로 인코딩하여 타입(None, 숫자 등)을 유지하고, 갱신할 때마다 `_rev`
+    필드를 증가시키며 만료 시간(TASK_TTL_SECONDS)을 연장합니다. 이전 버전의 JSON 문자열 키는 조회 시 그대로 읽고 갱신 시 해시로 변환합니다.
+
+    산출물 manifest는 `artifact:<이름>` 필드에 저장하며 조회 시 `artifacts` 항목으로 묶어 반환합니다.
+
+    조회용 정렬 집합 인덱스를 함께 관리합니다.
+    - `tasks:created`: 생성 시각을 점수로 하는 전체 작업
+    - `tasks:status:<status>`, `tasks:stage:<stage>`: 해당 상태/단계에 들어간 시각을 점수로 하는 작업
+    """
+
+    REVISION_FIELD = "_rev"
+    ARTIFACT_PREFIX = "artifact:"
+    TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+    CREATED_INDEX = "tasks:created"
+    MAX_BULK_TASKS = 500
+
     def __init__(self):
         redis_host = os.getenv('REDIS_HOST', 'redis')
         redis_port = int(os.getenv('REDIS_PORT', 6379))
-        self.redis = redis.Redis(
+        self.pool = redis.ConnectionPool(
             host=redis_host,
             port=redis_port,
             db=0,
             decode_responses=True,
             socket_connect_timeout=300,
-            retry_on_timeout=True
+            retry_on_timeout=True,
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
         )
+        self.redis = redis.Redis(connection_pool=self.pool)
+        self.ttl = int(os.getenv('TASK_TTL_SECONDS', 7 * 24 * 3600))  # 마지막 갱신 후 작업 키 보관 시간(초)
+        self.events = TaskEventBroker(self.redis)
+
+    async def close(self) -> None:
+        """이벤트 구독과 연결 풀을 종료합니다."""
+        await self.events.close()
+        await self.pool.disconnect()
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task:{task_id}"
+
+    @staticmethod
+    def _channel(task_id: str) -> str:
+        return f"task-events:{task_id}"
+
+    @staticmethod
+    def _status_index(status: Any) -> str:
+        return f"tasks:status:{getattr(status, 'value', status)}"
+
+    @staticmethod
+    def _stage_index(stage: Any) -> str:
+        return f"tasks:stage:{getattr(stage, 'value', stage)}"
+
+    def _index(self, pipe, task_id: str, fields: Dict[str, Any], now: float) -> None:
+        """
+        상태/단계 인덱스 갱신 명령을 파이프라인에 추가
+
+        같은 상태가 다시 기록되어도 처음 들어간 시각을 유지하고(NX), 다른 상태 인덱스에서는 제거합니다.
+        """
+        for field, index, values in (
+            ("status", self._status_index, TaskStatus),
+            ("stage", self._stage_index, ProcessingStage),
+        ):
+            if not fields.get(field):
+                continue
+            current = index(fields[field])
+            for value in values:
+                if index(value) != current:
+                    pipe.zrem(index(value), task_id)
+            pipe.zadd(current, {task_id: now}, nx=True)
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        return {name: json.dumps(value) for name, value in fields.items()}
+
+    @classmethod
+    def _decode(cls, fields: Dict[str, str]) -> Dict[str, Any]:
+        task_data = {}
+        artifacts = {}
+        for name, value in fields.items():
+            if name.startswith("_"):
+                continue
+            if name.startswith(cls.ARTIFACT_PREFIX):
+                artifacts[name[len(cls.ARTIFACT_PREFIX):]] = json.loads(value)
+            else:
+                task_data[name] = json.loads(value)
+        task_data["artifacts"] = artifacts
+        return task_data
+
+    async def _migrate_legacy(self, key: str) -> None:
+        """JSON 문자열로 저장된 이전 형식의 작업을 해시로 변환합니다."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    if await pipe.type(key) != "string":
+                        await pipe.unwatch()
+                        return
+                    task_data = json.loads(await pipe.get(key))
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.hset(key, mapping=self._encode(task_data))
+                    pipe.hincrby(key, self.REVISION_FIELD, 1)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
 
     async def create_task(self, task_id: str) -> None:
         """새로운 작업을 생성합니다."""
+        now = time.time()
         task_data = {
             "status": TaskStatus.PENDING,
             "stage": None,
@@ -39,14 +203,237 @@ class TaskManager:
             "result": None,
             "error": None,
             "diarization_result": None,
-            "merged_result": None
+            "merged_result": None,
+            "playlist": None,
+            "created_at": now,
+            "updated_at": now
         }
-        self.redis.set(f"task:{task_id}", json.dumps(task_data))
+        key = self._key(task_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={**self._encode(task_data), self.REVISION_FIELD: 0})
+            pipe.expire(key, self.ttl)
+            for stage in ProcessingStage:
+                pipe.zrem(self._stage_index(stage), task_id)
+            self._index(pipe, task_id, task_data, now)
+            pipe.zadd(self.CREATED_INDEX, {task_id: now})
+            await pipe.execute()
 
     async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """작업의 현재 상태를 조회합니다."""
-        task_data = self.redis.get(f"task:{task_id}")
-        return json.loads(task_data) if task_data else None
+        key = self._key(task_id)
+        try:
+            task_data = await self.redis.hgetall(key)
+        except ResponseError:
+            # 이전 형식(JSON 문자열) 키
+            legacy_data = await self.redis.get(key)
+            return json.loads(legacy_data) if legacy_data else None
+        return self._decode(task_data) if task_data else None
+
+    async def get_task_statuses(self, task_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        여러 작업의 상태를 한 번의 파이프라인 왕복으로 조회합니다.
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: 작업 ID별 상태 (없는 작업은 None)
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return {}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task_id in task_ids:
+                pipe.hgetall(self._key(task_id))
+            results = await pipe.execute(raise_on_error=False)
+
+        statuses = {}
+        for task_id, task_data in zip(task_ids, results):
+            if isinstance(task_data, ResponseError):
+                # 이전 형식(JSON 문자열) 키는 개별 조회
+                statuses[task_id] = await self.get_task_status(task_id)
+            elif isinstance(task_data, Exception):
+                raise task_data
+            else:
+                statuses[task_id] = self._decode(task_data) if task_data else None
+        return statuses
+
+    async def query_tasks(
+        self,
+        status: Optional[TaskStatus] = None,
+        stage: Optional[ProcessingStage] = None,
+        older_than: Optional[float] = None,
+        newer_than: Optional[float] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        인덱스로 작업을 조회합니다 (오래된 순).
+
+        status나 stage를 지정하면 해당 상태/단계에 들어간 시각, 아니면 생성 시각을 기준으로
+        older_than초보다 오래되고 newer_than초보다 최근인 작업만 반환합니다.
+        status와 stage를 함께 지정하면 두 인덱스의 교집합(점수는 상태에 들어간 시각)에서
+        LIMIT을 적용하므로 다른 단계의 작업 때문에 결과가 줄지 않습니다.
+        """
+        if status:
+            indexes = [self._status_index(status)]
+        elif stage:
+            indexes = [self._stage_index(stage)]
+        else:
+            indexes = [self.CREATED_INDEX]
+        if status and stage:
+            indexes.append(self._stage_index(stage))
+        now = time.time()
+        max_score = now - older_than if older_than is not None else "+inf"
+        min_score = now - newer_than if newer_than is not None else "-inf"
+
+        if len(indexes) == 1:
+            entries = await self.redis.zrangebyscore(
+                indexes[0], min_score, max_score, start=offset, num=limit, withscores=True
+            )
+        else:
+            # 교집합을 임시 키에 만들고 같은 트랜잭션에서 읽은 뒤 삭제
+            query_key = f"tasks:query:{uuid.uuid4().hex}"
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zinterstore(query_key, {indexes[0]: 1, indexes[1]: 0}, aggregate="SUM")
+                pipe.zrangebyscore(query_key, min_score, max_score, start=offset, num=limit, withscores=True)
+                pipe.delete(query_key)
+                _, entries, _ = await pipe.execute()
+        statuses = await self.get_task_statuses([task_id for task_id, _ in entries])
+
+        tasks = []
+        for task_id, score in entries:
+            task_data = statuses.get(task_id)
+            if task_data is None:
+                # 만료·삭제된 작업의 인덱스 항목 정리
+                for index in indexes:
+                    await self.redis.zrem(index, task_id)
+                continue
+            tasks.append({"task_id": task_id, "since": score, **task_data})
+        return tasks
+
+    async def count_tasks(self) -> Dict[str, int]:
+        """상태별 작업 수를 조회합니다."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for status in TaskStatus:
+                pipe.zcard(self._status_index(status))
+            counts = await pipe.execute()
+        return {status.value: count for status, count in zip(TaskStatus, counts)}
+
+    async def prune_indexes(self, before: float) -> int:
+        """
+        before 이전에 생성되었고 키가 만료된 작업을 모든 인덱스에서 제거합니다.
+
+        Returns:
+            int: 제거한 작업 수
+        """
+        task_ids = await self.redis.zrangebyscore(self.CREATED_INDEX, "-inf", before)
+        if not task_ids:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task_id in task_ids:
+                pipe.exists(self._key(task_id))
+            exists = await pipe.execute()
+        expired = [task_id for task_id, found in zip(task_ids, exists) if not found]
+        if not expired:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrem(self.CREATED_INDEX, *expired)
+            for status in TaskStatus:
+                pipe.zrem(self._status_index(status), *expired)
+            for stage in ProcessingStage:
+                pipe.zrem(self._stage_index(stage), *expired)
+            await pipe.execute()
+        return len(expired)
+
+    async def _write_existing(self, key: str, queue: Callable[[Any], None]) -> bool:
+        """
+        작업 키가 있을 때만 queue가 파이프라인에 추가한 명령을 MULTI로 실행합니다.
+
+        키를 WATCH한 뒤 확인하므로 확인과 기록 사이에 만료·삭제되면 다시 확인하며,
+        삭제된 작업이 필드 일부만 가진 해시로 되살아나지 않습니다. 이전 형식 키는 먼저 해시로 변환합니다.
+
+        Returns:
+            bool: 기록 여부
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    key_type = await pipe.type(key)
+                    if key_type != "hash":
+                        await pipe.unwatch()
+                        if key_type != "string":
+                            return False
+                        await self._migrate_legacy(key)
+                        continue
+                    pipe.multi()
+                    queue(pipe)
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+
+    async def update_fields(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        지정한 필드만 원자적으로 갱신합니다 (존재하지 않는 작업은 무시).
+
+        Returns:
+            bool: 갱신 여부
+        """
+        if not fields:
+            return False
+        now = time.time()
+        fields = {**fields, "updated_at": now}
+
+        def queue(pipe) -> None:
+            key = self._key(task_id)
+            pipe.hset(key, mapping=self._encode(fields))
+            pipe.hincrby(key, self.REVISION_FIELD, 1)
+            pipe.expire(key, self.ttl)
+            self._index(pipe, task_id, fields, now)
+            # 변경된 필드를 같은 트랜잭션에서 발행하여 상태 반영 순서와 일치시킴
+            pipe.publish(self._channel(task_id), json.dumps(fields))
+
+        return await self._write_existing(self._key(task_id), queue)
+
+    async def add_artifact(self, task_id: str, name: str, path: str) -> bool:
+        """
+        산출물을 작업 manifest에 등록합니다 (같은 이름이면 덮어씀, 상태 변경 이벤트는 발행하지 않음).
+
+        Returns:
+            bool: 등록 여부
+        """
+        def queue(pipe) -> None:
+            key = self._key(task_id)
+            pipe.hset(key, f"{self.ARTIFACT_PREFIX}{name}", json.dumps(path))
+            pipe.hincrby(key, self.REVISION_FIELD, 1)
+
+        return await self._write_existing(self._key(task_id), queue)
+
+    async def watch_task(self, task_id: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        작업 상태 변화를 구독합니다.
+
+        현재 상태를 먼저 전달한 뒤 변경될 때마다 전체 상태를 전달하고, 완료/실패 시 종료합니다.
+        heartbeat초 동안 변경이 없으면 연결 유지를 위해 None을 전달합니다.
+        """
+        channel = self._channel(task_id)
+        # 구독 후 현재 상태를 읽어야 그 사이의 변경을 놓치지 않음
+        queue = await self.events.subscribe(channel)
+        try:
+            state = await self.get_task_status(task_id)
+            if state is None:
+                return
+            yield state
+            while state.get("status") not in self.TERMINAL_STATUSES:
+                try:
+                    fields = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                state.update(fields)
+                yield state
+        finally:
+            await self.events.unsubscribe(channel, queue)
 
     async def update_task_status(
         self,
@@ -60,31 +447,30 @@ class TaskManager:
         merged_result: Optional[str] = None
     ) -> None:
         """작업 상태를 업데이트합니다."""
-        task_data = await self.get_task_status(task_id)
-        if task_data:
-            if status:
-                task_data["status"] = status
-            if stage:
-                task_data["stage"] = stage
-            if progress is not None:
-                task_data["progress"] = progress
-            if result:
-                task_data["result"] = result
-            if error:
-                task_data["error"] = error
-            if diarization_result:
-                task_data["diarization_result"] = diarization_result
-            if merged_result:
-                task_data["merged_result"] = merged_result
-            
-            self.redis.set(f"task:{task_id}", json.dumps(task_data))
-
-    async def complete_task(self, task_id: str, result: str) -> None:
-        """작업을 완료 상태로 표시합니다."""
+        fields = {}
+        if status:
+            fields["status"] = status
+        if stage:
+            fields["stage"] = stage
+        if progress is not None:
+            fields["progress"] = progress
+        if result:
+            fields["result"] = result
+        if error:
+            fields["error"] = error
+        if diarization_result:
+            fields["diarization_result"] = diarization_result
+        if merged_result:
+            fields["merged_result"] = merged_result
+        await self.update_fields(task_id, fields)
+
+    async def complete_task(self, task_id: str, result: str,
+                            stage: ProcessingStage = ProcessingStage.MUX) -> None:
+        """작업을 완료 상태로 표시합니다. (stage: 파이프라인이 마지막으로 끝낸 단계)"""
         await self.update_task_status(
             task_id,
             status=TaskStatus.COMPLETED,
-            stage=ProcessingStage.TTS,
+            stage=stage,
             progress=100,
             result=result
         )
@@ -99,17 +485,15 @@ class TaskManager:
 
     async def update_diarization_result(self, task_id: str, diarization_result: str) -> None:
         """화자 분리 결과를 업데이트합니다."""
-        task_data = await self.get_task_status(task_id)
-        if task_data:
-            task_data["diarization_result"] = diarization_result
-            self.redis.set(f"task:{task_id}", json.dumps(task_data))
+        await self.update_fields(task_id, {"diarization_result": diarization_result})
 
     async def update_merged_result(self, task_id: str, merged_result: str) -> None:
         """병합된 결과를 업데이트합니다."""
-        task_data = await self.get_task_status(task_id)
-        if task_data:
-            task_data["merged_result"] = merged_result
-            self.redis.set(f"task:{task_id}", json.dumps(task_data))
+        await self.update_fields(task_id, {"merged_result": merged_result})
+
+    async def update_playlist(self, task_id: str, playlist: str) -> None:
+        """점진적으로 게시되는 HLS 플레이리스트 경로를 업데이트합니다."""
+        await self.update_fields(task_id, {"playlist": playlist})
 
 # 전역 TaskManager 인스턴스 생성
 task_manager = TaskManager() 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+def time_stretch(samples: np.ndarray,
+                 target_length: int,
+                 sample_rate: int,
+                 frame_ms: float = 40.0,
+                 tolerance_ms: float = 10.0) -> np.ndarray:
+    """
+    WSOLA(Waveform Similarity Overlap-Add)로 피치를 유지하며 길이를 target_length 샘플로 변경
+
+    Args:
+        samples (np.ndarray): (frames,) 또는 (frames, channels) 형태의 PCM
+        target_length (int): 결과 프레임 수
+        sample_rate (int): 샘플레이트
+        frame_ms (float): 분석 프레임 길이 (ms)
+        tolerance_ms (float): 파형 유사도 탐색 범위 (ms)
+
+    Returns:
+        np.ndarray: 입력과 같은 dtype과 채널 구성을 가진 정확히 target_length 길이의 PCM
+    """
+    target_length = max(0, int(target_length))
+    if target_length == len(samples):
+        return samples
+    if target_length == 0 or len(samples) == 0:
+        return np.zeros((target_length,) + samples.shape[1:], dtype=samples.dtype)
+
+    x = samples.astype(np.float32).reshape(len(samples), -1)
+    channels = x.shape[1]
+
+    frame_length = max(4, int(sample_rate * frame_ms / 1000) // 2 * 2)
+    synthesis_hop = frame_length // 2
+    tolerance = max(1, int(sample_rate * tolerance_ms / 1000))
+    stride = max(1, sample_rate // 8000)
+    analysis_hop = len(x) / target_length * synthesis_hop
+    num_frames = math.ceil(target_length / synthesis_hop) + 1
+
+    # 탐색 범위와 마지막 프레임이 입력을 벗어나지 않도록 양쪽을 0으로 채움
+    needed = int(num_frames * analysis_hop) + synthesis_hop + 2 * frame_length + 2 * tolerance
+    padded = np.pad(x, ((tolerance, max(0, needed - len(x))), (0, 0)))
+    # (위치, 채널, 프레임) 형태의 복사 없는 프레임 뷰와 유사도 계산용 모노 프레임 뷰
+    frames = sliding_window_view(padded, frame_length, axis=0)
+    mono_frames = sliding_window_view(padded.mean(axis=1), frame_length)
+
+    window = np.hanning(frame_length).astype(np.float32)
+    output = np.zeros((num_frames * synthesis_hop + frame_length, channels), dtype=np.float32)
+    weights = np.zeros(num_frames * synthesis_hop + frame_length, dtype=np.float32)
+
+    previous = tolerance
+    for k in range(num_frames):
+        nominal = tolerance + int(round(k * analysis_hop))
+        if k == 0:
+            position = nominal
+        else:
+            # 이전 프레임의 자연스러운 연속 구간과 가장 유사한 위치를 탐색 범위 안에서 선택
+            # (간격 stride로 전체 범위를 탐색한 뒤 주변만 샘플 단위로 정밀 탐색)
+            template = mono_frames[previous + synthesis_hop]
+            lo = nominal - tolerance
+            coarse = mono_frames[lo:nominal + tolerance + 1:stride, ::stride] @ template[::stride]
+            lo = max(0, lo + int(np.argmax(coarse)) * stride - stride)
+            fine = mono_frames[lo:lo + 2 * stride + 1] @ template
+            position = lo + int(np.argmax(fine))
+
+        start = k * synthesis_hop
+        output[start:start + frame_length] += (frames[position] * window).T
+        weights[start:start + frame_length] += window
+        previous = position
+
+    output = output[:target_length] / np.maximum(weights[:target_length], 1e-3)[:, None]
+
+    if np.issubdtype(samples.dtype, np.integer):
+        info = np.iinfo(samples.dtype)
+        output = np.clip(np.round(output), info.min, info.max)
+    return output.astype(samples.dtype).reshape((target_length,) + samples.shape[1:])
+
+def stretch_to_duration(samples: np.ndarray, sample_rate: int, target_duration: float) -> np.ndarray:
+    """목표 길이(초)에 맞게 피치를 유지하며 PCM 길이 변경"""
+    return time_stretch(samples, int(round(target_duration * sample_rate)), sample_rate)
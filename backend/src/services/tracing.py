@@ -0,0 +1,305 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import contextvars
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, Awaitable, AsyncIterator, Callable
+from . import config
+from .task_manager import task_manager
+from .metrics import metrics
+
+class Span:
+    """
+    추적 구간 하나 (단계 또는 외부 호출)
+
+    start는 epoch 초, duration은 초 단위이며 bytes는 주고받은 데이터 크기, retries는 재시도 횟수입니다.
+    stage는 구간이 속한 단계 이름(`stage.<이름>` 구간 아래, 없으면 최상위 구간 이름)입니다.
+    """
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start", "started", "duration",
+                 "bytes", "retries", "status", "error", "attributes", "stage", "token")
+
+    def __init__(self, trace: "TaskTrace", name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.bytes = attributes.pop("bytes", 0) or 0
+        self.retries = 0
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.attributes = attributes
+        if name.startswith("stage."):
+            self.stage = name[len("stage."):]
+        else:
+            self.stage = parent.stage if parent else name
+        self.token = None
+
+    def set(self, **attributes: Any) -> None:
+        """속성 추가 (bytes는 누적)"""
+        self.bytes += attributes.pop("bytes", 0) or 0
+        self.attributes.update(attributes)
+
+    def retry(self) -> None:
+        self.retries += 1
+
+    def fail(self, message: str) -> None:
+        """예외 없이 실패를 반환하는 호출을 오류로 표시"""
+        self.status = "error"
+        self.error = message[:500]
+
+    def __enter__(self) -> "Span":
+        self.token = _current_span.set(self)
+        metrics.span_started(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self.started
+        if exc is not None and not isinstance(exc, asyncio.CancelledError):
+            self.status = "error"
+            self.error = str(exc)[:500]
+        _current_span.reset(self.token)
+        metrics.span_finished(self)
+        self.trace.finish(self)
+        if self.trace.on_stage_end is not None and self.name.startswith("stage."):
+            self.trace.on_stage_end(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+class NullSpan:
+    """추적 중이 아닐 때 사용하는 빈 구간 (기록하지 않음)"""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def retry(self) -> None:
+        pass
+
+    def fail(self, message: str) -> None:
+        pass
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+NULL_SPAN = NullSpan()
+
+class TaskTrace:
+    """작업 하나의 추적 (끝난 구간을 모았다가 flush 시 Redis에 추가, store가 False면 지표만 기록)"""
+
+    def __init__(self, task_id: str, max_spans: int, store: bool = True):
+        self.task_id = task_id
+        self.store = store
+        self.trace_id = task_id.replace("-", "")[:32].ljust(32, "0")
+        self.max_spans = max_spans
+        self.pending: List[Dict[str, Any]] = []
+        self.recorded = 0
+        self.dropped = 0
+        self.users = 0
+        # 단계 구간이 끝날 때 호출 (작업 프로파일링 중에만 설정)
+        self.on_stage_end: Optional[Callable[[Span], None]] = None
+
+    def finish(self, span: Span) -> None:
+        if not self.store:
+            return
+        # 스레드에서 끝난 구간도 list.append로 안전하게 추가
+        if self.recorded >= self.max_spans:
+            self.dropped += 1
+            return
+        self.recorded += 1
+        self.pending.append(span.to_dict())
+
+_current_trace: contextvars.ContextVar[Optional[TaskTrace]] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+class Tracer:
+    """
+    작업 단위 구간 추적기
+
+    `async with tracer.trace(task_id, "pipeline")`으로 연 추적 안에서 `with tracer.span(name)`으로
+    구간을 기록합니다. 현재 추적과 부모 구간은 contextvars로 전달되므로 asyncio 태스크와
+    asyncio.to_thread 안의 구간도 같은 작업의 하위 구간이 됩니다. 추적 밖에서는 아무것도 기록하지 않습니다.
+
+    끝난 구간은 추적을 닫을 때 `task-trace:<id>` 리스트에 추가되고(작업 키와 같은 TTL),
+    OTLP_ENDPOINT가 설정되어 있으면 OTLP/HTTP JSON 형식으로 수집기에 전송됩니다.
+    끝난 구간은 운영 지표(metrics)에도 반영되므로, 추적을 꺼도 지표가 켜져 있으면 구간은 만들되 저장하지 않습니다.
+    """
+
+    def __init__(self):
+        self.enabled = config.TRACING_ENABLED
+        self.max_spans = config.TRACE_MAX_SPANS
+        self.endpoint = config.OTLP_ENDPOINT
+        self.service_name = config.OTLP_SERVICE_NAME
+        self.active: Dict[str, TaskTrace] = {}
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task-trace:{task_id}"
+
+    @asynccontextmanager
+    async def trace(self, task_id: str, name: str, **attributes: Any) -> AsyncIterator[Span]:
+        """작업 추적을 열고 최상위 구간 생성 (닫을 때 구간을 저장하고 내보냄)"""
+        if not self.enabled and not metrics.enabled:
+            yield NULL_SPAN
+            return
+        trace = self.active.get(task_id)
+        if trace is None:
+            trace = self.active[task_id] = TaskTrace(task_id, self.max_spans, store=self.enabled)
+        trace.users += 1
+        token = _current_trace.set(trace)
+        try:
+            with Span(trace, name, None, attributes) as root:
+                yield root
+                if trace.dropped:
+                    root.set(dropped_spans=trace.dropped)
+        finally:
+            _current_trace.reset(token)
+            trace.users -= 1
+            if trace.users == 0:
+                self.active.pop(task_id, None)
+            await self.flush(trace)
+
+    def span(self, name: str, **attributes: Any):
+        """현재 추적 아래에 구간 생성 (추적 중이 아니면 NullSpan)"""
+        trace = _current_trace.get()
+        if trace is None:
+            return NULL_SPAN
+        parent = _current_span.get()
+        return Span(trace, name, parent, attributes)
+
+    def current_span(self):
+        return _current_span.get() or NULL_SPAN
+
+    async def traced(self, name: str, awaitable: Awaitable, **attributes: Any) -> Any:
+        """코루틴 전체를 구간으로 감싸 실행 (asyncio.create_task에 넘길 때 사용)"""
+        with self.span(name, **attributes):
+            return await awaitable
+
+    async def flush(self, trace: TaskTrace) -> None:
+        """대기 중인 구간을 Redis에 추가하고 수집기로 전송"""
+        spans, trace.pending = trace.pending, []
+        if not spans:
+            return
+        try:
+            async with task_manager.redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(self._key(trace.task_id), *(json.dumps(span, ensure_ascii=False) for span in spans))
+                pipe.expire(self._key(trace.task_id), task_manager.ttl)
+                await pipe.execute()
+        except Exception as e:
+            print(f"추적 구간 저장 실패: {str(e)}")
+        if self.endpoint:
+            await self.export(trace.task_id, spans)
+
+    async def get_spans(self, task_id: str) -> List[Dict[str, Any]]:
+        """저장된 구간과 이 프로세스에서 아직 저장되지 않은 구간 (시작 시각 순)"""
+        stored = await task_manager.redis.lrange(self._key(task_id), 0, -1)
+        spans = [json.loads(span) for span in stored]
+        trace = self.active.get(task_id)
+        if trace:
+            spans.extend(trace.pending)
+        return sorted(spans, key=lambda span: span["start"])
+
+    @staticmethod
+    def breakdown(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """구간 이름별 횟수, 누적 시간, 최대 시간, 바이트, 재시도, 오류 수"""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            entry = summary.setdefault(span["name"], {
+                "count": 0, "total": 0.0, "max": 0.0, "bytes": 0, "retries": 0, "errors": 0
+            })
+            duration = span.get("duration") or 0.0
+            entry["count"] += 1
+            entry["total"] += duration
+            entry["max"] = max(entry["max"], duration)
+            entry["bytes"] += span.get("bytes", 0)
+            entry["retries"] += span.get("retries", 0)
+            entry["errors"] += span.get("status") == "error"
+        return summary
+
+    @staticmethod
+    def _otlp_value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def to_otlp(self, task_id: str, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """OTLP/HTTP JSON(ExportTraceServiceRequest) 형식으로 변환"""
+        trace_id = task_id.replace("-", "")[:32].ljust(32, "0")
+        otlp_spans = []
+        for span in spans:
+            start_ns = int(span["start"] * 1e9)
+            attributes = {**span.get("attributes", {}), "task.id": task_id,
+                          "bytes": span.get("bytes", 0), "retries": span.get("retries", 0)}
+            otlp_span = {
+                "traceId": trace_id,
+                "spanId": span["span_id"],
+                "name": span["name"],
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(start_ns + int((span.get("duration") or 0.0) * 1e9)),
+                "attributes": [{"key": key, "value": self._otlp_value(value)} for key, value in attributes.items()],
+                "status": {"code": 2, "message": span.get("error", "")} if span.get("status") == "error" else {"code": 1},
+            }
+            if span.get("parent_id"):
+                otlp_span["parentSpanId"] = span["parent_id"]
+            otlp_spans.append(otlp_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "onevoice.tracing"}, "spans": otlp_spans}],
+            }]
+        }
+
+    async def export(self, task_id: str, spans: List[Dict[str, Any]]) -> bool:
+        """OTLP/HTTP 수집기(예: http://localhost:4318/v1/traces)로 구간 전송"""
+        import requests
+        try:
+            response = await asyncio.to_thread(
+                requests.post,
+                self.endpoint,
+                json=self.to_otlp(task_id, spans),
+                headers={"Content-Type": "application/json"},
+                timeout=5
+            )
+            if response.status_code >= 300:
+                print(f"추적 내보내기 실패: {response.status_code} - {response.text[:200]}")
+                return False
+            return True
+        except Exception as e:
+            print(f"추적 내보내기 오류: {str(e)}")
+            return False
+
+def file_size(path: Optional[str]) -> int:
+    """구간 bytes 기록용 파일 크기 (없으면 0)"""
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+# 서비스 인스턴스 생성
+tracer = Tracer()
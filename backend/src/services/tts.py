@@ -1,22 +1,61 @@
 import os
-import logging
-from google.cloud import texttospeech, storage
+import time
+import json
+import asyncio
+import hashlib
+import inspect
+from xml.sax.saxutils import escape
+from google.cloud import texttospeech, texttospeech_v1beta1
 from pathlib import Path
-from typing import Optional, List, Tuple, Dict, Any
-from pydub import AudioSegment
-import io
+from typing import Optional, List, Tuple, Dict, Any, Callable, Awaitable, Union
+import numpy as np
 from . import config
+from .clients import clients
+from .audio_mixer import TimelineMixer, decode_linear16
+from .tts_cache import TTSAudioCache
+from .janitor import artifact_janitor
+from .workspace import TaskWorkspace
+from .speaking_rate import SpeakingRateModel
+from .time_stretch import time_stretch
+from .tracing import tracer
+from .metrics import metrics
 
-# pydub 로깅 비활성화 (WARNING 레벨 이상만 표시)
-logging.getLogger("pydub.converter").setLevel(logging.WARNING)
+# 시간순으로 확정된 TTS 오디오(int16 PCM)를 받는 콜백 (awaitable을 반환하면 기다린 뒤 합성을 이어감)
+AudioCallback = Callable[[np.ndarray], Union[None, Awaitable[None]]]
+# 합성 완료 비율(0~1)을 받는 콜백
+ProgressCallback = Callable[[float], None]
+
+async def emit_audio(callback: AudioCallback, samples: np.ndarray) -> None:
+    """오디오 콜백 호출 (소비자가 밀려 있으면 awaitable을 기다려 합성 속도를 맞춤)"""
+    result = callback(samples)
+    if inspect.isawaitable(result):
+        await result
+
+class VoiceRateLimiter:
+    """음성별 초당 요청 수 제한"""
+
+    def __init__(self, max_rps: float):
+        self.min_interval = 1.0 / max_rps if max_rps > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """다음 요청이 허용될 때까지 대기"""
+        if not self.min_interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.min_interval
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 class TTSService:
-    def __init__(self):
-        self.client = config.tts_client
-        self.storage_client = storage.Client()
+    def __init__(self, max_concurrency: Optional[int] = None):
         self.bucket_name = "onevoice-test-bucket"
         self.output_dir = os.path.join(config.TEMP_DIR, "audio")
         self.text_ko_dir = os.path.join(config.TEMP_DIR, "text_ko")
+        self.sample_rate = config.TTS_SAMPLE_RATE
         
         # 화자별 음성 프로필 정의
         self.voice_profiles = {
@@ -27,10 +66,42 @@ class TTSService:
             "04": "ko-KR-Chirp3-HD-Leda",  
         }
         
+        # 동시 요청 제한 (전체 동시 요청 수 및 음성별 요청 속도)
+        self.max_concurrency = max(1, max_concurrency or config.TTS_MAX_CONCURRENCY)
+        self.request_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.voice_limiters: Dict[str, VoiceRateLimiter] = {}
+        
+        # 음성별 SSML <mark> 시점 지원 여부 (첫 일괄 요청으로 한 번만 확인)
+        self.mark_support: Dict[str, bool] = {}
+        self.mark_probe_locks: Dict[str, asyncio.Lock] = {}
+        
+        # 합성 오디오 캐시 (동일한 텍스트/음성/오디오 설정은 RPC 없이 재사용)
+        self.cache = TTSAudioCache() if config.TTS_CACHE_ENABLED else None
+        if self.cache:
+            # 디스크가 부족하면 정리기가 오래 사용하지 않은 캐시 항목부터 삭제
+            artifact_janitor.register_cache(self.cache)
+            metrics.register_cache("tts", self.cache)
+        
+        # 음성별 발화 속도 모델 (목표 길이에 맞는 speaking_rate 예측)
+        self.rate_model = SpeakingRateModel()
+        
         # 필요한 디렉토리 생성
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
         Path(self.text_ko_dir).mkdir(parents=True, exist_ok=True)
 
+    @property
+    def client(self):
+        return clients.tts
+
+    @property
+    def batch_client(self):
+        # SSML mark 시점(timepoint)은 v1beta1 API에서만 제공
+        return clients.tts_batch if config.TTS_SSML_BATCH_ENABLED else None
+
+    @property
+    def storage_client(self):
+        return clients.storage
+
     async def delete_existing_file(self, gcs_uri: str) -> bool:
         """GCS에서 기존 파일 삭제"""
         try:
@@ -48,87 +119,258 @@ class TTSService:
             print(f"파일 삭제 실패: {str(e)}")
             return False
 
-    def generate_silence(self, duration_sec: float) -> AudioSegment:
-        """무음 세그먼트 생성"""
-        return AudioSegment.silent(duration=int(duration_sec * 1000))
-
     def remove_timestamps(self, text: str) -> str:
         """타임스탬프 제거"""
         import re
         return re.sub(r'\[\d+\.\d+s - \d+\.\d+s\]', '', text).strip()
 
-    async def synthesize_segment(self, text: str, target_duration: float, voice_profile: str = None) -> Optional[AudioSegment]:
-        """텍스트 세그먼트를 음성으로 변환하고 목표 기간에 맞게 속도 조절"""
+    async def _call_tts(self, voice_name: str, rpc, **kwargs):
+        """동시 요청 수와 음성별 속도 제한을 지키며 TTS RPC 호출"""
+        # 속도 제한 대기는 전체 동시 요청 슬롯을 잡기 전에 하여 다른 음성의 요청을 막지 않음
+        limiter = self.voice_limiters.setdefault(voice_name, VoiceRateLimiter(config.TTS_VOICE_MAX_RPS))
+        await limiter.wait()
+        async with self.request_semaphore:
+            # 블로킹 RPC는 스레드에서 실행하여 이벤트 루프를 막지 않음
+            with tracer.span("tts.synthesize_speech", voice=voice_name) as span:
+                response = await asyncio.to_thread(rpc, **kwargs)
+                span.set(bytes=len(response.audio_content))
+                return response
+
+    async def _synthesize_pcm(self, text: str, input_text, voice, audio_config) -> np.ndarray:
+        """캐시를 먼저 조회하고, 없으면 TTS API를 호출하여 int16 PCM 반환"""
+        cache_key = None
+        if self.cache:
+            cache_key = TTSAudioCache.make_key(text, voice, audio_config)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return np.frombuffer(cached, dtype=np.int16)
+        
+        # 음성 합성 (한 번만 TTS API 호출)
+        response = await self._call_tts(
+            voice.name,
+            self.client.synthesize_speech,
+            input=input_text,
+            voice=voice,
+            audio_config=audio_config
+        )
+        
+        # 생성된 LINEAR16 오디오를 복사 없이 int16 배열로 변환
+        samples, _, _ = decode_linear16(response.audio_content)
+        
+        # 실제 합성 길이로 음성별 발화 속도 모델 갱신
+        self.rate_model.observe(voice.name, text, len(samples) / self.sample_rate, audio_config.speaking_rate or 1.0)
+        
+        if self.cache:
+            await asyncio.to_thread(self.cache.put, cache_key, samples.tobytes())
+        return samples
+
+    def _voice(self, voice_profile: str = None) -> texttospeech.VoiceSelectionParams:
+        """음성 프로필이 지정된 경우 해당 프로필 사용, 그렇지 않으면 기본 설정 사용"""
+        if voice_profile:
+            return texttospeech.VoiceSelectionParams(
+                language_code="ko-KR",
+                name=voice_profile
+            )
+        return config.VOICE_CONFIG
+
+    def _audio_config(self, speaking_rate: float) -> texttospeech.AudioConfig:
+        """믹싱을 위해 샘플레이트를 고정한 LINEAR16 오디오 설정"""
+        return texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+            sample_rate_hertz=self.sample_rate,
+            speaking_rate=speaking_rate
+        )
+
+    async def synthesize_segment(self, text: str, target_duration: float, voice_profile: str = None) -> Optional[np.ndarray]:
+        """
+        텍스트 세그먼트를 목표 길이에 맞는 speaking_rate로 음성 변환
+        
+        음성별 발화 속도 모델로 자연 발화 길이를 예측해 speaking_rate를 먼저 요청하고,
+        남은 오차만 로컬 속도 조절로 보정합니다.
+        
+        Returns:
+            Optional[np.ndarray]: sample_rate 기준 int16 모노 PCM (목표 길이를 넘지 않음)
+        """
         try:
             input_text = texttospeech.SynthesisInput(text=text)
             
-            # 음성 프로필이 지정된 경우 해당 프로필 사용, 그렇지 않으면 기본 설정 사용
-            if voice_profile:
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code="ko-KR",
-                    name=voice_profile
-                )
-            else:
-                voice = config.VOICE_CONFIG
-            
-            # 기본 음성 설정 사용 (속도 조절 없음)
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.LINEAR16
-            )
-            
-            # 음성 합성 (한 번만 TTS API 호출)
-            response = self.client.synthesize_speech(
-                input=input_text,
-                voice=voice,
-                audio_config=audio_config
-            )
-            
-            # 생성된 오디오를 AudioSegment으로 변환
-            segment = AudioSegment.from_wav(io.BytesIO(response.audio_content))
-            
-            # 현재 세그먼트 길이 계산
-            current_duration = len(segment) / 1000  # 밀리초 -> 초
-            
-            # 목표 길이와 비교하여 속도 계산
-            epsilon = 1e-6  # 부동소수점 오차 보정용
+            voice = self._voice(voice_profile)
             
-            if abs(current_duration - target_duration) > epsilon:
-                if current_duration > target_duration:
-                    # 생성된 오디오가 타깃보다 길면 속도를 빠르게 조절 (pydub speedup 사용)
-                    speed_factor = current_duration / target_duration
-                    if speed_factor > 1.0:
-                        try:
-                            segment = segment.speedup(playback_speed=speed_factor)
-                            print(f"오디오 속도 조절: x{speed_factor:.2f}")
-                        except Exception as e:
-                            print(f"오디오 속도 조절 실패: {str(e)}")
-                else:
-                    # 생성된 오디오가 타깃보다 짧으면 그대로 유지하고 필요시 무음 추가
-                    pass
+            # 예측한 발화 길이로 speaking_rate 결정 후 합성
+            speaking_rate = self.rate_model.choose_speaking_rate(voice.name, text, target_duration)
+            samples = await self._synthesize_pcm(text, input_text, voice, self._audio_config(speaking_rate))
+            target_frames = int(target_duration * self.sample_rate)
             
-            # 최종 길이 확인 및 조정 (필요시)
-            final_duration = len(segment) / 1000
-            if final_duration < target_duration - epsilon:
-                # 여전히 짧다면 무음 추가
-                silence = self.generate_silence(target_duration - final_duration)
-                segment += silence
-            elif final_duration > target_duration + epsilon:
-                # 여전히 길다면 잘라내기
-                segment = segment[:int(target_duration * 1000)]
+            # 예측이 크게 빗나간 경우 보정된 speaking_rate로 한 번 더 합성
+            if target_frames > 0 and len(samples) / target_frames > config.TTS_MAX_LOCAL_STRETCH:
+                corrected_rate = self.rate_model.quantize(speaking_rate * len(samples) / target_frames)
+                if corrected_rate > speaking_rate:
+                    speaking_rate = corrected_rate
+                    tracer.current_span().retry()
+                    samples = await self._synthesize_pcm(text, input_text, voice, self._audio_config(speaking_rate))
             
-            return segment
+            return await self._fit_to_slot(samples, target_frames, speaking_rate)
             
         except Exception as e:
             print(f"음성 합성 실패: {str(e)}")
             return None
 
-    async def process_tsv_segments(self, tsv_path: str, task_id: str) -> Optional[str]:
-        """TSV 파일의 세그먼트를 처리하여 음성으로 변환"""
+    async def _fit_to_slot(self, samples: np.ndarray, target_frames: int, speaking_rate: float) -> np.ndarray:
+        """목표 길이보다 긴 오디오를 로컬 시간 축 조절로 맞춤"""
+        if len(samples) > target_frames > 0:
+            # 남은 오차만 피치를 유지하는 로컬 시간 축 조절(WSOLA)로 보정
+            speed_factor = len(samples) / target_frames
+            samples = await asyncio.to_thread(time_stretch, samples, target_frames, self.sample_rate)
+            print(f"오디오 속도 조절: x{speed_factor:.2f} (speaking_rate {speaking_rate:.2f})")
+        
+        # 짧은 경우의 무음은 믹서 버퍼가 채움
+        return samples[:target_frames]
+
+    def _group_for_batch(self, segments: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """같은 화자의 연속 세그먼트를 SSML 요청 단위로 묶음"""
+        if not config.TTS_SSML_BATCH_ENABLED:
+            return [[segment] for segment in segments]
+        
+        groups = []
+        current = []
+        current_bytes = 0
+        for segment in segments:
+            # mark 태그와 이스케이프를 포함한 SSML 크기 (API 제한은 바이트 기준)
+            segment_bytes = len(escape(segment["text"]).encode("utf-8")) + 24
+            if current and (
+                segment["speaker"] != current[-1]["speaker"]
+                or len(current) >= config.TTS_SSML_BATCH_MAX_SEGMENTS
+                or current_bytes + segment_bytes > config.TTS_SSML_BATCH_MAX_BYTES
+            ):
+                groups.append(current)
+                current = []
+                current_bytes = 0
+            current.append(segment)
+            current_bytes += segment_bytes
+        if current:
+            groups.append(current)
+        return groups
+
+    def _build_ssml(self, texts: List[str]) -> str:
+        """세그먼트 시작마다 <mark>를 넣은 SSML 생성"""
+        body = "".join(f'<mark name="s{i}"/>{escape(text)} ' for i, text in enumerate(texts))
+        return f'<speak>{body}<mark name="end"/></speak>'
+
+    async def _synthesize_marked_pcm(self, text: str, ssml: str, voice, audio_config, count: int) -> Optional[List[np.ndarray]]:
+        """
+        SSML을 한 번에 합성하고 mark 시점으로 세그먼트별 PCM 분할 (mark가 없으면 None)
+
+        응답에 mark 시점이 없으면 해당 음성을 미지원으로 기록하여 이후 일괄 요청을 보내지 않습니다.
+        """
+        cache_key = marks_key = None
+        samples = offsets = None
+        if self.cache:
+            cache_key = TTSAudioCache.make_key(ssml, voice, audio_config)
+            marks_key = hashlib.sha256(f"{cache_key}:marks".encode("utf-8")).hexdigest()
+            cached_marks = await asyncio.to_thread(self.cache.get, marks_key)
+            cached = await asyncio.to_thread(self.cache.get, cache_key) if cached_marks is not None else None
+            if cached is not None:
+                samples = np.frombuffer(cached, dtype=np.int16)
+                offsets = json.loads(cached_marks)
+                self.mark_support[voice.name] = True
+        
+        if samples is None:
+            request = texttospeech_v1beta1.SynthesizeSpeechRequest(
+                input=texttospeech_v1beta1.SynthesisInput(ssml=ssml),
+                voice=texttospeech_v1beta1.VoiceSelectionParams(
+                    language_code=voice.language_code,
+                    name=voice.name
+                ),
+                audio_config=texttospeech_v1beta1.AudioConfig(
+                    audio_encoding=texttospeech_v1beta1.AudioEncoding.LINEAR16,
+                    sample_rate_hertz=self.sample_rate,
+                    speaking_rate=audio_config.speaking_rate
+                ),
+                enable_time_pointing=[texttospeech_v1beta1.SynthesizeSpeechRequest.TimepointType.SSML_MARK]
+            )
+            response = await self._call_tts(voice.name, self.batch_client.synthesize_speech, request=request)
+            samples, _, _ = decode_linear16(response.audio_content)
+            
+            marks = {timepoint.mark_name: timepoint.time_seconds for timepoint in response.timepoints}
+            names = [f"s{i}" for i in range(count)]
+            if any(name not in marks for name in names):
+                print(f"SSML mark 시점이 응답에 없어 이 음성은 세그먼트별로 합성합니다 ({voice.name}): {sorted(marks)}")
+                self.mark_support[voice.name] = False
+                return None
+            self.mark_support[voice.name] = True
+            offsets = [marks[name] for name in names] + [marks.get("end", len(samples) / self.sample_rate)]
+            
+            # 묶음 전체의 실제 합성 길이로 음성별 발화 속도 모델 갱신
+            self.rate_model.observe(voice.name, text, len(samples) / self.sample_rate, audio_config.speaking_rate or 1.0)
+            
+            if self.cache:
+                await asyncio.to_thread(self.cache.put, cache_key, samples.tobytes())
+                await asyncio.to_thread(self.cache.put, marks_key, json.dumps(offsets).encode("utf-8"))
+        
+        frames = [min(len(samples), int(round(offset * self.sample_rate))) for offset in offsets]
+        return [samples[frames[i]:frames[i + 1]] for i in range(count)]
+
+    async def synthesize_batch(self, segments: List[Dict[str, Any]], voice_profile: str = None) -> List[Optional[np.ndarray]]:
+        """
+        같은 화자의 연속 세그먼트를 하나의 SSML 요청으로 합성한 뒤 mark 시점으로 분할하여 각 슬롯에 맞춤
+        
+        mark 시점을 받을 수 없거나 분할된 오디오가 슬롯보다 크게 긴 세그먼트는 개별 합성으로 대체합니다.
+        """
+        durations = [segment["end"] - segment["start"] for segment in segments]
+        if len(segments) == 1:
+            return [await self.synthesize_segment(segments[0]["text"], durations[0], voice_profile)]
+        
+        pieces = None
+        speaking_rate = 1.0
+        voice = self._voice(voice_profile)
+        if self.mark_support.get(voice.name) is not False:
+            try:
+                texts = [segment["text"] for segment in segments]
+                text = " ".join(texts)
+                speaking_rate = self.rate_model.choose_speaking_rate(voice.name, text, sum(durations))
+                ssml = self._build_ssml(texts)
+                audio_config = self._audio_config(speaking_rate)
+                if voice.name in self.mark_support:
+                    pieces = await self._synthesize_marked_pcm(text, ssml, voice, audio_config, len(texts))
+                else:
+                    # 지원 여부를 모르는 음성은 첫 요청만 보내고 나머지 묶음은 결과를 기다림
+                    async with self.mark_probe_locks.setdefault(voice.name, asyncio.Lock()):
+                        if self.mark_support.get(voice.name) is not False:
+                            pieces = await self._synthesize_marked_pcm(text, ssml, voice, audio_config, len(texts))
+            except Exception as e:
+                print(f"SSML 일괄 합성 실패: {str(e)}")
+        
+        if pieces is None:
+            print(f"세그먼트별 합성으로 대체: {len(segments)}개")
+            pieces = [None] * len(segments)
+        
+        return await asyncio.gather(*(
+            self._fit_batch_piece(segment, duration, piece, speaking_rate, voice_profile)
+            for segment, duration, piece in zip(segments, durations, pieces)
+        ))
+
+    async def _fit_batch_piece(self, segment: Dict[str, Any], duration: float, piece: Optional[np.ndarray],
+                               speaking_rate: float, voice_profile: str = None) -> Optional[np.ndarray]:
+        """분할된 오디오를 슬롯에 맞추고, 로컬 보정 범위를 넘으면 개별 합성"""
+        target_frames = int(duration * self.sample_rate)
+        if piece is None or (target_frames > 0 and len(piece) / target_frames > config.TTS_MAX_LOCAL_STRETCH):
+            return await self.synthesize_segment(segment["text"], duration, voice_profile)
+        return await self._fit_to_slot(piece, target_frames, speaking_rate)
+
+    async def _synthesize_group_at(self, group: List[Dict[str, Any]], voice_profile: str = None) -> List[Tuple[float, Optional[np.ndarray]]]:
+        """세그먼트 묶음을 합성하고 타임라인상의 시작 위치와 함께 반환"""
+        results = await self.synthesize_batch(group, voice_profile)
+        return [(segment["start"], audio) for segment, audio in zip(group, results)]
+
+    async def process_tsv_segments(self, tsv_path: str, task_id: str,
+                                   audio_callback: Optional[AudioCallback] = None,
+                                   progress_callback: Optional[ProgressCallback] = None,
+                                   output_dir: Optional[str] = None) -> Optional[str]:
+        """TSV 파일의 세그먼트를 처리하여 음성으로 변환 (output_dir이 없으면 공용 audio 디렉토리에 저장)"""
         try:
             tsv_filename = os.path.basename(tsv_path)  # tsv 파일명 추출
             output_filename = os.path.splitext(tsv_filename)[0] + "_ko.wav"  # 확장자 제거 후 _ko.wav 추가
-            output_path = os.path.join(self.output_dir, output_filename)  # 최종 경로 생성
-            final_audio = AudioSegment.empty()
+            output_path = os.path.join(output_dir or self.output_dir, output_filename)  # 최종 경로 생성
             epsilon = 1e-6  # 부동소수점 오차 보정용
             
             # 파일 직접 읽기 방식으로 변경
@@ -142,10 +384,9 @@ class TTSService:
                 if len(lines) > 0 and lines[0].strip().startswith('start'):  # 헤더가 있는 경우
                     lines = lines[1:]  # 헤더 제외
                 
-                total_lines = len(lines)
-                previous_end_time = 0.0  # 이전 세그먼트의 종료 시간 초기화
-                
-                for i, line in enumerate(lines, start=1):
+                # 세그먼트 파싱 후 음성 합성을 동시에 시작
+                segments = []
+                for line in lines:
                     parts = line.strip().split('\t')
                     if len(parts) < 3:
                         parts.extend([''] * (3 - len(parts)))
@@ -154,38 +395,55 @@ class TTSService:
                         start = float(parts[0])
                         end = float(parts[1])
                         text = parts[2].strip()
-                        
+                    except ValueError as ve:
+                        print(f"잘못된 타임스탬프 형식: {line.strip()} - {str(ve)}")
+                        continue
+                    
+                    duration = end - start
+                    # 텍스트가 있는 경우 target_duration으로 음성 합성 및 속도 조절 (동시 실행)
+                    task = asyncio.create_task(self.synthesize_segment(text, duration)) if text else None
+                    segments.append((start, end, duration, task))
+                
+                total_tasks = max(1, sum(1 for segment in segments if segment[3]))
+                completed = 0
+                previous_end_time = 0.0  # 이전 세그먼트의 종료 시간 초기화
+                cursor = 0.0  # 이어 붙인 오디오의 현재 길이 (초)
+                placements = []
+                
+                # 합성 결과를 원래 순서대로 타임라인에 배치
+                for start, end, duration, task in segments:
+                    try:
                         # 이전 세그먼트와 현재 세그먼트 사이의 빈 시간 처리 (부동소수점 오차 보정)
                         time_gap = start - previous_end_time
                         if time_gap > epsilon:  # 0보다 큰 경우에만 처리
-                            silence_duration = time_gap
-                            silence = self.generate_silence(silence_duration)
-                            final_audio += silence
-                        
-                        # 현재 세그먼트 처리
-                        duration = end - start
+                            cursor += time_gap
                         
-                        if text:  # 텍스트가 있는 경우
-                            # 직접 target_duration으로 음성 합성 및 속도 조절
-                            segment = await self.synthesize_segment(text, duration)
+                        if task:  # 텍스트가 있는 경우
+                            segment = await task
+                            completed += 1
+                            if progress_callback:
+                                progress_callback(completed / total_tasks)
                             if segment is None:
                                 continue
-                        else:  # 텍스트 없는 경우 무음
-                            segment = self.generate_silence(duration)
+                            placements.append((cursor, segment))
+                        # 텍스트 없는 경우 무음 (버퍼가 이미 0으로 채워져 있음)
                         
-                        final_audio += segment
+                        cursor += max(duration, 0.0)
                         previous_end_time = end  # 이전 세그먼트의 종료 시간 업데이트
                     
-                    except ValueError as ve:
-                        print(f"잘못된 타임스탬프 형식: {line.strip()} - {str(ve)}")
-                        continue
                     except Exception as e:
                         print(f"세그먼트 처리 중 오류 발생: {str(e)}")
                         continue
             
+            # 전체 길이만큼 버퍼를 한 번 할당하고 세그먼트를 제자리에서 합성
+            mixer = TimelineMixer(cursor, self.sample_rate)
+            for position, segment in placements:
+                mixer.add(segment, position)
+            if audio_callback:
+                await emit_audio(audio_callback, mixer.release())
+            
             # 최종 오디오 파일 저장 (WAV 형식)
-            # -loglevel quiet 매개변수를 추가하여 ffmpeg 출력을 비활성화
-            final_audio.export(output_path, format="wav", parameters=["-loglevel", "quiet"])
+            mixer.write_wav(output_path)
             print(f"TTS 처리 완료: {output_path}")
             
             return output_path
@@ -194,12 +452,15 @@ class TTSService:
             print(f"TSV 세그먼트 처리 실패: {str(e)}")
             return None
 
-    async def process_multi_speaker_tsv(self, tsv_path: str, task_id: str) -> Optional[str]:
-        """화자별 음성으로 TSV 파일 처리"""
+    async def process_multi_speaker_tsv(self, tsv_path: str, task_id: str,
+                                        audio_callback: Optional[AudioCallback] = None,
+                                        progress_callback: Optional[ProgressCallback] = None,
+                                        output_dir: Optional[str] = None) -> Optional[str]:
+        """화자별 음성으로 TSV 파일 처리 (output_dir이 없으면 공용 audio 디렉토리에 저장)"""
         try:
             tsv_filename = os.path.basename(tsv_path)  # tsv 파일명 추출
             output_filename = os.path.splitext(tsv_filename)[0] + "_ko.wav"  # 출력 파일명
-            output_path = os.path.join(self.output_dir, output_filename)  # 최종 경로 생성
+            output_path = os.path.join(output_dir or self.output_dir, output_filename)  # 최종 경로 생성
             epsilon = 1e-6  # 부동소수점 오차 보정용
             
             # 파일 읽기
@@ -264,33 +525,50 @@ class TTSService:
                 
                 # 최대 종료 시간 확인하여 전체 오디오 길이 결정
                 max_end_time = max([segment["end"] for segment in all_segments])
-                final_duration = int(max_end_time * 1000)  # 밀리초 단위 변환
-                final_audio = AudioSegment.silent(duration=final_duration)
+                mixer = TimelineMixer(max_end_time, self.sample_rate)
                 
                 # 모든 세그먼트를 시간순으로 정렬
                 all_segments.sort(key=lambda x: x["start"])
                 
-                # 각 세그먼트 처리
-                for segment in all_segments:
-                    start_time = segment["start"]
-                    end_time = segment["end"]
-                    speaker_id = segment["speaker"]
-                    text = segment["text"]
-                    
-                    # 세그먼트 지속 시간
-                    duration = end_time - start_time
-                    
-                    if text and duration > 0:
-                        # 화자에 해당하는 음성으로 합성 및 속도 조절
-                        voice_profile = speaker_to_voice.get(speaker_id)
-                        segment_audio = await self.synthesize_segment(text, duration, voice_profile)
+                # 각 세그먼트(또는 같은 화자의 연속 세그먼트 묶음)를 동시에 합성 (동시 요청 수는 max_concurrency로 제한)
+                synth_segments = [
+                    segment for segment in all_segments
+                    if segment["text"] and segment["end"] - segment["start"] > 0
+                ]
+                groups = self._group_for_batch(synth_segments)
+                tasks = [
+                    asyncio.create_task(self._synthesize_group_at(group, speaker_to_voice.get(group[0]["speaker"])))
+                    for group in groups
+                ]
+                
+                # 완료되는 순서대로 시작 위치에 오디오 삽입
+                done = [False] * len(tasks)
+                next_pending = 0
+                try:
+                    for next_done in asyncio.as_completed([self._indexed(i, task) for i, task in enumerate(tasks)]):
+                        index, placed = await next_done
+                        for start_time, segment_audio in placed:
+                            if segment_audio is not None:
+                                mixer.add(segment_audio, start_time)
+                        done[index] = True
+                        if progress_callback:
+                            progress_callback(sum(done) / len(done))
                         
-                        if segment_audio:
-                            # 해당 위치에 오디오 삽입
-                            start_pos = int(start_time * 1000)  # 밀리초 단위로 변환
-                            final_audio = final_audio.overlay(segment_audio, position=start_pos)
+                        # 아직 합성되지 않은 첫 묶음의 시작 이전 구간은 확정되었으므로 순서대로 내보냄
+                        while next_pending < len(done) and done[next_pending]:
+                            next_pending += 1
+                        if audio_callback and next_pending < len(groups):
+                            await emit_audio(audio_callback, mixer.release(int(round(groups[next_pending][0]["start"] * self.sample_rate))))
+                finally:
+                    # 조립 중 오류가 나면 남은 합성 요청을 취소
+                    for task in tasks:
+                        if not task.done():
+                            task.cancel()
+                
+                if audio_callback:
+                    await emit_audio(audio_callback, mixer.release())
                 
-                final_audio.export(output_path, format="wav", parameters=["-loglevel", "quiet"])
+                mixer.write_wav(output_path)
                 print(f"다중 화자 TTS 처리 완료: {output_path}")
                 
                 return output_path
@@ -301,6 +579,10 @@ class TTSService:
             print(traceback.format_exc())
             return None
 
+    @staticmethod
+    async def _indexed(index: int, task: asyncio.Task):
+        return index, await task
+
     async def find_local_tsv_file(self, input_filename: str) -> Optional[str]:
         """로컬 text_ko 디렉토리에서 TSV 파일 찾기"""
         try:
@@ -321,25 +603,43 @@ class TTSService:
             print(f"로컬 TSV 파일 검색 실패: {str(e)}")
             return None
 
-    async def process_text(self, task_id: str, video_path: str, multi_speaker: bool = True) -> Optional[str]:
-        """전체 TTS 처리 프로세스 (8단계 완료)"""
+    async def process_text(self, task_id: str, video_path: str, multi_speaker: bool = True,
+                           audio_callback: Optional[AudioCallback] = None,
+                           progress_callback: Optional[ProgressCallback] = None,
+                           workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """
+        전체 TTS 처리 프로세스 (8단계 완료)
+
+        audio_callback이 주어지면 앞쪽 구간부터 확정되는 대로 PCM을 시간순으로 전달하고,
+        progress_callback에는 합성이 끝난 세그먼트(묶음) 비율을 전달합니다.
+        workspace가 주어지면 manifest의 translation(TSV)을 입력으로 사용하고 결과를 작업 공간에 저장합니다.
+        """
         try:
-            # 입력 파일명 추출
-            input_filename = os.path.basename(video_path)
-            
-            # 로컬 text_ko 디렉토리에서 TSV 파일 찾기
-            tsv_path = await self.find_local_tsv_file(input_filename)
+            if workspace:
+                # 작업 manifest에서 번역 결과 찾기
+                tsv_path = await workspace.resolve("translation")
+                output_dir = workspace.dir("audio")
+            else:
+                # 로컬 text_ko 디렉토리에서 입력 파일명으로 TSV 파일 찾기
+                tsv_path = await self.find_local_tsv_file(os.path.basename(video_path))
+                output_dir = None
             if not tsv_path:
                 raise Exception("로컬 TSV 파일을 찾을 수 없습니다")
             
             # TSV 파일 처리 (다중 화자 모드 선택)
             if multi_speaker:
-                output_path = await self.process_multi_speaker_tsv(tsv_path, task_id)
+                output_path = await self.process_multi_speaker_tsv(tsv_path, task_id, audio_callback, progress_callback, output_dir)
             else:
-                output_path = await self.process_tsv_segments(tsv_path, task_id)
+                output_path = await self.process_tsv_segments(tsv_path, task_id, audio_callback, progress_callback, output_dir)
                 
             if not output_path:
                 raise Exception("TSV 세그먼트 처리 실패")
+            if workspace:
+                await workspace.register("tts_audio", output_path)
+            
+            self.rate_model.save()
+            if self.cache:
+                print(f"TTS 캐시 통계: {self.cache.stats()}")
             
             return output_path
             
@@ -0,0 +1,190 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any
+from google.cloud import texttospeech
+from . import config
+from .clients import clients
+
+class TTSAudioCache:
+    """텍스트, 음성, 오디오 설정을 키로 하는 합성 오디오(raw PCM) 캐시
+
+    로컬 디스크에 `<key>.pcm` 파일로 저장하며, 용량 상한을 넘으면 가장 오래 사용하지 않은
+    항목부터 삭제합니다. bucket_prefix가 지정되면 GCS 버킷을 2차 저장소로 사용합니다
+    (storage_client가 없으면 공용 클라이언트 레지스트리의 클라이언트 사용).
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 max_bytes: Optional[int] = None,
+                 storage_client=None,
+                 bucket_prefix: Optional[str] = None):
+        self.cache_dir = cache_dir or config.TTS_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else config.TTS_CACHE_MAX_BYTES
+        self.storage_client = storage_client
+        self.bucket_name = "onevoice-test-bucket"
+        self.bucket_prefix = (bucket_prefix if bucket_prefix is not None else config.TTS_CACHE_BUCKET_PREFIX).strip("/")
+
+        # key -> 파일 크기 (앞쪽일수록 오래 사용하지 않은 항목)
+        self.entries: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bucket_hits = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str,
+                 voice: texttospeech.VoiceSelectionParams,
+                 audio_config: texttospeech.AudioConfig) -> str:
+        """합성 입력 전체를 정규화하여 콘텐츠 주소(SHA-256) 생성"""
+        payload = json.dumps({
+            "text": text,
+            "voice": texttospeech.VoiceSelectionParams.to_dict(voice),
+            "audio_config": texttospeech.AudioConfig.to_dict(audio_config),
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pcm")
+
+    def _load_index(self) -> None:
+        """디스크의 캐시 파일을 마지막 사용 시각 순으로 인덱스에 등록"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".pcm"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시된 PCM 반환 (없으면 None)"""
+        path = self._path(key)
+        with self.lock:
+            cached = key in self.entries
+            if cached:
+                self.entries.move_to_end(key)
+
+        if cached:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                # 재시작 후에도 LRU 순서가 유지되도록 사용 시각 갱신
+                os.utime(path)
+                with self.lock:
+                    self.hits += 1
+                return data
+            except FileNotFoundError:
+                with self.lock:
+                    self.total_bytes -= self.entries.pop(key, 0)
+
+        data = self._download_from_bucket(key)
+        if data is not None:
+            self._store_local(key, data)
+            with self.lock:
+                self.hits += 1
+                self.bucket_hits += 1
+            return data
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """PCM을 캐시에 저장하고 필요시 용량 상한에 맞춰 오래된 항목 삭제"""
+        try:
+            self._store_local(key, data)
+        except OSError as e:
+            print(f"TTS 캐시 저장 실패: {str(e)}")
+        self._upload_to_bucket(key, data)
+
+    def _store_local(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            self.total_bytes += len(data) - self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+            while self.total_bytes > self.max_bytes and self.entries:
+                evicted_key, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                self.evictions += 1
+                try:
+                    os.unlink(self._path(evicted_key))
+                except FileNotFoundError:
+                    pass
+
+    def evict(self, max_bytes: int) -> int:
+        """
+        디스크 여유 공간 확보를 위해 오래 사용하지 않은 항목부터 삭제
+
+        Args:
+            max_bytes (int): 삭제할 최대 바이트 수
+
+        Returns:
+            int: 실제로 삭제한 바이트 수
+        """
+        freed = 0
+        while freed < max_bytes:
+            with self.lock:
+                if not self.entries:
+                    break
+                key, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                self.evictions += 1
+            try:
+                os.unlink(self._path(key))
+                freed += size
+            except FileNotFoundError:
+                pass
+        return freed
+
+    def _download_from_bucket(self, key: str) -> Optional[bytes]:
+        if not self.bucket_prefix:
+            return None
+        try:
+            blob = (self.storage_client or clients.storage).bucket(self.bucket_name).blob(f"{self.bucket_prefix}/{key}.pcm")
+            if not blob.exists():
+                return None
+            return blob.download_as_bytes()
+        except Exception as e:
+            print(f"TTS 캐시 버킷 조회 실패: {str(e)}")
+            return None
+
+    def _upload_to_bucket(self, key: str, data: bytes) -> None:
+        if not self.bucket_prefix:
+            return
+        try:
+            blob = (self.storage_client or clients.storage).bucket(self.bucket_name).blob(f"{self.bucket_prefix}/{key}.pcm")
+            blob.upload_from_string(data, content_type="application/octet-stream")
+        except Exception as e:
+            print(f"TTS 캐시 버킷 업로드 실패: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스 지표"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bucket_hits": self.bucket_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
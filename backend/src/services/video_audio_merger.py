@@ -1,108 +1,134 @@
 import ffmpeg
 import os
+import asyncio
+from enum import Enum
 from pathlib import Path
-from typing import Optional
-from google.cloud import storage
-import subprocess
+from typing import Optional, List, AsyncIterator
 from . import config
+from .clients import clients
+from .separation import separation_service, ProgressCallback
+from .ducking import duck_background, Interval
+from .ffmpeg_runner import ffmpeg_runner
+from .janitor import ArtifactKind
+from .workspace import TaskWorkspace
+from .tracing import tracer, file_size
+
+class BackgroundMode(str, Enum):
+    SEPARATION = "separation"  # Demucs로 보컬을 제거한 배경음 사용 (고품질)
+    DUCKING = "ducking"  # 발화 구간만 원본 볼륨을 낮춘 배경음 사용 (빠름)
+
+class OutputMode(str, Enum):
+    MP4 = "mp4"  # 전체 처리 후 MP4 한 번에 생성
+    HLS = "hls"  # TTS가 앞부분부터 확정되는 대로 fMP4 HLS 구간으로 게시
 
 class VideoAudioMerger:
     def __init__(self):
         self.output_dir = os.path.join(config.TEMP_DIR, "output_videos")
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
-        self.storage_client = storage.Client()
         self.bucket_name = "onevoice-test-bucket"
 
-    async def separate_background_music(self, audio_path: str) -> Optional[str]:
-        """Demucs를 사용하여 배경음악(BGM) 분리"""
+    @property
+    def storage_client(self):
+        return clients.storage
+
+    async def separate_background_music(self, audio_path: str, task_id: Optional[str] = None,
+                                        progress_callback: Optional[ProgressCallback] = None,
+                                        workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """Demucs를 사용하여 배경음악(BGM) 분리 (상주 분리 워커 사용)"""
         try:
-            temp_output_dir = os.path.join(self.output_dir, "temp_demucs")
-            Path(temp_output_dir).mkdir(parents=True, exist_ok=True)
-            
-            subprocess.run(["demucs", "--two-stems", "vocals", audio_path, "-o", temp_output_dir], 
-                         check=True, capture_output=True)
-            
-            # 분리된 오디오 디렉토리 경로
-            base_dir = os.path.join(temp_output_dir, "htdemucs", 
-                                   os.path.basename(audio_path).replace(".wav", ""))
-            
-            print(f"분리된 오디오 디렉토리: {base_dir}")
-            
-            # 디렉토리 내용 확인
-            if os.path.exists(base_dir):
-                print(f"디렉토리 내용: {os.listdir(base_dir)}")
-                
-                # no_vocals.wav 파일 찾기 (Demucs의 실제 출력)
-                no_vocals_path = os.path.join(base_dir, "no_vocals.wav")
-                if os.path.exists(no_vocals_path):
-                    print(f"배경음악 파일 찾음 (no_vocals.wav): {no_vocals_path}")
-                    return no_vocals_path
-            
-            raise FileNotFoundError("배경음악 파일(no_vocals.wav)을 찾을 수 없습니다.")
+            # 작업별 출력 디렉토리에 no_vocals.wav 생성
+            no_vocals_path = await separation_service.separate(
+                audio_path,
+                task_id,
+                progress_callback,
+                workspace.dir("separation") if workspace else None
+            )
+            print(f"배경음악 파일 찾음 (no_vocals.wav): {no_vocals_path}")
+            return no_vocals_path
                 
         except Exception as e:
             print(f"배경음악 분리 실패: {str(e)}")
             return None
 
-    async def merge_audio_files(self, audio1_path: str, audio2_path: str, volume_factor: float = 0.5) -> Optional[str]:
-        """두 오디오 파일을 합성 (볼륨 조절 가능)"""
+    async def duck_background_music(self, audio_path: str, speech_intervals: List[Interval],
+                                    task_id: Optional[str] = None,
+                                    workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """발화 구간의 원본 볼륨을 낮춰 배경음 생성 (음원 분리 생략)"""
         try:
-            # 원본 오디오 파일 이름에 '_merged' 접미사 추가
-            audio_basename = os.path.basename(audio2_path)
-            audio_name = os.path.splitext(audio_basename)[0]
-            audio_ext = os.path.splitext(audio_basename)[1]
-            output_path = os.path.join(self.output_dir, f"{audio_name}_merged{audio_ext}")
-            
-            # 배경음악 볼륨 조절
-            audio1 = ffmpeg.input(audio1_path).filter('volume', volume_factor)
-            audio2 = ffmpeg.input(audio2_path)
-            
-            ffmpeg.filter([audio1, audio2], 'amix', inputs=2, duration='longest')\
-                  .output(output_path)\
-                  .run(overwrite_output=True, capture_stderr=True)
-            
-            print(f"오디오 합성 완료: {output_path}")
-            return output_path
-            
-        except ffmpeg.Error as e:
-            print(f"오디오 합성 실패: {e.stderr.decode() if e.stderr else str(e)}")
+            if workspace:
+                output_path = os.path.join(workspace.dir("background"), f"{Path(audio_path).stem}_ducked.wav")
+            else:
+                output_path = os.path.join(self.output_dir, f"{task_id or Path(audio_path).stem}_ducked.wav")
+            ducked_path = await asyncio.to_thread(duck_background, audio_path, speech_intervals, output_path)
+            print(f"배경음 더킹 완료 (발화 구간 {len(speech_intervals)}개): {ducked_path}")
+            return ducked_path
+
+        except Exception as e:
+            print(f"배경음 더킹 실패: {str(e)}")
             return None
 
-    async def merge_video_audio(self, video_path: str, audio_path: str) -> Optional[str]:
-        """비디오와 오디오 합성"""
+    async def mux_dubbed_video(self, video_path: str, bgm_path: str, tts_audio_path: str,
+                               volume_factor: float = 0.5,
+                               progress_callback: Optional[ProgressCallback] = None,
+                               workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """
+        배경음 볼륨 조절, TTS 오디오 합성, AAC 인코딩, 비디오 스트림 복사를 하나의 ffmpeg 그래프로 처리
+
+        중간 WAV 파일 없이 한 번의 ffmpeg 실행으로 더빙 영상을 생성합니다.
+        """
         try:
-            output_path = os.path.join(self.output_dir, f"dubbed_{os.path.basename(video_path)}")
-            
+            output_path = self._output_path(video_path, workspace)
+
             video = ffmpeg.input(video_path)
-            audio = ffmpeg.input(audio_path)
-            
-            stream = (
-                ffmpeg
-                .output(
-                    video['v'],
-                    audio['a'],
-                    output_path,
-                    vcodec='copy',
-                    acodec='aac',
-                    map_metadata=-1,
-                    loglevel='error'
-                )
+            bgm = ffmpeg.input(bgm_path).audio.filter('volume', volume_factor)
+            tts = ffmpeg.input(tts_audio_path).audio
+            mixed = ffmpeg.filter([bgm, tts], 'amix', inputs=2, duration='longest')
+
+            stream = ffmpeg.output(
+                video.video,
+                mixed,
+                output_path,
+                vcodec='copy',
+                acodec='aac',
+                map_metadata=-1,
+                loglevel='error'
             )
-            
-            ffmpeg.run(stream, overwrite_output=True, capture_stderr=True)
+
+            # amix duration=longest이므로 배경음/TTS 중 긴 쪽이 출력 길이
+            durations = await asyncio.gather(
+                ffmpeg_runner.probe_duration(bgm_path),
+                ffmpeg_runner.probe_duration(tts_audio_path)
+            )
+            duration = max((d for d in durations if d), default=None)
+            await ffmpeg_runner.run(stream, duration=duration, progress_callback=progress_callback)
+
             print(f"비디오 합성 완료: {output_path}")
-            
-            # GCS에 결과물 업로드
-            destination_blob_name = f"resources/output_videos/{os.path.basename(output_path)}"
-            if await self._upload_to_gcs(output_path, destination_blob_name):
-                print(f"결과물 업로드 완료: gs://{self.bucket_name}/{destination_blob_name}")
-            
+            await self._publish_output(output_path, workspace)
             return output_path
-            
+
         except ffmpeg.Error as e:
             print(f"비디오 합성 실패: {e.stderr.decode() if e.stderr else str(e)}")
             return None
 
+    def _output_path(self, video_path: str, workspace: Optional[TaskWorkspace]) -> str:
+        output_dir = workspace.dir("output_videos") if workspace else self.output_dir
+        return os.path.join(output_dir, f"dubbed_{os.path.basename(video_path)}")
+
+    def output_blob_name(self, output_path: str, workspace: Optional[TaskWorkspace] = None) -> str:
+        """결과 영상의 GCS 객체 이름 (작업 공간의 결과물이면 작업 ID 포함)"""
+        filename = os.path.basename(output_path)
+        if workspace and workspace.contains(output_path):
+            return workspace.gcs_path("output_videos", filename)
+        return f"resources/output_videos/{filename}"
+
+    async def _publish_output(self, output_path: str, workspace: Optional[TaskWorkspace]) -> None:
+        """결과 영상을 manifest에 등록하고 GCS에 업로드"""
+        if workspace:
+            await workspace.register("output_video", output_path, ArtifactKind.OUTPUT)
+        destination_blob_name = self.output_blob_name(output_path, workspace)
+        if await self._upload_to_gcs(output_path, destination_blob_name):
+            print(f"결과물 업로드 완료: gs://{self.bucket_name}/{destination_blob_name}")
+
     async def _upload_to_gcs(self, local_path: str, destination_blob_name: str) -> bool:
         """GCS에 파일 업로드"""
         try:
@@ -110,7 +136,8 @@ class VideoAudioMerger:
             blob = bucket.blob(destination_blob_name)
             
             print(f"파일 업로드 시작: {local_path} -> gs://{self.bucket_name}/{destination_blob_name}")
-            blob.upload_from_filename(local_path)
+            with tracer.span("gcs.upload", bytes=file_size(local_path), object=destination_blob_name):
+                blob.upload_from_filename(local_path)
             print(f"파일 업로드 완료: {local_path} -> gs://{self.bucket_name}/{destination_blob_name}")
             
             return True
@@ -118,35 +145,156 @@ class VideoAudioMerger:
             print(f"GCS 업로드 오류: {str(e)}")
             return False
 
-    async def process_video(self, task_id: str, video_path: str, tts_audio_path: str, original_audio_path: str = None) -> Optional[str]:
-        """전체 비디오 처리 프로세스"""
+    async def publish_hls(self, task_id: str, video_path: str, bgm_path: str,
+                          tts_chunks: AsyncIterator[bytes], tts_sample_rate: int,
+                          volume_factor: float = 0.5) -> Optional[str]:
+        """
+        TTS PCM을 표준 입력으로 받으면서 fMP4 HLS 구간을 생성 (event 플레이리스트)
+
+        ffmpeg는 도착한 TTS 오디오까지만 인코딩하므로 구간 파일과 플레이리스트가 시간순으로
+        점진적으로 갱신되며, 플레이어는 첫 구간이 생성되는 즉시 재생을 시작할 수 있습니다.
+
+        Returns:
+            Optional[str]: 플레이리스트(playlist.m3u8) 경로
+        """
         try:
-            # 원본 오디오 경로 확인
-            if not original_audio_path or not os.path.exists(original_audio_path):
-                # 원본 오디오 파일이 없는 경우에만 추출
-                print("원본 오디오 파일이 제공되지 않아 직접 추출합니다.")
-                original_audio_path = os.path.join(self.output_dir, f"{Path(video_path).stem}.wav")
-                stream = ffmpeg.input(video_path)
-                stream = ffmpeg.output(stream, original_audio_path,
-                                     acodec='pcm_s16le',
-                                     ac=2,
-                                     ar='44.1k')
-                ffmpeg.run(stream, overwrite_output=True)
-            else:
-                print(f"제공된 원본 오디오 파일을 사용합니다: {original_audio_path}")
+            hls_dir = self.hls_dir(task_id)
+            Path(hls_dir).mkdir(parents=True, exist_ok=True)
+            playlist_path = os.path.join(hls_dir, "playlist.m3u8")
 
-            # 배경음악 분리
-            bgm_path = await self.separate_background_music(original_audio_path)
+            video = ffmpeg.input(video_path)
+            bgm = ffmpeg.input(bgm_path).audio.filter('volume', volume_factor)
+            tts = ffmpeg.input('pipe:0', format='s16le', ar=tts_sample_rate, ac=1).audio
+            mixed = ffmpeg.filter([bgm, tts], 'amix', inputs=2, duration='longest')
+
+            stream = ffmpeg.output(
+                video.video,
+                mixed,
+                playlist_path,
+                vcodec='copy',
+                acodec='aac',
+                map_metadata=-1,
+                # 오디오가 늦게 도착해도 비디오만 먼저 기록하지 않도록 인터리빙 대기
+                max_interleave_delta=0,
+                format='hls',
+                hls_time=config.HLS_SEGMENT_SECONDS,
+                hls_playlist_type='event',
+                hls_segment_type='fmp4',
+                hls_flags='independent_segments+temp_file',
+                hls_fmp4_init_filename='init.mp4',
+                hls_segment_filename=os.path.join(hls_dir, 'seg_%05d.m4s'),
+                loglevel='error'
+            )
+            await ffmpeg_runner.run(stream, timeout=0, input_chunks=tts_chunks)
+
+            print(f"HLS 게시 완료: {playlist_path}")
+            return playlist_path
+
+        except ffmpeg.Error as e:
+            print(f"HLS 생성 실패: {e.stderr.decode() if e.stderr else str(e)}")
+            return None
+
+    async def remux_hls_to_mp4(self, playlist_path: str, video_path: str,
+                               workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """게시가 끝난 HLS 구간을 재인코딩 없이 다운로드용 MP4로 합침"""
+        try:
+            output_path = self._output_path(video_path, workspace)
+            stream = ffmpeg.output(ffmpeg.input(playlist_path), output_path, c='copy', loglevel='error')
+            await ffmpeg_runner.run(stream)
+
+            await self._publish_output(output_path, workspace)
+            return output_path
+
+        except ffmpeg.Error as e:
+            print(f"HLS MP4 변환 실패: {e.stderr.decode() if e.stderr else str(e)}")
+            return None
+
+    def hls_dir(self, task_id: str) -> str:
+        """작업별 HLS 구간 디렉토리 (작업 공간 아래)"""
+        return os.path.join(TaskWorkspace(task_id).root, "hls")
+
+    async def prepare_background(self, task_id: str, video_path: str, original_audio_path: str = None,
+                                 background_mode: Optional[str] = None,
+                                 speech_intervals: Optional[List[Interval]] = None,
+                                 progress_callback: Optional[ProgressCallback] = None,
+                                 workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """
+        원본 오디오에서 TTS 아래에 깔 배경음 생성 (progress_callback은 0~1 진행률을 받음)
+
+        background_mode가 ducking이면 음원 분리 대신 speech_intervals 구간의 원본 볼륨만 낮춥니다.
+        발화 구간 정보가 없으면 원본 음성이 남지 않도록 음원 분리로 처리합니다.
+        """
+        workspace = workspace or TaskWorkspace(task_id)
+        # 원본 오디오 경로 확인 (manifest에 등록된 추출 오디오 우선)
+        if not original_audio_path or not os.path.exists(original_audio_path):
+            original_audio_path = await workspace.resolve("original_audio")
+        if not original_audio_path:
+            # 원본 오디오 파일이 없는 경우에만 추출
+            print("원본 오디오 파일이 제공되지 않아 직접 추출합니다.")
+            original_audio_path = os.path.join(workspace.dir("input_videos"), f"{Path(video_path).stem}.wav")
+            stream = ffmpeg.input(video_path)
+            stream = ffmpeg.output(stream, original_audio_path,
+                                 acodec='pcm_s16le',
+                                 ac=2,
+                                 ar='44.1k')
+            await ffmpeg_runner.run(stream)
+            await workspace.register("original_audio", original_audio_path)
+        else:
+            print(f"제공된 원본 오디오 파일을 사용합니다: {original_audio_path}")
+
+        mode = BackgroundMode(background_mode or config.BACKGROUND_MODE)
+        if mode == BackgroundMode.DUCKING and not speech_intervals:
+            print("발화 구간 정보가 없어 음원 분리 방식으로 처리합니다.")
+            mode = BackgroundMode.SEPARATION
+
+        if mode == BackgroundMode.DUCKING:
+            # 발화 구간 볼륨 감소
+            bgm_path = await self.duck_background_music(original_audio_path, speech_intervals, task_id, workspace)
+            await workspace.register("background", bgm_path)
+            if progress_callback:
+                progress_callback(1.0)
+            return bgm_path
+
+        # 배경음악 분리
+        bgm_path = await self.separate_background_music(
+            original_audio_path,
+            task_id,
+            progress_callback or (lambda progress: print(f"배경음악 분리 진행률: {progress * 100:.0f}%")),
+            workspace
+        )
+        await workspace.register("background", bgm_path)
+        return bgm_path
+
+    async def process_video(self, task_id: str, video_path: str, tts_audio_path: str, original_audio_path: str = None,
+                            background_mode: Optional[str] = None,
+                            speech_intervals: Optional[List[Interval]] = None,
+                            progress_callback: Optional[ProgressCallback] = None,
+                            background_progress_callback: Optional[ProgressCallback] = None,
+                            workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """
+        전체 비디오 처리 프로세스
+
+        background_progress_callback은 배경음 준비, progress_callback은 최종 합성 단계의 0~1 진행률을 받습니다.
+        배경음과 결과 영상은 작업 공간(workspace, 없으면 task_id의 작업 공간)에 저장됩니다.
+        """
+        workspace = workspace or TaskWorkspace(task_id)
+        try:
+            bgm_path = await tracer.traced("stage.separation", self.prepare_background(
+                task_id, video_path, original_audio_path, background_mode, speech_intervals,
+                background_progress_callback, workspace
+            ))
             if not bgm_path:
                 raise Exception("배경음악 분리 실패")
 
-            # 배경음악과 TTS 오디오 합성 (배경음악 볼륨 50%로 설정)
-            merged_audio_path = await self.merge_audio_files(bgm_path, tts_audio_path, volume_factor=0.5)
-            if not merged_audio_path:
-                raise Exception("오디오 합성 실패")
-
-            # 비디오와 합성된 오디오 병합
-            output_path = await self.merge_video_audio(video_path, merged_audio_path)
+            # 배경음악(볼륨 50%)과 TTS 오디오를 합성하여 비디오와 병합
+            output_path = await tracer.traced("stage.mux", self.mux_dubbed_video(
+                video_path,
+                bgm_path,
+                tts_audio_path,
+                volume_factor=0.5,
+                progress_callback=progress_callback,
+                workspace=workspace
+            ))
             if not output_path:
                 raise Exception("비디오 합성 실패")
 
@@ -156,5 +304,46 @@ class VideoAudioMerger:
             print(f"비디오 처리 실패: {str(e)}")
             return None
 
+    async def process_video_progressive(self, task_id: str, video_path: str,
+                                        tts_chunks: AsyncIterator[bytes], tts_sample_rate: int,
+                                        original_audio_path: str = None,
+                                        background_mode: Optional[str] = None,
+                                        speech_intervals: Optional[List[Interval]] = None,
+                                        background_progress_callback: Optional[ProgressCallback] = None,
+                                        workspace: Optional[TaskWorkspace] = None) -> Optional[str]:
+        """
+        HLS 출력 모드의 비디오 처리 프로세스
+
+        TTS 합성과 동시에 배경음을 준비한 뒤, tts_chunks로 도착하는 TTS 오디오를 HLS 구간으로
+        게시합니다. 게시가 끝나면 다운로드용 MP4를 만들어 경로를 반환합니다.
+
+        HLS 게시는 배경음 전체가 준비된 뒤에 시작합니다. separation 모드에서는 전체 음원 분리가
+        끝날 때까지 첫 구간이 생성되지 않고, 그동안 TTS는 tts_chunks 대기열이 가득 차면 멈춥니다.
+        """
+        workspace = workspace or TaskWorkspace(task_id)
+        try:
+            bgm_path = await tracer.traced("stage.separation", self.prepare_background(
+                task_id, video_path, original_audio_path, background_mode, speech_intervals,
+                background_progress_callback, workspace
+            ))
+            if not bgm_path:
+                raise Exception("배경음악 분리 실패")
+
+            # HLS 게시는 TTS와 함께 진행되므로 mux 단계 시간에 TTS 대기 시간이 포함됨
+            with tracer.span("stage.mux"):
+                playlist_path = await self.publish_hls(task_id, video_path, bgm_path, tts_chunks, tts_sample_rate)
+                if not playlist_path:
+                    raise Exception("HLS 생성 실패")
+
+                output_path = await self.remux_hls_to_mp4(playlist_path, video_path, workspace)
+                if not output_path:
+                    raise Exception("비디오 합성 실패")
+
+            return output_path
+
+        except Exception as e:
+            print(f"비디오 처리 실패: {str(e)}")
+            return None
+
 # 서비스 인스턴스 생성
 video_audio_merger = VideoAudioMerger() 
\ No newline at end of file
@@ -0,0 +1,61 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+from . import config
+from .task_manager import task_manager
+from .janitor import artifact_janitor, ArtifactKind
+
+class TaskWorkspace:
+    """
+    작업별 작업 공간 (`TEMP_DIR/tasks/<task_id>/`)
+
+    모든 산출물을 작업 디렉토리 아래 종류별 하위 디렉토리에 저장하고 GCS 경로에도 작업 ID를
+    붙이므로, 제목이 같은 작업이 동시에 실행되어도 서로의 파일을 덮어쓰지 않습니다.
+    산출물은 이름으로 작업 레코드의 manifest(`artifacts`)에 등록하고, 다음 단계는 파일명을
+    추측하지 않고 manifest에서 입력을 찾습니다.
+
+    산출물 이름: input_video, original_audio, denoised_audio, transcript, diarization,
+    merged_result, translation, tts_audio, background, output_video, hls,
+    profile_flamegraph, profile_stacks, profile_memory (프로파일링 요청 시)
+    """
+
+    def __init__(self, task_id: str, root: Optional[str] = None):
+        self.task_id = task_id
+        self.root = os.path.join(root or config.TEMP_DIR, "tasks", task_id)
+
+    def dir(self, name: str) -> str:
+        """종류별 하위 디렉토리 (없으면 생성)"""
+        path = os.path.join(self.root, name)
+        Path(path).mkdir(parents=True, exist_ok=True)
+        return path
+
+    def contains(self, path: str) -> bool:
+        """경로가 작업 공간 안에 있는지 확인"""
+        return os.path.abspath(path).startswith(os.path.abspath(self.root) + os.sep)
+
+    def gcs_path(self, name: str, filename: str) -> str:
+        """작업 ID를 붙인 GCS 객체 이름 (resources/<name>/<task_id>/<filename>)"""
+        return f"resources/{name}/{self.task_id}/{filename}"
+
+    async def register(self, name: str, path: Optional[str],
+                       kind: ArtifactKind = ArtifactKind.INTERMEDIATE) -> Optional[str]:
+        """산출물을 manifest와 정리기에 등록하고 경로를 그대로 반환"""
+        if not path:
+            return path
+        path = os.path.abspath(path)
+        await task_manager.add_artifact(self.task_id, name, path)
+        await artifact_janitor.track(self.task_id, path, kind)
+        return path
+
+    async def resolve(self, name: str) -> Optional[str]:
+        """manifest에서 산출물 경로 조회 (등록되지 않았거나 삭제되었으면 None)"""
+        task_data = await task_manager.get_task_status(self.task_id)
+        path = ((task_data or {}).get("artifacts") or {}).get(name)
+        if not path or not os.path.exists(path):
+            return None
+        return path
+
+    def remove(self) -> None:
+        """작업 공간 전체 삭제 (작업 생성 전 실패 시 정리용)"""
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,56 @@
+import io
+import wave
+import numpy as np
+from services.audio_mixer import TimelineMixer, decode_linear16
+
+def make_wav(samples: np.ndarray, sample_rate: int = 24000) -> bytes:
+    """테스트용 LINEAR16 WAV 바이트 생성"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+def test_decode_linear16_wav():
+    """WAV 헤더가 있는 응답 디코딩 테스트"""
+    samples = np.arange(-100, 100, dtype=np.int16)
+    decoded, sample_rate, channels = decode_linear16(make_wav(samples))
+    assert sample_rate == 24000
+    assert channels == 1
+    assert np.array_equal(decoded, samples)
+
+def test_decode_linear16_raw_pcm():
+    """헤더 없는 PCM 디코딩 테스트"""
+    samples = np.array([1, -2, 3], dtype=np.int16)
+    decoded, sample_rate, _ = decode_linear16(samples.tobytes())
+    assert sample_rate is None
+    assert np.array_equal(decoded, samples)
+
+def test_mixer_places_and_clips(tmp_path):
+    """세그먼트 배치, 범위 초과 부분 버림, 클리핑 테스트"""
+    mixer = TimelineMixer(1.0, 10)
+    mixer.add(np.full(4, 30000, dtype=np.int16), 0.2)
+    mixer.add(np.full(4, 30000, dtype=np.int16), 0.4)
+    mixer.add(np.full(5, 100, dtype=np.int16), 0.8)
+
+    pcm = mixer.to_int16()[:, 0]
+    assert list(pcm) == [0, 0, 30000, 30000, 32767, 32767, 30000, 30000, 100, 100]
+
+    output_path = mixer.write_wav(str(tmp_path / "out.wav"))
+    with wave.open(output_path, "rb") as wav_file:
+        assert wav_file.getnframes() == 10
+        assert wav_file.getframerate() == 10
+
+def test_timeline_mixer_release_is_incremental():
+    """확정된 구간을 중복 없이 순서대로 내보내는지 테스트"""
+    mixer = TimelineMixer(1.0, 10)
+    mixer.add(np.full(3, 5, dtype=np.int16), 0.2)
+    first = mixer.release(4)
+    mixer.add(np.full(3, 7, dtype=np.int16), 0.6)
+    rest = mixer.release()
+    assert len(mixer.release()) == 0
+    released = np.concatenate([first, rest])[:, 0]
+    assert np.array_equal(released, mixer.to_int16()[:, 0])
+    assert released.tolist() == [0, 0, 5, 5, 5, 0, 7, 7, 7, 0]
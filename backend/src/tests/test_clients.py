@@ -0,0 +1,31 @@
+import asyncio
+import pytest
+from services.clients import ClientRegistry
+
+@pytest.fixture
+def registry(monkeypatch):
+    """호출 횟수를 세는 가짜 팩토리를 쓰는 레지스트리"""
+    created = []
+    monkeypatch.setattr(ClientRegistry, "FACTORIES", {
+        "storage": lambda: created.append("storage") or object(),
+        "tts": lambda: created.append("tts") or object(),
+    })
+    registry = ClientRegistry()
+    registry.created = created
+    return registry
+
+def test_clients_are_created_lazily_once(registry):
+    """첫 사용 시 한 번만 생성하고 이후에는 같은 객체를 공유하는지 테스트"""
+    assert registry.created == []
+    assert registry.storage is registry.storage
+    assert registry.created == ["storage"]
+
+def test_override_and_warmup(registry):
+    """가짜 클라이언트 대체와 미리 생성 테스트"""
+    fake = object()
+    registry.override("storage", fake)
+    assert registry.storage is fake
+
+    timings = asyncio.run(registry.warmup(["tts"]))
+    assert list(timings) == ["tts"]
+    assert registry.created == ["tts"]
@@ -0,0 +1,42 @@
+import wave
+import numpy as np
+from services.ducking import speech_intervals, merge_intervals, duck_background
+
+def write_wav(path: str, samples: np.ndarray, sample_rate: int = 1000) -> None:
+    """테스트용 스테레오 WAV 파일 생성"""
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype("<i2").tobytes())
+
+def read_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as wav_file:
+        return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype="<i2").reshape(-1, 2)
+
+def test_speech_intervals_merges_overlapping_speakers():
+    """화자가 겹치는 구간 병합 테스트"""
+    result = {"diarization": [
+        {"start": 3.0, "end": 4.0, "speaker": "SPEAKER_01"},
+        {"start": 1.0, "end": 2.0, "speaker": "SPEAKER_00"},
+        {"start": 1.5, "end": 2.5, "speaker": "SPEAKER_01"},
+    ]}
+    assert speech_intervals(result) == [(1.0, 2.5), (3.0, 4.0)]
+    assert speech_intervals(None) == []
+    assert merge_intervals([(0.0, 1.0), (1.2, 2.0)], gap=0.5) == [(0.0, 2.0)]
+
+def test_duck_background_attenuates_speech_only(tmp_path):
+    """발화 구간만 볼륨이 낮아지는지 테스트"""
+    input_path = str(tmp_path / "original.wav")
+    output_path = str(tmp_path / "ducked.wav")
+    write_wav(input_path, np.full((5000, 2), 10000))
+
+    duck_background(input_path, [(2.0, 3.0)], output_path, gain_db=-20, fade_ms=100, pad_ms=0, block_frames=700)
+    ducked = read_wav(output_path)
+
+    assert ducked.shape == (5000, 2)
+    assert np.all(ducked[:1800] == 10000)
+    assert np.all(ducked[2000:3000] == 1000)
+    assert np.all(ducked[3200:] == 10000)
+    # 전환 구간은 단조롭게 변화
+    assert np.all(np.diff(ducked[1900:2000, 0].astype(int)) <= 0)
@@ -0,0 +1,46 @@
+import os
+import stat
+import asyncio
+import ffmpeg
+import pytest
+from services.ffmpeg_runner import FFmpegRunner
+
+def make_fake_ffmpeg(tmp_path, body: str) -> str:
+    """-progress 출력을 흉내 내는 테스트용 실행 파일 생성"""
+    path = tmp_path / "fake_ffmpeg"
+    path.write_text("#!/bin/sh\n" + body)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+@pytest.mark.asyncio
+async def test_run_reports_progress(tmp_path):
+    """progress 블록을 0~1 진행률로 변환하는지 테스트"""
+    executable = make_fake_ffmpeg(tmp_path, (
+        "echo out_time_us=5000000\necho progress=continue\n"
+        "echo out_time_us=10000000\necho progress=end\n"
+    ))
+    reported = []
+    await FFmpegRunner(max_processes=1, timeout=0).run(
+        [executable], duration=10.0, progress_callback=reported.append, min_interval=0
+    )
+    assert reported == [0.5, 1.0, 1.0]
+
+@pytest.mark.asyncio
+async def test_run_raises_on_failure(tmp_path):
+    """0이 아닌 종료 코드를 ffmpeg.Error로 전달하는지 테스트"""
+    executable = make_fake_ffmpeg(tmp_path, "echo invalid input >&2\nexit 1\n")
+    with pytest.raises(ffmpeg.Error) as error:
+        await FFmpegRunner(max_processes=1, timeout=0).run([executable])
+    assert b"invalid input" in error.value.stderr
+
+@pytest.mark.asyncio
+async def test_run_kills_process_on_timeout(tmp_path):
+    """제한 시간 초과 시 프로세스를 종료하는지 테스트"""
+    pid_file = tmp_path / "pid"
+    executable = make_fake_ffmpeg(tmp_path, f"echo $$ > {pid_file}\nexec sleep 30\n")
+    runner = FFmpegRunner(max_processes=1, timeout=0)
+    with pytest.raises(asyncio.TimeoutError):
+        await runner.run([executable], timeout=0.5)
+    assert runner.running == 0
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
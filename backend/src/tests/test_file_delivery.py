@@ -0,0 +1,148 @@
+import os
+import pytest
+from types import SimpleNamespace
+from fakeredis import FakeServer, aioredis as fake_aioredis
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.testclient import TestClient
+from src.routes import process
+from src.services import config
+from src.services.clients import clients
+from src.services.file_delivery import FileDelivery
+from src.services.janitor import ArtifactKind
+from src.services.task_manager import task_manager
+from src.services.workspace import TaskWorkspace
+
+@pytest.fixture
+def client(tmp_path):
+    """테스트 파일을 전송하는 최소 앱"""
+    path = tmp_path / "result.mp4"
+    path.write_bytes(bytes(range(256)) * 4)
+    delivery = FileDelivery()
+    delivery.redirect_mode = "none"
+
+    app = FastAPI()
+
+    @app.get("/file")
+    async def get_file(request: Request):
+        return await delivery.respond(request, str(path), media_type="video/mp4", filename="result.mp4")
+
+    return TestClient(app)
+
+def test_full_response_has_validators(client):
+    """전체 전송 시 ETag/Last-Modified/Accept-Ranges 헤더 테스트"""
+    response = client.get("/file")
+    assert response.status_code == 200
+    assert len(response.content) == 1024
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == client.get("/file").headers["etag"]
+
+def test_range_request(client):
+    """바이트 범위 요청 테스트"""
+    response = client.get("/file", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 10-19/1024"
+    assert response.content == bytes(range(10, 20))
+
+    suffix = client.get("/file", headers={"Range": "bytes=-4"})
+    assert suffix.status_code == 206
+    assert suffix.content == bytes(range(252, 256))
+
+    unsatisfiable = client.get("/file", headers={"Range": "bytes=5000-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == "bytes */1024"
+
+def test_conditional_get(client):
+    """If-None-Match / If-Range 처리 테스트"""
+    etag = client.get("/file").headers["etag"]
+    assert client.get("/file", headers={"If-None-Match": etag}).status_code == 304
+
+    # 검증자가 일치하지 않으면 범위 요청 대신 전체를 전송
+    stale = client.get("/file", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert len(stale.content) == 1024
+
+class FakeBlob:
+    def __init__(self, name: str, exists: bool):
+        self.name = name
+        self._exists = exists
+
+    def exists(self):
+        return self._exists
+
+    def generate_signed_url(self, **kwargs):
+        return f"https://storage.example/{self.name}?signed"
+
+class FakeStorage:
+    """blob 존재 여부를 지정할 수 있는 가짜 GCS 클라이언트"""
+
+    def __init__(self, exists: bool):
+        self.exists = exists
+
+    def bucket(self, name):
+        return SimpleNamespace(blob=lambda blob_name: FakeBlob(blob_name, self.exists))
+
+def request_without_headers() -> Request:
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("exists", [True, False])
+async def test_signed_redirect_requires_uploaded_blob(tmp_path, exists):
+    """GCS 객체가 있을 때만 서명 URL로 리다이렉트하고, 없으면 직접 전송하는지 테스트"""
+    path = tmp_path / "result.mp4"
+    path.write_bytes(b"video")
+    delivery = FileDelivery()
+    delivery.redirect_mode = "signed"
+    clients.override("storage", FakeStorage(exists))
+    try:
+        response = await delivery.respond(
+            request_without_headers(), str(path), media_type="video/mp4", gcs_blob_name="tasks/task-1/result.mp4"
+        )
+    finally:
+        clients.reset("storage")
+
+    if exists:
+        assert response.status_code == 307
+        assert response.headers["location"] == "https://storage.example/tasks/task-1/result.mp4?signed"
+    else:
+        assert response.status_code == 200
+        assert response.headers["content-length"] == "5"
+
+@pytest.mark.asyncio
+async def test_static_redirect_only_for_task_output(tmp_path):
+    """정적 경로 리다이렉트는 작업 결과 영상에만 적용되고 경로 대신 작업 ID와 파일명을 쓰는지 테스트"""
+    path = tmp_path / "dubbed video.mp4"
+    path.write_bytes(b"video")
+    delivery = FileDelivery()
+    delivery.redirect_mode = "static"
+
+    redirected = await delivery.respond(request_without_headers(), str(path), media_type="video/mp4", task_id="task-1")
+    assert redirected.status_code == 307
+    assert redirected.headers["location"] == f"{config.DOWNLOAD_STATIC_BASE_URL.rstrip('/')}/task-1/dubbed%20video.mp4"
+
+    direct = await delivery.respond(request_without_headers(), str(path), media_type="video/mp4")
+    assert direct.status_code == 200
+    served = await delivery.respond(request_without_headers(), str(path), media_type="video/mp4", task_id="task-1", redirect=False)
+    assert served.status_code == 200
+
+@pytest.mark.asyncio
+async def test_static_handler_serves_only_output_video(monkeypatch, tmp_path):
+    """정적 경로 처리기가 manifest의 output_video만 전송하고 다른 파일이나 경로 이동은 거부하는지 테스트"""
+    monkeypatch.setattr(task_manager, "redis", fake_aioredis.FakeRedis(server=FakeServer(), decode_responses=True))
+    monkeypatch.setattr(config, "TEMP_DIR", str(tmp_path))
+    await task_manager.create_task("task-1")
+    workspace = TaskWorkspace("task-1")
+    output_dir = workspace.dir("output_videos")
+    with open(os.path.join(output_dir, "dubbed_a.mp4"), "wb") as f:
+        f.write(b"video")
+    with open(os.path.join(output_dir, "original.mp4"), "wb") as f:
+        f.write(b"original")
+    await workspace.register("output_video", os.path.join(output_dir, "dubbed_a.mp4"), ArtifactKind.OUTPUT)
+
+    response = await process.serve_output_file("task-1", "dubbed_a.mp4", request_without_headers())
+    assert response.status_code == 200
+    assert response.headers["content-length"] == "5"
+    for task_id, filename in (("task-1", "original.mp4"), ("task-1", "../../task-1/output_videos/dubbed_a.mp4"),
+                              ("task-2", "dubbed_a.mp4")):
+        with pytest.raises(HTTPException) as error:
+            await process.serve_output_file(task_id, filename, request_without_headers())
+        assert error.value.status_code == 404
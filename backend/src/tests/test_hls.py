@@ -0,0 +1,147 @@
+import os
+import asyncio
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from fakeredis import FakeServer, aioredis as fake_aioredis
+from src.routes import process
+from src.services import config
+from src.services.task_manager import task_manager
+from src.services.progress import ProgressReporter
+from src.services.tts import emit_audio
+from src.services.workspace import TaskWorkspace
+
+@pytest.fixture
+def hls_task(monkeypatch, tmp_path):
+    """다른 테스트와 분리된 가짜 Redis와 임시 작업 공간에 HLS 출력 작업 하나를 만드는 생성기"""
+    redis = fake_aioredis.FakeRedis(server=FakeServer(), decode_responses=True)
+    monkeypatch.setattr(task_manager, "redis", redis)
+    monkeypatch.setattr(config, "TEMP_DIR", str(tmp_path))
+
+    async def create(task_id: str = "task-1") -> str:
+        await task_manager.create_task(task_id)
+        hls_dir = process.video_audio_merger.hls_dir(task_id)
+        os.makedirs(hls_dir)
+        playlist = os.path.join(hls_dir, "playlist.m3u8")
+        await task_manager.update_playlist(task_id, playlist)
+        return playlist
+
+    return create
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("segment_name", [
+    "../secret.txt", "..", "playlist.m3u8", "seg_1.m4s/../../secret.txt", "seg_.m4s", "seg_1.m4s.bak", "init.mp4 "
+])
+async def test_segment_name_guard_rejects_other_files(hls_task, segment_name):
+    """구간 이름 형식이 아니면 작업 디렉토리 밖이나 플레이리스트 파일에 접근할 수 없는지 테스트"""
+    playlist = await hls_task()
+    hls_dir = os.path.dirname(playlist)
+    with open(os.path.join(hls_dir, "..", "secret.txt"), "w") as f:
+        f.write("secret")
+    with open(playlist, "w") as f:
+        f.write("#EXTM3U\n")
+
+    with pytest.raises(HTTPException) as error:
+        await process.get_hls_segment("task-1", segment_name)
+    assert error.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_segments_are_served_from_task_directory(hls_task):
+    """초기화 구간과 미디어 구간을 작업의 HLS 디렉토리에서 전송하는지 테스트"""
+    playlist = await hls_task()
+    hls_dir = os.path.dirname(playlist)
+    for name in ("init.mp4", "seg_12.m4s"):
+        with open(os.path.join(hls_dir, name), "wb") as f:
+            f.write(b"\x00")
+
+    init = await process.get_hls_segment("task-1", "init.mp4")
+    segment = await process.get_hls_segment("task-1", "seg_12.m4s")
+    assert init.path == os.path.join(hls_dir, "init.mp4") and init.media_type == "video/mp4"
+    assert segment.path == os.path.join(hls_dir, "seg_12.m4s") and segment.media_type == "video/iso.segment"
+    with pytest.raises(HTTPException) as error:
+        await process.get_hls_segment("task-1", "seg_13.m4s")
+    assert error.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_playlist_follows_updates(hls_task):
+    """첫 구간 전에는 404, 이후에는 갱신된 플레이리스트를 캐시 없이 전송하는지 테스트"""
+    playlist = await hls_task()
+    with pytest.raises(HTTPException) as error:
+        await process.get_hls_playlist("task-1")
+    assert error.value.status_code == 404
+
+    for segments in (1, 2):
+        with open(playlist, "w") as f:
+            f.write("#EXTM3U\n" + "".join(f"#EXTINF:6.0,\nseg_{i}.m4s\n" for i in range(segments)))
+        response = await process.get_hls_playlist("task-1")
+        assert response.headers["cache-control"] == "no-cache"
+        with open(response.path) as f:
+            assert f.read().count(".m4s") == segments
+
+    # 플레이리스트 경로가 바뀌면 새 경로를 따라감
+    moved = os.path.join(os.path.dirname(playlist), "moved.m3u8")
+    with open(moved, "w") as f:
+        f.write("#EXTM3U\n#EXT-X-ENDLIST\n")
+    await task_manager.update_playlist("task-1", moved)
+    assert (await process.get_hls_playlist("task-1")).path == moved
+
+@pytest.mark.asyncio
+async def test_playlist_requires_hls_task(hls_task):
+    """HLS 출력 모드가 아닌 작업과 없는 작업은 404인지 테스트"""
+    await task_manager.create_task("task-2")
+    for task_id in ("task-2", "missing"):
+        with pytest.raises(HTTPException) as error:
+            await process.get_hls_playlist(task_id)
+        assert error.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_tts_waits_for_slow_hls_writer(hls_task, monkeypatch):
+    """HLS 생성이 밀리면 TTS 오디오가 대기열 크기 이상 쌓이지 않는지 테스트"""
+    await task_manager.create_task("task-1")
+    monkeypatch.setattr(config, "HLS_TTS_QUEUE_MAX_CHUNKS", 2)
+    produced, consumed = [], []
+
+    async def process_text(task_id, video_path, audio_callback, progress_callback, workspace):
+        for i in range(10):
+            await emit_audio(audio_callback, np.full(4, i, dtype=np.int16))
+            produced.append(i)
+            assert len(produced) - len(consumed) <= 2 + 1
+        return "tts.wav"
+
+    async def process_video_progressive(task_id, video_path, chunks, sample_rate, original_audio_path, **kwargs):
+        async for chunk in chunks:
+            await asyncio.sleep(0.01)
+            consumed.append(np.frombuffer(chunk, dtype=np.int16)[0])
+        return "output.m3u8"
+
+    monkeypatch.setattr(process.tts_service, "process_text", process_text)
+    monkeypatch.setattr(process.video_audio_merger, "process_video_progressive", process_video_progressive)
+    progress = ProgressReporter("task-1")
+    output = await process.process_progressive_output(
+        "task-1", "video.mp4", "audio.wav", None, None, progress, TaskWorkspace("task-1")
+    )
+    await progress.flush()
+    assert output == "output.m3u8"
+    assert consumed == list(range(10))
+
+@pytest.mark.asyncio
+async def test_failed_hls_writer_does_not_block_tts(hls_task, monkeypatch):
+    """HLS 생성이 먼저 실패하면 가득 찬 대기열에서 TTS가 멈추지 않고 오류로 끝나는지 테스트"""
+    await task_manager.create_task("task-1")
+    monkeypatch.setattr(config, "HLS_TTS_QUEUE_MAX_CHUNKS", 1)
+
+    async def process_text(task_id, video_path, audio_callback, progress_callback, workspace):
+        for i in range(10):
+            await emit_audio(audio_callback, np.zeros(4, dtype=np.int16))
+        return "tts.wav"
+
+    async def process_video_progressive(task_id, video_path, chunks, sample_rate, original_audio_path, **kwargs):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("배경음 분리 실패")
+
+    monkeypatch.setattr(process.tts_service, "process_text", process_text)
+    monkeypatch.setattr(process.video_audio_merger, "process_video_progressive", process_video_progressive)
+    with pytest.raises(RuntimeError, match="배경음 분리 실패"):
+        await asyncio.wait_for(process.process_progressive_output(
+            "task-1", "video.mp4", "audio.wav", None, None, ProgressReporter("task-1"), TaskWorkspace("task-1")
+        ), timeout=2)
@@ -0,0 +1,190 @@
+import os
+import time
+import asyncio
+import pytest
+from collections import namedtuple
+from fakeredis import FakeServer, aioredis as fake_aioredis
+from services import janitor as janitor_module
+from services.janitor import ArtifactJanitor, ArtifactKind
+from services.task_manager import task_manager, TaskStatus
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+
+@pytest.fixture
+def janitor(monkeypatch, tmp_path):
+    """다른 테스트와 분리된 가짜 Redis와 임시 루트를 쓰는 정리기 (디스크 1000B 중 사용량은 테스트에서 지정)"""
+    monkeypatch.setattr(task_manager, "redis", fake_aioredis.FakeRedis(server=FakeServer(), decode_responses=True))
+    janitor = ArtifactJanitor(root=str(tmp_path))
+    janitor.ttl = 3600
+    janitor.high_water = 0.5
+    janitor.low_water = 0.42
+    janitor.BATCH_SIZE = 2
+    janitor.disk_used = 0
+    monkeypatch.setattr(janitor_module.shutil, "disk_usage",
+                        lambda path: DiskUsage(1000, janitor.disk_used, 1000 - janitor.disk_used))
+    return janitor
+
+async def add_task(task_id: str, status: TaskStatus) -> None:
+    await task_manager.create_task(task_id)
+    await task_manager.update_task_status(task_id, status)
+
+async def add_artifact(janitor, task_id: str, name: str, size: int = 100, last_used: float = None,
+                       kind: ArtifactKind = ArtifactKind.INTERMEDIATE) -> str:
+    """작업 공간에 파일을 만들고 등록 (last_used를 주면 마지막 사용 시각 지정)"""
+    path = os.path.join(janitor.root, "tasks", task_id, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    await janitor.track(task_id, path, kind)
+    if last_used is not None:
+        await janitor.redis.zadd(janitor.LRU_INDEX, {f"{task_id}:{path}": last_used})
+    return path
+
+@pytest.mark.asyncio
+async def test_active_task_artifacts_are_never_deleted(janitor):
+    """처리 중인 작업의 산출물은 보관 시간이 지나고 디스크가 부족해도 삭제하지 않는지 테스트"""
+    await add_task("active", TaskStatus.PROCESSING)
+    await add_task("pending", TaskStatus.PENDING)
+    paths = [
+        await add_artifact(janitor, "active", "input.mp4", last_used=0),
+        await add_artifact(janitor, "active", "result.mp4", last_used=0, kind=ArtifactKind.OUTPUT),
+        await add_artifact(janitor, "pending", "input.mp4", last_used=0),
+    ]
+    janitor.disk_used = 900
+
+    result = await asyncio.wait_for(janitor.sweep(), timeout=5)
+    assert result["ttl_bytes"] == result["quota_bytes"] == 0
+    assert all(os.path.exists(path) for path in paths)
+    assert await janitor.redis.zcard(janitor.LRU_INDEX) == 3
+
+@pytest.mark.asyncio
+async def test_ttl_expires_unused_artifacts_of_finished_tasks(janitor):
+    """끝난 작업(만료된 작업 포함)의 산출물 중 마지막 사용 후 보관 시간이 지난 것만 삭제하는지 테스트"""
+    now = time.time()
+    await add_task("done", TaskStatus.COMPLETED)
+    await add_task("failed", TaskStatus.FAILED)
+    old = await add_artifact(janitor, "done", "result.mp4", last_used=now - 7200, kind=ArtifactKind.OUTPUT)
+    recent = await add_artifact(janitor, "done", "merged.txt", last_used=now - 600, kind=ArtifactKind.OUTPUT)
+    failed = await add_artifact(janitor, "failed", "input.mp4", size=50, last_used=now - 3700)
+    # 작업 키가 만료되어 상태를 알 수 없는 산출물
+    orphan = await add_artifact(janitor, "expired", "input.mp4", size=30, last_used=now - 7200)
+
+    # 다운로드하면 사용 시각이 갱신되어 보관 기간이 연장됨
+    await janitor.touch("done", recent)
+    result = await janitor.sweep()
+
+    assert result["ttl_bytes"] == 180
+    assert not any(os.path.exists(path) for path in (old, failed, orphan))
+    assert os.path.exists(recent)
+    assert not os.path.exists(os.path.join(janitor.root, "tasks", "expired"))
+    assert await janitor.redis.hgetall(janitor._key("done")) == {recent: "output"}
+    assert await janitor.redis.zrange(janitor.LRU_INDEX, 0, -1) == [f"done:{recent}"]
+
+@pytest.mark.asyncio
+async def test_quota_pages_past_active_tasks_and_stops_at_low_water(janitor):
+    """용량 정리가 처리 중인 항목을 건너뛰며 다음 묶음으로 넘어가고, 하한에 도달하면 멈추는지 테스트"""
+    await add_task("active", TaskStatus.PROCESSING)
+    await add_task("done", TaskStatus.COMPLETED)
+    # 오래 사용하지 않은 순: a0, a1 | d0, a2 | d1, d2 (묶음 크기 2)
+    order = [("active", "a0"), ("active", "a1"), ("done", "d0"), ("active", "a2"), ("done", "d1"), ("done", "d2")]
+    paths = {name: await add_artifact(janitor, task_id, name, last_used=time.time() - 100 + i)
+             for i, (task_id, name) in enumerate(order)}
+    janitor.disk_used = 600  # 상한 500B 초과, 하한 420B까지 180B 확보 필요
+
+    result = await asyncio.wait_for(janitor.sweep(), timeout=5)
+    assert result["quota_bytes"] == 200
+    assert result["ttl_bytes"] == 0
+    assert [name for name, path in paths.items() if not os.path.exists(path)] == ["d0", "d1"]
+
+    # 끝난 작업의 산출물이 없어도 모든 묶음을 건너뛰고 종료
+    janitor.disk_used = 900
+    await task_manager.update_task_status("done", TaskStatus.PROCESSING)
+    result = await asyncio.wait_for(janitor.sweep(), timeout=5)
+    assert result["quota_bytes"] == 0
+    assert os.path.exists(paths["d2"])
+
+@pytest.mark.asyncio
+async def test_cleanup_task_keeps_outputs(janitor):
+    """완료 후 정리가 중간 산출물만 삭제하고 결과물과 그 디렉토리는 남기는지 테스트"""
+    await add_task("task-1", TaskStatus.COMPLETED)
+    intermediate = await add_artifact(janitor, "task-1", "audio/original.wav", size=120)
+    hls_dir = os.path.join(janitor.root, "tasks", "task-1", "hls")
+    os.makedirs(hls_dir)
+    with open(os.path.join(hls_dir, "seg_0.m4s"), "wb") as f:
+        f.write(b"\0" * 40)
+    await janitor.track("task-1", hls_dir, ArtifactKind.OUTPUT)
+    output = await add_artifact(janitor, "task-1", "output_videos/dubbed.mp4", kind=ArtifactKind.OUTPUT)
+
+    assert await janitor.cleanup_task("task-1") == 120
+    assert not os.path.exists(os.path.dirname(intermediate))
+    assert os.path.exists(output) and os.path.exists(os.path.join(hls_dir, "seg_0.m4s"))
+    assert set(await janitor.redis.hgetall(janitor._key("task-1"))) == {hls_dir, output}
+
+    assert await janitor.cleanup_task("task-1", kinds=(ArtifactKind.OUTPUT,), reason="expired") == 140
+    assert not os.path.exists(os.path.join(janitor.root, "tasks", "task-1"))
+
+@pytest.mark.asyncio
+async def test_stats_account_by_reason(janitor):
+    """정리 사유별 확보 바이트/파일 수와 캐시 정리량이 누적되는지 테스트"""
+    class Cache:
+        def __init__(self):
+            self.requested = []
+
+        def evict(self, max_bytes):
+            self.requested.append(max_bytes)
+            return 25
+
+    cache = Cache()
+    janitor.register_cache(cache)
+    await add_task("task-1", TaskStatus.COMPLETED)
+    await add_artifact(janitor, "task-1", "input.mp4", size=70)
+    await add_artifact(janitor, "task-1", "result.mp4", size=30, last_used=0, kind=ArtifactKind.OUTPUT)
+    await add_artifact(janitor, "task-1", "merged.txt", size=10, kind=ArtifactKind.OUTPUT)
+    await janitor.cleanup_task("task-1")
+    janitor.disk_used = 600
+    await janitor.sweep()
+
+    stats = await janitor.stats()
+    # 만료 30B와 별도로, 용량 정리가 남은 결과물 10B를 지우고도 부족한 170B를 캐시에 요청
+    assert cache.requested == [170]
+    assert {name: value for name, value in stats.items() if name.startswith("reclaimed")} == {
+        "reclaimed_bytes": 135,
+        "reclaimed_files": 3,
+        "reclaimed_bytes:intermediate": 70,
+        "reclaimed_files:intermediate": 1,
+        "reclaimed_bytes:ttl": 30,
+        "reclaimed_files:ttl": 1,
+        "reclaimed_bytes:quota": 10,
+        "reclaimed_files:quota": 1,
+        "reclaimed_bytes:cache": 25,
+        "reclaimed_files:cache": 0,
+    }
+    assert stats["tracked_artifacts"] == 0
+    assert stats["disk_usage"] == 0.6
+    assert stats["last_sweep"]["cache_bytes"] == 25
+
+@pytest.mark.asyncio
+async def test_quota_moves_past_artifacts_that_cannot_be_deleted(janitor):
+    """삭제에 실패한 산출물은 목록에 남기고 다음 묶음으로 넘어가며, 모두 실패해도 정리가 끝나는지 테스트"""
+    await add_task("done", TaskStatus.COMPLETED)
+    # 오래 사용하지 않은 순: busy0, busy1 | d0, d1 (묶음 크기 2)
+    paths = {name: await add_artifact(janitor, "done", name, last_used=time.time() - 100 + i)
+             for i, name in enumerate(["busy0", "busy1", "d0", "d1"])}
+    remove = janitor._remove
+
+    def remove_unless_busy(path):
+        if os.path.basename(path).startswith("busy"):
+            raise PermissionError("사용 중인 파일")
+        return remove(path)
+
+    janitor._remove = remove_unless_busy
+    janitor.disk_used = 600
+
+    result = await asyncio.wait_for(janitor.sweep(), timeout=5)
+    assert result["quota_bytes"] == 200
+    assert [name for name, path in paths.items() if os.path.exists(path)] == ["busy0", "busy1"]
+    assert await janitor.redis.zcard(janitor.LRU_INDEX) == 2
+
+    result = await asyncio.wait_for(janitor.sweep(), timeout=5)
+    assert result["quota_bytes"] == 0
+    assert (await janitor.stats())["reclaimed_files"] == 2
@@ -0,0 +1,58 @@
+import pytest
+from fakeredis import aioredis as fake_aioredis
+from services import tracing
+from services.metrics import Metrics
+from services.tracing import Tracer
+from services.task_manager import task_manager
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """가짜 Redis와 새 레지스트리를 사용하는 지표"""
+    monkeypatch.setattr(task_manager, "redis", fake_aioredis.FakeRedis(decode_responses=True))
+    metrics = Metrics()
+    metrics.enabled = True
+    monkeypatch.setattr(tracing, "metrics", metrics)
+    return metrics
+
+def sample(metrics, name, **labels):
+    return metrics.registry.get_sample_value(name, labels) or 0.0
+
+@pytest.mark.asyncio
+async def test_spans_feed_stage_and_call_metrics(metrics):
+    """단계 시간, 진행 중인 호출 수, 단계별 업로드 바이트가 구간에서 기록되는지 테스트"""
+    tracer = Tracer()
+    tracer.enabled = False  # 추적을 꺼도 지표는 기록
+
+    async def translation():
+        with tracer.span("gcs.upload", bytes=100):
+            assert sample(metrics, "onevoice_external_calls_in_flight", service="gcs") == 1
+        with tracer.span("translate.translate_text") as span:
+            span.retry()
+
+    async with tracer.trace("task-1", "ingest"):
+        with tracer.span("gcs.upload", bytes=7):
+            pass
+    async with tracer.trace("task-1", "pipeline"):
+        await tracer.traced("stage.translation", translation())
+
+    assert sample(metrics, "onevoice_stage_duration_seconds_count", stage="translation", status="ok") == 1
+    assert sample(metrics, "onevoice_external_calls_in_flight", service="gcs") == 0
+    assert sample(metrics, "onevoice_uploaded_bytes_total", stage="translation") == 100
+    assert sample(metrics, "onevoice_uploaded_bytes_total", stage="ingest") == 7
+    assert sample(metrics, "onevoice_external_call_retries_total", call="translate.translate_text") == 1
+    assert await tracer.get_spans("task-1") == []
+
+@pytest.mark.asyncio
+async def test_render_reads_tasks_and_caches(metrics):
+    """수집 시점에 작업 상태별 개수와 캐시 적중률을 읽는지 테스트"""
+    class Cache:
+        def stats(self):
+            return {"hits": 3, "misses": 1, "hit_rate": 0.75}
+
+    metrics.register_cache("tts", Cache())
+    await task_manager.create_task("task-2")
+
+    text = (await metrics.render()).decode()
+    assert 'onevoice_tasks{status="pending"} 1.0' in text
+    assert 'onevoice_cache_requests_total{cache="tts",result="hit"} 3.0' in text
+    assert 'onevoice_cache_hit_ratio{cache="tts"} 0.75' in text
@@ -0,0 +1,69 @@
+import time
+import threading
+import tracemalloc
+import pytest
+from fakeredis import aioredis as fake_aioredis
+from services import config
+from services.profiling import TaskProfiler, ProfileSession, StackSampler, render_flamegraph
+from services.tracing import Tracer
+from services.workspace import TaskWorkspace
+from services.task_manager import task_manager
+
+@pytest.fixture
+def workspace_root(monkeypatch, tmp_path):
+    """가짜 Redis와 임시 작업 공간 루트"""
+    monkeypatch.setattr(task_manager, "redis", fake_aioredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(config, "TEMP_DIR", str(tmp_path))
+    return tmp_path
+
+@pytest.mark.asyncio
+async def test_profile_saves_artifacts_per_stage(workspace_root, monkeypatch):
+    """단계 경계마다 메모리 보고서를 남기고 결과를 manifest에 등록하는지 테스트"""
+    loop_thread = threading.get_ident()
+    blocking_threads = []
+    snapshot, stop = ProfileSession._snapshot, StackSampler.stop
+
+    def recorded(method):
+        def wrapper(self):
+            blocking_threads.append(threading.get_ident())
+            return method(self)
+        return wrapper
+
+    # 스냅샷과 샘플러 종료 대기는 이벤트 루프를 막지 않아야 함
+    monkeypatch.setattr(ProfileSession, "_snapshot", recorded(snapshot))
+    monkeypatch.setattr(StackSampler, "stop", recorded(stop))
+    tracer = Tracer()
+    tracer.enabled = True
+    tracer.endpoint = ""
+    profiler = TaskProfiler()
+    profiler.interval = 0.001
+    await task_manager.create_task("task-1")
+
+    async def stage():
+        data = [bytearray(1024) for _ in range(200)]
+        time.sleep(0.02)
+        return data
+
+    async with tracer.trace("task-1", "pipeline") as root:
+        async with profiler.profile("task-1", root) as session:
+            await tracer.traced("stage.stt", stage())
+            await tracer.traced("stage.merge", stage())
+        assert root.trace.on_stage_end is None
+
+    assert not tracemalloc.is_tracing()
+    assert len(blocking_threads) == 5 and loop_thread not in blocking_threads
+    assert session.sampler.samples > 0
+    workspace = TaskWorkspace("task-1")
+    with open(await workspace.resolve("profile_memory"), encoding="utf-8") as f:
+        report = f.read()
+    assert "stage.stt 종료" in report and "stage.merge 종료" in report
+    with open(await workspace.resolve("profile_flamegraph"), encoding="utf-8") as f:
+        assert f.read().startswith("<svg")
+    assert await workspace.resolve("profile_stacks")
+
+def test_flamegraph_widths_follow_samples():
+    """플레임그래프 막대 너비가 샘플 수에 비례하는지 테스트"""
+    svg = render_flamegraph({"main;a": 3, "main;b": 1}, "test", width=400)
+    assert 'width="400.0"' in svg
+    assert 'width="300.0"' in svg
+    assert 'width="100.0"' in svg
@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from services import progress as progress_module
+from services.progress import ProgressReporter
+from services.task_manager import ProcessingStage
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Redis 대신 기록된 진행률을 모으는 목록"""
+    recorded = []
+
+    async def update_task_status(task_id, status=None, stage=None, progress=None, **kwargs):
+        recorded.append((stage, progress))
+
+    monkeypatch.setattr(progress_module.task_manager, "update_task_status", update_task_status)
+    return recorded
+
+@pytest.mark.asyncio
+async def test_reports_are_coalesced(writes):
+    """짧은 간격의 보고가 최신 값 하나의 쓰기로 합쳐지는지 테스트"""
+    reporter = ProgressReporter("task", min_interval=0.2)
+    callback = reporter.stage_callback(ProcessingStage.TRANSLATION, 25, 60)
+    # 첫 보고 묶음은 바로 기록되고, 두 번째 묶음은 min_interval 동안 대기하다 flush로 기록됨
+    for index in range(1, 51):
+        callback(index / 100)
+    await asyncio.sleep(0.05)
+    for index in range(51, 101):
+        callback(index / 100)
+    await asyncio.sleep(0.05)
+    assert writes == [(ProcessingStage.TRANSLATION, 42)]
+    await reporter.flush()
+
+    assert reporter.reports == 100
+    assert reporter.writes == 2
+    assert writes == [(ProcessingStage.TRANSLATION, 42), (ProcessingStage.TRANSLATION, 60)]
+
+@pytest.mark.asyncio
+async def test_parallel_progress_is_monotonic(writes):
+    """병렬 단계의 평균 진행률이 감소하지 않는지 테스트"""
+    reporter = ProgressReporter("task", min_interval=0)
+    stt, diarization = reporter.parallel_callbacks([ProcessingStage.STT, ProcessingStage.DIARIZATION], 0, 20)
+    stt(1.0)
+    diarization(0.5)
+    stt(0.2)
+    await reporter.flush()
+
+    assert reporter.progress == 15
+    assert [progress for _, progress in writes] == sorted(progress for _, progress in writes)
@@ -0,0 +1,156 @@
+import time
+import wave
+import asyncio
+import threading
+from concurrent.futures import Future
+import numpy as np
+import pytest
+from services import separation
+from services.separation import (
+    SeparationJob, SeparationService, SeparationCancelled, OverlapAddWriter, iter_windows, count_windows
+)
+
+class FakeSeparationService(SeparationService):
+    """모델 없이 처리 순서와 진행률만 기록하는 분리 워커"""
+
+    def __init__(self, tmp_path):
+        super().__init__(num_threads=1, num_workers=1)
+        self.output_dir = str(tmp_path)
+        self.order = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _separate(self, job):
+        self.order.append(job.job_id)
+        job.report(0.0)
+        self.release.wait()
+        job.report(0.5)
+        job.report(1.0)
+        return f"{job.output_dir}/no_vocals.wav"
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_queue_order_with_progress(tmp_path):
+    """작업이 들어온 순서대로 처리되고 진행률이 이벤트 루프에서 전달되는지 테스트"""
+    service = FakeSeparationService(tmp_path)
+    loop_thread = threading.get_ident()
+    progress = {}
+
+    def callback(job_id):
+        def report(value):
+            assert threading.get_ident() == loop_thread
+            progress.setdefault(job_id, []).append(value)
+        return report
+
+    try:
+        results = await asyncio.gather(*(
+            service.separate("in.wav", job_id, callback(job_id)) for job_id in ("a", "b", "c")
+        ))
+    finally:
+        await service.shutdown()
+
+    assert service.order == ["a", "b", "c"]
+    assert results == [f"{tmp_path}/{job_id}/no_vocals.wav" for job_id in ("a", "b", "c")]
+    assert progress == {job_id: [0.0, 0.5, 1.0] for job_id in ("a", "b", "c")}
+
+@pytest.mark.asyncio
+async def test_shutdown_is_bounded_and_rejects_queued_jobs(tmp_path):
+    """진행 중인 작업이 끝나지 않아도 제한 시간 안에 반환하고 대기 작업은 취소하는지 테스트"""
+    service = FakeSeparationService(tmp_path)
+    service.release.clear()
+    running = asyncio.ensure_future(service.separate("in.wav", "running"))
+    queued = asyncio.ensure_future(service.separate("in.wav", "queued"))
+    while not service.order:
+        await asyncio.sleep(0.01)
+
+    started = time.perf_counter()
+    await service.shutdown(timeout=0.2)
+    assert time.perf_counter() - started < 1.0
+
+    # 진행 중인 작업이 끝나면 대기 작업은 처리하지 않고 실패시킴
+    service.release.set()
+    assert await running == f"{tmp_path}/running/no_vocals.wav"
+    with pytest.raises(SeparationCancelled):
+        await queued
+    assert service.order == ["running"]
+
+def write_wav(path, frames: np.ndarray, sample_rate: int = 100) -> str:
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(frames.shape[1])
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(frames.astype("<i2").tobytes())
+    return str(path)
+
+@pytest.mark.parametrize("total", [1, 40, 41, 70, 71, 100, 123, 400])
+def test_identity_separator_round_trip(tmp_path, total):
+    """분리 결과가 입력과 같으면 창 분할과 오버랩-애드 후에도 입력이 그대로 복원되는지 테스트"""
+    window, overlap = 40, 10
+    source = np.random.default_rng(total).integers(-32768, 32767, (total, 2), dtype=np.int16)
+    input_path = write_wav(tmp_path / "in.wav", source)
+    output_path = str(tmp_path / "out.wav")
+
+    with wave.open(input_path, "rb") as reader, wave.open(output_path, "wb") as output:
+        expected_windows = count_windows(reader.getnframes(), window, overlap)
+        output.setnchannels(2)
+        output.setsampwidth(2)
+        output.setframerate(100)
+        writer = OverlapAddWriter(output, overlap)
+        windows = list(iter_windows(reader, window, overlap))
+        assert len(windows) == expected_windows
+        assert all(len(chunk) == window for chunk in windows[:-1])
+        for i, chunk in enumerate(windows):
+            writer.write(chunk, last=i == len(windows) - 1)
+
+    with wave.open(output_path, "rb") as result:
+        restored = np.frombuffer(result.readframes(result.getnframes()), dtype="<i2").reshape(-1, 2)
+    assert np.array_equal(restored, source)
+
+@pytest.mark.parametrize("estimated_windows", [1, 2, 50])
+def test_chunked_separation_writes_every_window(tmp_path, monkeypatch, estimated_windows):
+    """예상 창 개수가 실제와 달라도 읽은 창을 모두 기록하고 마지막 창의 겹침 구간까지 비우는지 테스트"""
+    monkeypatch.setattr(separation, "separate_chunk", lambda model, chunk: chunk)
+    monkeypatch.setattr(separation, "count_windows", lambda total, window, overlap: estimated_windows)
+    source = np.random.default_rng(0).integers(-20000, 20000, (123, 2), dtype=np.int16)
+    input_path = write_wav(tmp_path / "in.wav", source)
+    output_path = str(tmp_path / "out.wav")
+
+    service = SeparationService(num_threads=1, num_workers=1)
+    service.SAMPLE_RATE = 100
+    service.chunk_seconds, service.overlap_seconds = 0.4, 0.1
+    progress = []
+    job = SeparationJob("job", input_path, str(tmp_path), None, None)
+    job.report = progress.append
+    service._separate_chunked(job, None, output_path)
+
+    with wave.open(output_path, "rb") as result:
+        restored = np.frombuffer(result.readframes(result.getnframes()), dtype="<i2").reshape(-1, 2)
+    assert restored.shape == source.shape
+    assert np.abs(restored.astype(np.int32) - source).max() <= 1
+    assert len(progress) == 4 and max(progress) <= 1.0
+
+def test_pool_path_does_not_load_model_in_main_process(tmp_path):
+    """프로세스 풀로 분리할 때는 이 프로세스에서 모델을 로드하지 않는지 테스트"""
+    class Pool:
+        def submit(self, fn, chunk):
+            future = Future()
+            future.set_result(chunk)
+            return future
+
+    class PoolSeparationService(SeparationService):
+        def _load_model(self):
+            raise AssertionError("프로세스 풀 사용 시 모델을 로드하면 안 됨")
+
+        def _get_pool(self):
+            return Pool()
+
+    service = PoolSeparationService(num_threads=2, num_workers=2)
+    service.chunk_seconds, service.overlap_seconds = 0.01, 0.002
+    source = np.random.default_rng(1).integers(-20000, 20000, (2000, 2), dtype=np.int16)
+    input_path = write_wav(tmp_path / "in.wav", source, sample_rate=SeparationService.SAMPLE_RATE)
+    job = SeparationJob("job", input_path, str(tmp_path / "job"), None, None)
+
+    output_path = service._separate(job)
+    with wave.open(output_path, "rb") as result:
+        assert result.getframerate() == SeparationService.SAMPLE_RATE
+        restored = np.frombuffer(result.readframes(result.getnframes()), dtype="<i2").reshape(-1, 2)
+    assert np.abs(restored.astype(np.int32) - source).max() <= 1
@@ -0,0 +1,22 @@
+from services.speaking_rate import SpeakingRateModel
+
+def test_choose_speaking_rate_from_default_cps():
+    """기본 CPS로 speaking_rate를 예측하고 0.05 단위로 올림하는지 테스트"""
+    model = SpeakingRateModel(model_path="", default_cps=5.0)
+    # 10글자 / 5cps = 2초, 목표 1.6초 -> 1.25배
+    assert model.choose_speaking_rate("voice", "가나다라마 바사아자차", 1.6) == 1.25
+    # 목표보다 짧으면 느리게 하지 않음
+    assert model.choose_speaking_rate("voice", "가나다", 5.0) == 1.0
+
+def test_observe_learns_per_voice_cps(tmp_path):
+    """합성 결과로 음성별 CPS를 학습하고 저장하는지 테스트"""
+    model_path = str(tmp_path / "model.json")
+    model = SpeakingRateModel(model_path=model_path, default_cps=5.0)
+    # speaking_rate 2.0으로 10글자를 0.5초에 합성 -> 1.0 기준 10cps
+    model.observe("fast", "가나다라마바사아자차", 0.5, 2.0)
+    assert model.predict_duration("fast", "가나다라마바사아자차") == 1.0
+    assert model.predict_duration("other", "가나다라마바사아자차") == 2.0
+
+    model.save()
+    reloaded = SpeakingRateModel(model_path=model_path, default_cps=5.0)
+    assert reloaded.cps["fast"] == 10.0
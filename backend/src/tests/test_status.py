@@ -0,0 +1,59 @@
+import json
+import pytest
+from fakeredis import FakeServer, aioredis as fake_aioredis
+from src.routes import process
+from src.services.task_manager import task_manager, TaskEventBroker, TaskStatus
+
+class ConnectedRequest:
+    async def is_disconnected(self):
+        return False
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """다른 테스트와 분리된 가짜 Redis (이벤트 구독 포함)"""
+    redis = fake_aioredis.FakeRedis(server=FakeServer(), decode_responses=True)
+    monkeypatch.setattr(task_manager, "redis", redis)
+    monkeypatch.setattr(task_manager, "events", TaskEventBroker(redis))
+
+async def create_tasks() -> None:
+    """산출물이 등록된 작업 하나와 이전 형식 작업 하나"""
+    await task_manager.create_task("task-1")
+    await task_manager.add_artifact("task-1", "output_video", "/srv/onevoice/temp/tasks/task-1/output_videos/a.mp4")
+    await task_manager.add_artifact("task-1", "input_video", "/srv/onevoice/temp/tasks/task-1/input/a.mp4")
+    await task_manager.redis.set("task:legacy", json.dumps({"status": "completed"}))
+
+@pytest.mark.asyncio
+async def test_status_responses_expose_artifact_names_only(fake_redis):
+    """상태 조회 응답에 산출물의 서버 경로 대신 이름만 포함되는지 테스트"""
+    await create_tasks()
+    expected = ["input_video", "output_video"]
+    status = await process.get_status("task-1")
+    assert status["artifacts"] == expected
+    # 기존 필드에 더해 추가된 필드
+    assert {"created_at", "updated_at", "playlist"} <= set(status) and status["playlist"] is None
+    assert (await process.get_status("legacy"))["artifacts"] == []
+
+    bulk = await process.get_bulk_status(process.BulkStatusRequest(task_ids=["task-1", "legacy", "missing"]))
+    assert bulk["task-1"]["artifacts"] == expected and bulk["missing"] is None
+
+    listed = await process.list_tasks(status=TaskStatus.PENDING, stage=None, older_than=None, newer_than=None,
+                                      limit=10, offset=0)
+    assert [task["artifacts"] for task in listed["tasks"]] == [expected]
+
+    response = await process.stream_task_events("task-1", ConnectedRequest())
+    events = response.body_iterator
+    assert await events.__anext__() == "retry: 3000\n\n"
+    snapshot = await events.__anext__()
+    await events.aclose()
+    await task_manager.events.close()
+    assert "/srv/onevoice" not in snapshot
+    assert json.loads(snapshot.split("data: ", 1)[1])["artifacts"] == expected
+
+@pytest.mark.asyncio
+async def test_dev_status_update_hides_artifact_paths(fake_redis):
+    """개발용 상태 갱신 응답도 산출물 이름만 포함하는지 테스트"""
+    await create_tasks()
+    response = await process.update_task_status("task-1", process.TaskStatusUpdate(status="processing", progress=50))
+    assert response["task_data"]["artifacts"] == ["input_video", "output_video"]
+    assert response["task_data"]["progress"] == 50
+    assert "/srv/onevoice" not in json.dumps(response)
@@ -0,0 +1,188 @@
+import json
+import time
+import asyncio
+import pytest
+from redis.asyncio.client import Pipeline
+from fakeredis import FakeServer, aioredis as fake_aioredis
+from services.task_manager import TaskManager, TaskEventBroker, TaskStatus, ProcessingStage
+
+@pytest.fixture
+def manager():
+    """다른 테스트와 분리된 가짜 Redis를 사용하는 작업 관리자"""
+    manager = TaskManager()
+    manager.redis = fake_aioredis.FakeRedis(server=FakeServer(), decode_responses=True)
+    manager.events = TaskEventBroker(manager.redis)
+    return manager
+
+@pytest.mark.asyncio
+async def test_updates_bump_revision(manager):
+    """갱신마다 _rev가 증가하고 조회 결과에는 내부 필드가 드러나지 않는지 테스트"""
+    await manager.create_task("task-1")
+    assert await manager.redis.hget("task:task-1", "_rev") == "0"
+
+    assert await manager.update_fields("task-1", {"progress": 10})
+    assert await manager.add_artifact("task-1", "audio", "/tmp/audio.wav")
+    assert await manager.update_fields("task-1", {"progress": 20})
+    assert await manager.redis.hget("task:task-1", "_rev") == "3"
+
+    task = await manager.get_task_status("task-1")
+    assert "_rev" not in task
+    assert task["progress"] == 20
+    assert task["artifacts"] == {"audio": "/tmp/audio.wav"}
+
+@pytest.mark.asyncio
+async def test_fields_round_trip_as_json(manager):
+    """필드 값이 JSON으로 저장되어 타입(None, 숫자, 열거형 등)이 유지되는지 테스트"""
+    await manager.create_task("task-1")
+    fields = {
+        "status": TaskStatus.PROCESSING,
+        "stage": ProcessingStage.TTS,
+        "progress": 42.5,
+        "result": None,
+        "error": "따옴표 \" 와 줄바꿈\n",
+        "extra": {"speakers": [1, 2]},
+    }
+    await manager.update_fields("task-1", fields)
+
+    raw = await manager.redis.hgetall("task:task-1")
+    assert raw["status"] == '"processing"' and raw["progress"] == "42.5" and raw["result"] == "null"
+    task = await manager.get_task_status("task-1")
+    assert {name: task[name] for name in fields} == {**fields, "status": "processing", "stage": "tts"}
+    assert task["updated_at"] >= task["created_at"]
+
+@pytest.mark.asyncio
+async def test_legacy_string_key_is_migrated(manager):
+    """이전 형식(JSON 문자열) 키는 그대로 읽히고, 첫 갱신 때 기존 값을 유지한 채 해시로 변환되는지 테스트"""
+    legacy = {"status": "processing", "stage": "stt", "progress": 30, "result": None}
+    await manager.redis.set("task:legacy", json.dumps(legacy))
+    assert await manager.get_task_status("legacy") == legacy
+    assert (await manager.get_task_statuses(["legacy"]))["legacy"] == legacy
+
+    assert await manager.update_fields("legacy", {"progress": 40})
+    assert await manager.redis.type("task:legacy") == "hash"
+    assert await manager.redis.hget("task:legacy", "_rev") == "2"
+    task = await manager.get_task_status("legacy")
+    assert task["stage"] == "stt" and task["progress"] == 40 and task["result"] is None
+
+@pytest.mark.asyncio
+async def test_missing_task_is_not_recreated(manager, monkeypatch):
+    """없는 작업은 갱신하지 않고, 확인 뒤 기록 전에 삭제된 작업도 되살리지 않는지 테스트"""
+    assert not await manager.update_fields("missing", {"progress": 10})
+    assert not await manager.add_artifact("missing", "audio", "/tmp/audio.wav")
+    assert not await manager.redis.exists("task:missing")
+
+    await manager.create_task("task-1")
+    deleted = []
+    original_execute = Pipeline.execute
+
+    async def execute(self, raise_on_error=True):
+        if self.explicit_transaction and not deleted:
+            # WATCH 이후 다른 연결에서 키가 만료·삭제된 상황
+            deleted.append(await manager.redis.delete("task:task-1"))
+        return await original_execute(self, raise_on_error)
+
+    monkeypatch.setattr(Pipeline, "execute", execute)
+    assert not await manager.update_fields("task-1", {"progress": 10})
+    assert deleted == [1]
+    assert not await manager.redis.exists("task:task-1")
+
+@pytest.mark.asyncio
+async def test_change_is_published_in_transaction(manager, monkeypatch):
+    """변경된 필드의 발행이 필드 기록과 같은 MULTI 트랜잭션에 포함되는지 테스트"""
+    await manager.create_task("task-1")
+    transactions = []
+    original_execute = Pipeline.execute
+
+    async def execute(self, raise_on_error=True):
+        if self.explicit_transaction:
+            transactions.append([args[0] for args, _ in self.command_stack])
+        return await original_execute(self, raise_on_error)
+
+    monkeypatch.setattr(Pipeline, "execute", execute)
+    queue = await manager.events.subscribe("task-events:task-1")
+    await manager.update_fields("task-1", {"progress": 50})
+
+    assert len(transactions) == 1
+    assert transactions[0][:3] == ["HSET", "HINCRBY", "EXPIRE"]
+    assert transactions[0][-1] == "PUBLISH"
+    try:
+        assert (await asyncio.wait_for(queue.get(), timeout=2))["progress"] == 50
+    finally:
+        await manager.events.close()
+
+@pytest.mark.asyncio
+async def test_index_keeps_entry_time_and_moves_between_indexes(manager):
+    """같은 상태를 다시 기록해도 처음 들어간 시각을 유지하고(NX), 바뀐 상태는 이전 인덱스에서 제거되는지 테스트"""
+    await manager.create_task("task-1")
+    await manager.update_task_status("task-1", TaskStatus.PROCESSING, stage=ProcessingStage.STT)
+    entered = await manager.redis.zscore("tasks:status:processing", "task-1")
+    await manager.update_task_status("task-1", TaskStatus.PROCESSING, stage=ProcessingStage.TTS)
+
+    assert await manager.redis.zscore("tasks:status:processing", "task-1") == entered
+    assert await manager.redis.zscore("tasks:status:pending", "task-1") is None
+    assert await manager.redis.zscore("tasks:stage:stt", "task-1") is None
+    assert await manager.redis.zscore("tasks:stage:tts", "task-1") is not None
+    assert await manager.count_tasks() == {"pending": 0, "processing": 1, "completed": 0, "failed": 0}
+
+@pytest.mark.asyncio
+async def test_bulk_status_reads_hashes_legacy_and_missing(manager):
+    """일괄 조회가 해시, 이전 형식 키, 없는 작업을 함께 처리하는지 테스트"""
+    await manager.create_task("task-1")
+    await manager.redis.set("task:legacy", json.dumps({"status": "completed", "progress": 100}))
+
+    statuses = await manager.get_task_statuses(["task-1", "legacy", "missing", "task-1"])
+    assert list(statuses) == ["task-1", "legacy", "missing"]
+    assert statuses["task-1"]["status"] == "pending"
+    assert statuses["legacy"] == {"status": "completed", "progress": 100}
+    assert statuses["missing"] is None
+
+@pytest.mark.asyncio
+async def test_status_and_stage_filter_before_limit(manager):
+    """상태와 단계를 함께 지정하면 교집합에서 LIMIT을 적용하고 임시 키를 남기지 않는지 테스트"""
+    for i in range(6):
+        await manager.create_task(f"stt-{i}")
+        await manager.update_task_status(f"stt-{i}", TaskStatus.PROCESSING, stage=ProcessingStage.STT)
+    for i in range(3):
+        await manager.create_task(f"tts-{i}")
+        await manager.update_task_status(f"tts-{i}", TaskStatus.PROCESSING, stage=ProcessingStage.TTS)
+    await manager.create_task("failed")
+    await manager.update_task_status("failed", TaskStatus.PROCESSING, stage=ProcessingStage.TTS)
+    await manager.fail_task("failed", "오류")
+
+    tasks = await manager.query_tasks(status=TaskStatus.PROCESSING, stage=ProcessingStage.TTS, limit=2)
+    assert [task["task_id"] for task in tasks] == ["tts-0", "tts-1"]
+    assert tasks[0]["since"] == await manager.redis.zscore("tasks:status:processing", "tts-0")
+    tasks = await manager.query_tasks(status=TaskStatus.PROCESSING, stage=ProcessingStage.TTS, limit=2, offset=2)
+    assert [task["task_id"] for task in tasks] == ["tts-2"]
+    assert await manager.redis.keys("tasks:query:*") == []
+
+@pytest.mark.asyncio
+async def test_expired_tasks_are_pruned_from_indexes(manager):
+    """키가 만료된 작업은 조회 시와 prune_indexes에서 모든 인덱스에서 제거되는지 테스트"""
+    for task_id in ("task-1", "task-2", "task-3"):
+        await manager.create_task(task_id)
+        await manager.update_task_status(task_id, TaskStatus.PROCESSING, stage=ProcessingStage.STT)
+    await manager.redis.delete("task:task-1", "task:task-2")
+
+    tasks = await manager.query_tasks(status=TaskStatus.PROCESSING, stage=ProcessingStage.STT)
+    assert [task["task_id"] for task in tasks] == ["task-3"]
+    assert await manager.redis.zscore("tasks:stage:stt", "task-1") is None
+    assert await manager.redis.zscore("tasks:created", "task-1") is not None
+
+    assert await manager.prune_indexes(0) == 0
+    assert await manager.prune_indexes(time.time()) == 2
+    for index in ("tasks:created", "tasks:status:processing", "tasks:stage:stt"):
+        assert await manager.redis.zrange(index, 0, -1) == ["task-3"]
+
+@pytest.mark.asyncio
+async def test_completed_task_is_indexed_under_final_stage(manager):
+    """완료된 작업이 파이프라인이 마지막으로 끝낸 단계로 기록·색인되는지 테스트"""
+    await manager.create_task("task-1")
+    await manager.update_task_status("task-1", TaskStatus.PROCESSING, stage=ProcessingStage.TTS)
+    await manager.complete_task("task-1", "/tmp/output.mp4", stage=ProcessingStage.MUX)
+
+    task = await manager.get_task_status("task-1")
+    assert task["status"] == "completed" and task["stage"] == "mux" and task["progress"] == 100
+    tasks = await manager.query_tasks(status=TaskStatus.COMPLETED, stage=ProcessingStage.MUX)
+    assert [task["task_id"] for task in tasks] == ["task-1"]
+    assert await manager.redis.zscore("tasks:stage:tts", "task-1") is None
@@ -0,0 +1,34 @@
+import numpy as np
+from services.time_stretch import time_stretch, stretch_to_duration
+
+SAMPLE_RATE = 24000
+
+def sine(frequency: float, duration: float) -> np.ndarray:
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * frequency * t) * 8000).astype(np.int16)
+
+def dominant_frequency(samples: np.ndarray) -> float:
+    spectrum = np.abs(np.fft.rfft(samples.astype(np.float64)))
+    return np.argmax(spectrum) * SAMPLE_RATE / len(samples)
+
+def test_time_stretch_exact_length_and_pitch():
+    """목표 길이를 정확히 맞추고 피치를 유지하는지 테스트"""
+    samples = sine(220, 2.0)
+    for target_length in (int(len(samples) / 1.4), int(len(samples) * 1.2)):
+        stretched = time_stretch(samples, target_length, SAMPLE_RATE)
+        assert len(stretched) == target_length
+        assert stretched.dtype == np.int16
+        assert abs(dominant_frequency(stretched) - 220) < 2
+
+def test_time_stretch_multichannel():
+    """스테레오 입력의 채널 구성 유지 테스트"""
+    samples = np.stack([sine(220, 1.0), sine(330, 1.0)], axis=1)
+    stretched = stretch_to_duration(samples, SAMPLE_RATE, 0.8)
+    assert stretched.shape == (int(0.8 * SAMPLE_RATE), 2)
+
+def test_time_stretch_edge_cases():
+    """동일 길이 및 빈 입력 처리 테스트"""
+    samples = sine(220, 0.5)
+    assert time_stretch(samples, len(samples), SAMPLE_RATE) is samples
+    assert len(time_stretch(samples, 0, SAMPLE_RATE)) == 0
+    assert len(time_stretch(samples[:0], 100, SAMPLE_RATE)) == 100
@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from fakeredis import aioredis as fake_aioredis
+from services.tracing import Tracer, NULL_SPAN
+from services.task_manager import task_manager
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """가짜 Redis에 구간을 저장하는 추적기"""
+    monkeypatch.setattr(task_manager, "redis", fake_aioredis.FakeRedis(decode_responses=True))
+    tracer = Tracer()
+    tracer.enabled = True
+    tracer.endpoint = ""
+    return tracer
+
+@pytest.mark.asyncio
+async def test_spans_follow_tasks_and_threads(tracer):
+    """asyncio 태스크와 스레드 안의 구간이 부모 구간 아래에 기록되는지 테스트"""
+    def blocking_call():
+        with tracer.span("rpc", bytes=10):
+            return 1
+
+    async def stage():
+        with tracer.span("gcs.upload", bytes=100) as span:
+            span.retry()
+        return await asyncio.to_thread(blocking_call)
+
+    async with tracer.trace("task-1", "pipeline") as root:
+        await asyncio.create_task(tracer.traced("stage.stt", stage()))
+
+    spans = {span["name"]: span for span in await tracer.get_spans("task-1")}
+    assert spans["pipeline"]["span_id"] == root.span_id
+    assert spans["stage.stt"]["parent_id"] == root.span_id
+    assert spans["gcs.upload"]["parent_id"] == spans["stage.stt"]["span_id"]
+    assert spans["rpc"]["parent_id"] == spans["stage.stt"]["span_id"]
+    assert spans["gcs.upload"]["retries"] == 1
+    assert spans["rpc"]["bytes"] == 10
+
+@pytest.mark.asyncio
+async def test_errors_and_breakdown(tracer):
+    """예외가 난 구간의 상태와 이름별 합계 테스트"""
+    with pytest.raises(ValueError):
+        async with tracer.trace("task-2", "pipeline"):
+            for _ in range(3):
+                with tracer.span("translate.translate_text", bytes=5):
+                    pass
+            raise ValueError("실패")
+
+    spans = await tracer.get_spans("task-2")
+    breakdown = tracer.breakdown(spans)
+    assert breakdown["translate.translate_text"]["count"] == 3
+    assert breakdown["translate.translate_text"]["bytes"] == 15
+    assert breakdown["pipeline"]["errors"] == 1
+
+@pytest.mark.asyncio
+async def test_otlp_export_format(tracer):
+    """OTLP/HTTP JSON 변환 테스트"""
+    async with tracer.trace("0f8fad5b-d9cb-469f-a165-70867728950e", "pipeline"):
+        with tracer.span("ffmpeg", output="out.mp4"):
+            pass
+
+    spans = await tracer.get_spans("0f8fad5b-d9cb-469f-a165-70867728950e")
+    otlp = tracer.to_otlp("0f8fad5b-d9cb-469f-a165-70867728950e", spans)
+    exported = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert {span["traceId"] for span in exported} == {"0f8fad5bd9cb469fa16570867728950e"}
+    child = next(span for span in exported if span["name"] == "ffmpeg")
+    assert child["parentSpanId"] == next(span["spanId"] for span in exported if span["name"] == "pipeline")
+    assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+
+def test_span_outside_trace_is_noop(tracer):
+    """추적 밖에서는 구간을 만들지 않는지 테스트"""
+    assert tracer.span("gcs.upload") is NULL_SPAN
@@ -0,0 +1,178 @@
+import time
+import zlib
+import asyncio
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from services import config
+from services.clients import clients
+from services.tts import TTSService
+
+class FakeTTSClient:
+    """텍스트와 음성으로 결정되는 PCM을 반환하고, 앞 세그먼트일수록 늦게 응답하는 가짜 TTS 클라이언트"""
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.calls = []
+
+    def synthesize_speech(self, input, voice, audio_config):
+        text = input.text
+        self.calls.append(text)
+        index = int(text.split()[-1])
+        time.sleep(max(0, 12 - index) * 0.002)
+        frames = int(len(text) * 0.05 * self.sample_rate / (audio_config.speaking_rate or 1.0))
+        rng = np.random.default_rng(zlib.crc32(f"{voice.name}:{text}".encode("utf-8")))
+        return SimpleNamespace(audio_content=rng.integers(-3000, 3000, frames, dtype=np.int16).tobytes())
+
+class FakeBatchClient:
+    """SSML 요청에 0부터 증가하는 PCM과 mark 시점(세그먼트당 0.1초)을 반환하는 가짜 v1beta1 클라이언트"""
+
+    def __init__(self, sample_rate: int, marks: bool = True):
+        self.sample_rate = sample_rate
+        self.marks = marks
+        self.requests = []
+
+    def synthesize_speech(self, request):
+        self.requests.append(request.input.ssml)
+        count = request.input.ssml.count('<mark name="s')
+        step = self.sample_rate // 10
+        timepoints = [SimpleNamespace(mark_name=f"s{i}", time_seconds=i * 0.1) for i in range(count)]
+        timepoints.append(SimpleNamespace(mark_name="end", time_seconds=count * 0.1))
+        return SimpleNamespace(
+            audio_content=np.arange(count * step, dtype=np.int16).tobytes(),
+            timepoints=timepoints if self.marks else []
+        )
+
+@pytest.fixture
+def make_service(monkeypatch, tmp_path):
+    """캐시 없이 가짜 클라이언트를 쓰는 TTS 서비스 생성기"""
+    monkeypatch.setattr(config, "TTS_CACHE_ENABLED", False)
+    monkeypatch.setattr(config, "TTS_RATE_MODEL_PATH", str(tmp_path / "rate_model.json"))
+    fake = FakeTTSClient(config.TTS_SAMPLE_RATE)
+    clients.override("tts", fake)
+
+    def make(max_concurrency: int) -> TTSService:
+        service = TTSService(max_concurrency=max_concurrency)
+        # 완료 순서에 따라 학습 결과가 달라지지 않도록 speaking_rate 고정
+        service.rate_model.choose_speaking_rate = lambda voice, text, duration: 1.0
+        return service
+
+    yield make, fake
+    clients.reset("tts")
+
+def write_tsv(path, count: int = 12) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("start_time\tend_time\tspeaker_id\ttranslated_text\n")
+        for i in range(count):
+            f.write(f"{i * 2:.2f}\t{i * 2 + 1.5:.2f}\t{i % 2}\t문장 {i}\n")
+    return str(path)
+
+@pytest.mark.asyncio
+async def test_concurrent_assembly_matches_sequential(make_service, tmp_path):
+    """완료 순서와 관계없이 동시 합성 결과가 순차 합성 결과와 같은지 테스트"""
+    make, _ = make_service
+    tsv_path = write_tsv(tmp_path / "script.tsv")
+    outputs = {}
+    for name, concurrency in (("sequential", 1), ("concurrent", 8)):
+        output_dir = tmp_path / name
+        output_dir.mkdir()
+        chunks = []
+        path = await make(concurrency).process_multi_speaker_tsv(
+            tsv_path, "task", audio_callback=chunks.append, output_dir=str(output_dir)
+        )
+        with open(path, "rb") as f:
+            outputs[name] = (f.read(), np.concatenate(chunks))
+
+    assert outputs["concurrent"][0] == outputs["sequential"][0]
+    assert np.array_equal(outputs["concurrent"][1], outputs["sequential"][1])
+
+@pytest.mark.asyncio
+async def test_assembly_error_cancels_pending_requests(make_service, tmp_path):
+    """조립 중 오류가 나면 남은 합성 요청을 취소하는지 테스트"""
+    make, fake = make_service
+    tsv_path = write_tsv(tmp_path / "script.tsv")
+
+    def failing_callback(samples):
+        raise RuntimeError("전송 실패")
+
+    result = await make(1).process_multi_speaker_tsv(
+        tsv_path, "task", audio_callback=failing_callback, output_dir=str(tmp_path)
+    )
+    await asyncio.sleep(0.5)
+    assert result is None
+    assert len(fake.calls) < 12
+
+def segments(count: int, speaker: str = "0", offset: int = 0):
+    return [{"start": i * 2.0, "end": i * 2.0 + 1.5, "speaker": speaker, "text": f"문장 {i}"}
+            for i in range(offset, offset + count)]
+
+def test_group_for_batch_splits_by_speaker_count_and_size(make_service, monkeypatch):
+    """화자가 바뀌거나 세그먼트 수·SSML 크기 제한을 넘으면 묶음을 나누는지 테스트"""
+    make, _ = make_service
+    monkeypatch.setattr(config, "TTS_SSML_BATCH_ENABLED", True)
+    monkeypatch.setattr(config, "TTS_SSML_BATCH_MAX_SEGMENTS", 3)
+    monkeypatch.setattr(config, "TTS_SSML_BATCH_MAX_BYTES", 200)
+    service = make(4)
+    items = segments(4) + segments(1, speaker="1", offset=4) + segments(1, offset=5)
+    items.append({"start": 12.0, "end": 13.0, "speaker": "0", "text": "가" * 60})
+
+    groups = service._group_for_batch(items)
+    assert [[segment["text"] for segment in group] for group in groups] == [
+        ["문장 0", "문장 1", "문장 2"], ["문장 3"], ["문장 4"], ["문장 5"], ["가" * 60]
+    ]
+
+    monkeypatch.setattr(config, "TTS_SSML_BATCH_ENABLED", False)
+    assert len(service._group_for_batch(items)) == len(items)
+
+def test_build_ssml_escapes_text(make_service):
+    """세그먼트 텍스트를 이스케이프하고 세그먼트마다 mark를 넣는지 테스트"""
+    make, _ = make_service
+    ssml = make(1)._build_ssml(["a < b & c", "<break/>"])
+    assert ssml == '<speak><mark name="s0"/>a &lt; b &amp; c <mark name="s1"/>&lt;break/&gt; <mark name="end"/></speak>'
+
+@pytest.mark.asyncio
+async def test_marked_pcm_is_split_at_marks(make_service, monkeypatch):
+    """mark 시점으로 PCM을 나누고 묶음 길이로 발화 속도 모델을 갱신하는지 테스트"""
+    make, _ = make_service
+    monkeypatch.setattr(config, "TTS_SSML_BATCH_ENABLED", True)
+    batch = FakeBatchClient(config.TTS_SAMPLE_RATE)
+    clients.override("tts_batch", batch)
+    try:
+        service = make(4)
+        voice = service._voice(service.voice_profiles["00"])
+        texts = ["하나", "둘", "셋"]
+        pieces = await service._synthesize_marked_pcm(
+            " ".join(texts), service._build_ssml(texts), voice, service._audio_config(1.0), len(texts)
+        )
+    finally:
+        clients.reset("tts_batch")
+
+    step = config.TTS_SAMPLE_RATE // 10
+    expected = np.arange(3 * step, dtype=np.int16)
+    for i, piece in enumerate(pieces):
+        assert np.array_equal(piece, expected[i * step:(i + 1) * step])
+    assert service.mark_support[voice.name] is True
+    assert service.rate_model.observations[voice.name] == 1
+
+@pytest.mark.asyncio
+async def test_voice_without_marks_falls_back_once(make_service, monkeypatch):
+    """mark를 지원하지 않는 음성은 일괄 요청을 한 번만 보내고 세그먼트별로 합성하는지 테스트"""
+    make, fake = make_service
+    monkeypatch.setattr(config, "TTS_SSML_BATCH_ENABLED", True)
+    batch = FakeBatchClient(config.TTS_SAMPLE_RATE, marks=False)
+    clients.override("tts_batch", batch)
+    try:
+        service = make(4)
+        profile = service.voice_profiles["00"]
+        results = await asyncio.gather(
+            service.synthesize_batch(segments(2), profile),
+            service.synthesize_batch(segments(2, offset=2), profile),
+        )
+        await service.synthesize_batch(segments(2, offset=4), profile)
+    finally:
+        clients.reset("tts_batch")
+
+    assert len(batch.requests) == 1
+    assert service.mark_support[profile] is False
+    assert sorted(fake.calls) == [f"문장 {i}" for i in range(6)]
+    assert all(audio is not None for group in results for audio in group)
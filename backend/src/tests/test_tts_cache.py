@@ -0,0 +1,48 @@
+from services.tts_cache import TTSAudioCache
+
+def make_cache(tmp_path, max_bytes: int) -> TTSAudioCache:
+    return TTSAudioCache(cache_dir=str(tmp_path), max_bytes=max_bytes, bucket_prefix="")
+
+def test_cache_hit_and_miss(tmp_path):
+    """캐시 적중/미스 집계 테스트"""
+    cache = make_cache(tmp_path, 1024)
+    assert cache.get("a") is None
+    cache.put("a", b"\x01\x00" * 4)
+    assert cache.get("a") == b"\x01\x00" * 4
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+def test_cache_lru_eviction(tmp_path):
+    """용량 상한 초과 시 가장 오래 사용하지 않은 항목 삭제 테스트"""
+    cache = make_cache(tmp_path, 8)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    cache.get("a")
+    cache.put("c", b"9012")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.stats()["evictions"] == 1
+    assert not (tmp_path / "b.pcm").exists()
+
+def test_cache_index_survives_restart(tmp_path):
+    """디스크에 저장된 항목을 재시작 후에도 사용하는지 테스트"""
+    make_cache(tmp_path, 1024).put("a", b"1234")
+    cache = make_cache(tmp_path, 1024)
+    assert cache.get("a") == b"1234"
+    assert cache.stats()["bytes"] == 4
+
+def test_cache_evict_frees_oldest(tmp_path):
+    """요청한 용량만큼 오래된 항목부터 삭제하는지 테스트"""
+    cache = make_cache(tmp_path, 1024)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    cache.put("c", b"9012")
+    cache.get("a")
+
+    assert cache.evict(6) == 8
+    assert cache.get("a") == b"1234"
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,27 @@
+import os
+from services.workspace import TaskWorkspace
+from services.task_manager import TaskManager
+
+def test_workspaces_are_isolated(tmp_path):
+    """같은 파일명을 쓰는 작업들이 서로 다른 경로를 사용하는지 테스트"""
+    first = TaskWorkspace("task-a", root=str(tmp_path))
+    second = TaskWorkspace("task-b", root=str(tmp_path))
+    first_path = os.path.join(first.dir("text_ko"), "title.tsv")
+    second_path = os.path.join(second.dir("text_ko"), "title.tsv")
+
+    assert first_path != second_path
+    assert first.contains(first_path)
+    assert not first.contains(second_path)
+    assert first.gcs_path("text_ko", "title.tsv") == "resources/text_ko/task-a/title.tsv"
+
+def test_manifest_fields_are_grouped():
+    """manifest 필드를 artifacts 항목으로 묶어 반환하는지 테스트"""
+    task_data = TaskManager._decode({
+        "status": '"processing"',
+        "artifact:translation": '"/tmp/tasks/a/text_ko/title.tsv"',
+        "_rev": "3",
+    })
+    assert task_data == {
+        "status": "processing",
+        "artifacts": {"translation": "/tmp/tasks/a/text_ko/title.tsv"},
+    }
@@ -4,7 +4,7 @@ const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000
 
 export interface TaskStatusResponse {
   status: 'pending' | 'processing' | 'completed' | 'failed';
-  stage?: 'stt' | 'translation' | 'tts';
+  stage?: 'stt' | 'diarization' | 'merge' | 'translation' | 'tts' | 'separation' | 'mux';
   progress?: number;
   error?: string;
   result?: string;
@@ -25,6 +25,71 @@ export const getTaskStatus = async (taskId: string): Promise<TaskStatusResponse>
   return data;
 };
 
+/**
+ * 작업 상태 변경을 서버 이벤트(SSE)로 구독합니다.
+ * EventSource를 사용할 수 없거나 첫 이벤트 전에 연결이 실패하면 주기적 조회로 대체합니다.
+ * 완료/실패 상태를 받으면 자동으로 구독을 종료하며, 반환된 함수로 직접 종료할 수 있습니다.
+ */
+export const subscribeTaskStatus = (
+  taskId: string,
+  onUpdate: (status: TaskStatusResponse) => void,
+  onError: (error: Error) => void,
+  pollIntervalMs = 3000
+): (() => void) => {
+  let closed = false;
+  let eventSource: EventSource | null = null;
+  let pollTimer: ReturnType<typeof setTimeout> | null = null;
+
+  const isFinished = (status: TaskStatusResponse) =>
+    status.status === 'completed' || status.status === 'failed';
+
+  const close = () => {
+    closed = true;
+    eventSource?.close();
+    if (pollTimer) clearTimeout(pollTimer);
+  };
+
+  const poll = async () => {
+    if (closed) return;
+    try {
+      const status = await getTaskStatus(taskId);
+      if (closed) return;
+      onUpdate(status);
+      if (isFinished(status)) {
+        close();
+        return;
+      }
+      pollTimer = setTimeout(poll, pollIntervalMs);
+    } catch (error) {
+      close();
+      onError(error instanceof Error ? error : new Error('상태 확인 중 오류가 발생했습니다.'));
+    }
+  };
+
+  if (typeof EventSource === 'undefined') {
+    poll();
+    return close;
+  }
+
+  let received = false;
+  eventSource = new EventSource(`${API_BASE_URL}/api/process/events/${taskId}`);
+  eventSource.addEventListener('status', (event) => {
+    received = true;
+    const status: TaskStatusResponse = JSON.parse((event as MessageEvent).data);
+    onUpdate(status);
+    if (isFinished(status)) close();
+  });
+  eventSource.onerror = () => {
+    // 첫 이벤트 전에 실패하면 (미지원 프록시 등) 주기적 조회로 전환, 이후에는 브라우저가 자동 재연결
+    if (!received && !closed) {
+      eventSource?.close();
+      poll();
+    }
+  };
+
+  return close;
+};
+
 export const uploadVideo = async (formData: FormData): Promise<{ task_id: string }> => {
   const response = await fetch(`${API_BASE_URL}/api/process`, {
     method: 'POST',
@@ -12,7 +12,7 @@ import {
 } from '@mui/material';
 import { Download, Home } from '@mui/icons-material';
 import { useParams, useNavigate } from 'react-router-dom';
-import { getTaskStatus, downloadVideo, submitFeedback } from '../api/client';
+import { subscribeTaskStatus, downloadVideo, submitFeedback } from '../api/client';
 
 // API 기본 URL 가져오기
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
@@ -33,10 +33,10 @@ const ResultPage: React.FC = () => {
   useEffect(() => {
     if (!taskId) return;
     
-    // 작업 상태를 주기적으로 확인
-    const checkStatus = async () => {
-      try {
-        const response = await getTaskStatus(taskId);
+    // 작업 상태 변경 구독 (서버 이벤트, 미지원 시 주기적 조회)
+    return subscribeTaskStatus(
+      taskId,
+      (response) => {
         setStatus(response.status);
         setProgress(response.progress || 0);
         setStage(response.stage || null);
@@ -49,27 +49,13 @@ const ResultPage: React.FC = () => {
           setError(response.error || '처리 중 오류가 발생했습니다.');
           setIsLoading(false);
         }
-      } catch (error) {
-        const errorMessage = error instanceof Error ? error.message : '상태 확인 중 오류가 발생했습니다.';
-        setError(errorMessage);
+      },
+      (error) => {
+        setError(error.message);
         setIsLoading(false);
       }
-    };
-    
-    // 초기 상태 확인
-    checkStatus();
-    
-    // 완료되지 않은 경우 3초마다 상태 확인
-    const intervalId = setInterval(() => {
-      if (status !== 'completed' && status !== 'failed') {
-        checkStatus();
-      } else {
-        clearInterval(intervalId);
-      }
-    }, 3000);
-    
-    return () => clearInterval(intervalId);
-  }, [taskId, status]);
+    );
+  }, [taskId]);
 
   const handleDownload = async () => {
     if (!taskId) return;
@@ -8,10 +8,10 @@ import {
   Alert,
 } from '@mui/material';
 import { useParams } from 'react-router-dom';
-import { getTaskStatus } from '../api/client';
+import { subscribeTaskStatus } from '../api/client';
 
 export type TaskStatus = 'pending' | 'processing' | 'completed' | 'failed';
-export type ProcessingStage = 'stt' | 'translation' | 'tts';
+export type ProcessingStage = 'stt' | 'diarization' | 'merge' | 'translation' | 'tts' | 'separation' | 'mux';
 
 interface TaskStatusResponse {
   status: TaskStatus;
@@ -23,8 +23,12 @@ interface TaskStatusResponse {
 
 const stageLabels = {
   stt: '음성을 텍스트로 변환 중...',
+  diarization: '화자 분리 중...',
+  merge: '화자별 자막 정리 중...',
   translation: '텍스트 번역 중...',
   tts: '음성 합성 중...',
+  separation: '배경음 준비 중...',
+  mux: '영상 합성 중...',
   complete: '처리 완료!',
 };
 
@@ -37,11 +41,13 @@ const TranslationScreen: React.FC = () => {
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    const checkStatus = async () => {
-      try {
-        console.log('Checking task status for taskId:', taskId);
-        const response = await getTaskStatus(taskId || '');
-        console.log('Task status response:', response);
+    if (!taskId) return;
+
+    // 작업 상태 변경 구독 (서버 이벤트, 미지원 시 주기적 조회)
+    return subscribeTaskStatus(
+      taskId,
+      (response) => {
+        console.log('Task status update:', response);
         setTaskStatus(response);
 
         if (response.status === 'completed') {
@@ -50,18 +56,14 @@ const TranslationScreen: React.FC = () => {
         } else if (response.status === 'failed') {
           console.log('Task failed:', response.error);
           setError(response.error || '처리 중 오류가 발생했습니다.');
-        } else {
-          console.log('Task still in progress, checking again in 2 seconds');
-          setTimeout(checkStatus, 2000);
         }
-      } catch (error) {
+      },
+      (error) => {
         console.error('Error checking task status:', error);
-        const errorMessage = error instanceof Error ? error.message : '상태 확인 중 오류가 발생했습니다.';
-        setError(errorMessage);
-      }
-    };
-
-    checkStatus();
+        setError(error.message);
+      },
+      2000
+    );
   }, [taskId]);
 
   const getStageProgress = () => {